@@ -0,0 +1,76 @@
+# bench_agent_footprint.py
+# Usage: python -m benchmarks.bench_agent_footprint [agents ...]
+#
+# Bytes per object and construction time for large fleets of agents, tools
+# and planner tasks. The agent rows separate the two savings:
+#   - slots vs. dict: the same agent, memory in use, with and without a
+#     per-instance __dict__;
+#   - lazy vs. eager: state built on first use vs. the old layout, which
+#     built a 16-shard AgentMemory and a TaskPlanner in the constructor.
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from src.agents.autonomous_agent import AutonomousAgent
+from src.memory.agent_memory import AgentMemory
+from src.planning.dag_planner import PlannedTask
+from src.planning.task_planner import TaskPlanner
+from src.tools.agent_tools import Tool
+
+
+class DictAgent(AutonomousAgent):
+    """The same agent with a per-instance __dict__ (no __slots__ here)."""
+
+
+class EagerAgent(DictAgent):
+    """The old layout: dict-backed, memory and planner built up front."""
+
+    def __init__(self, name):
+        super().__init__(name, memory=AgentMemory())
+        self.task_planner = TaskPlanner()
+
+
+def with_memory(agent_class):
+    def build(i):
+        agent = agent_class(f"agent-{i}")
+        agent.store_memory("goal", i)
+        return agent
+    return build
+
+
+def measure(factory, count):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    objects = [factory(i) for i in range(count)]
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size / count, elapsed / count
+
+
+def main(*counts):
+    counts = counts or (10000, 1000000)
+    cases = [
+        ("agent, untouched", lambda i: AutonomousAgent(f"agent-{i}"), None),
+        ("agent, memory used (slots)", with_memory(AutonomousAgent), None),
+        ("agent, memory used (dict)", with_memory(DictAgent), None),
+        ("agent, old eager layout", with_memory(EagerAgent), 100000),
+        ("Tool", lambda i: Tool(f"tool-{i}", abs), None),
+        ("PlannedTask", lambda i: PlannedTask(i, None, (), 1.0, ()), None),
+    ]
+    for count in counts:
+        for label, factory, limit in cases:
+            if limit is not None and count > limit:
+                print(f"{count:>9,} x {label:28s} skipped (would need ~{count * 4 // 1000:,} MB)")
+                continue
+            per_object, seconds = measure(factory, count)
+            print(f"{count:>9,} x {label:28s} {per_object:8.0f} bytes/object  "
+                  f"{seconds * 1e6:7.2f} us/object (traced)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
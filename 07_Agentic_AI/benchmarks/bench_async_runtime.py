@@ -0,0 +1,35 @@
+# bench_async_runtime.py
+# Usage: python -m benchmarks.bench_async_runtime [agents] [tasks_per_agent]
+#
+# Runs many AutonomousAgents on one event loop, each task awaiting a
+# simulated 5 ms tool call, and reports throughput and p99 latency.
+
+import asyncio
+import sys
+import time
+
+from src.agents.async_runtime import AgentRuntime
+from src.agents.autonomous_agent import AutonomousAgent
+
+
+async def tool_call():
+    await asyncio.sleep(0.005)
+
+
+def main(num_agents=10_000, tasks_per_agent=5):
+    agents = [AutonomousAgent(f"agent-{i}") for i in range(num_agents)]
+    runtime = AgentRuntime(max_concurrency_per_agent=2)
+    assignments = [(agent, tool_call) for agent in agents for _ in range(tasks_per_agent)]
+
+    start = time.perf_counter()
+    runtime.run(assignments)
+    elapsed = time.perf_counter() - start
+
+    stats = runtime.stats()
+    print(f"{num_agents} agents x {tasks_per_agent} tasks in {elapsed:.2f}s")
+    print(f"agents/s: {num_agents / elapsed:,.0f}  tasks/s: {len(assignments) / elapsed:,.0f}")
+    print(f"p50 latency: {stats['p50_latency'] * 1000:.1f} ms  p99 latency: {stats['p99_latency'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,53 @@
+# bench_checkpoint.py
+# Usage: python -m benchmarks.bench_checkpoint [agents] [memories_per_agent]
+#
+# Time to checkpoint and lazily restore a fleet of AutonomousAgents.
+# Every restored checkpoint file stays mapped (one file descriptor each)
+# until its store is closed, so large fleets may need a higher `ulimit -n`.
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from src.agents.autonomous_agent import AutonomousAgent
+from src.agents.checkpoint import restore_agent, save_checkpoint
+
+
+def main(num_agents=10_000, memories=100):
+    directory = tempfile.mkdtemp()
+    try:
+        agents = []
+        for i in range(num_agents):
+            agent = AutonomousAgent(f"agent-{i}")
+            for j in range(memories):
+                agent.store_memory(f"fact-{j}", {"value": j, "source": "sensor"})
+            agent.task_planner.add_task(f"task-{i}")
+            agents.append(agent)
+
+        start = time.perf_counter()
+        for agent in agents:
+            save_checkpoint(agent, os.path.join(directory, agent.name))
+        print(f"full checkpoint: {time.perf_counter() - start:.2f}s for {num_agents} agents")
+
+        for agent in agents:
+            agent.memory.update_memory("fact-0", {"value": -1})
+        start = time.perf_counter()
+        for agent in agents:
+            save_checkpoint(agent, os.path.join(directory, agent.name + ".delta"), incremental=True)
+        print(f"delta checkpoint: {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        restored = [restore_agent([os.path.join(directory, agent.name),
+                                   os.path.join(directory, agent.name + ".delta")])
+                    for agent in agents]
+        print(f"lazy restore: {time.perf_counter() - start:.2f}s")
+        for agent in restored:
+            agent.memory.memory_store.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
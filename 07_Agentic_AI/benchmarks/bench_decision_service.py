@@ -0,0 +1,81 @@
+# bench_decision_service.py
+# Usage: python -m benchmarks.bench_decision_service [agents] [ticks]
+#
+# Decisions/s when every agent evaluates the policy on its own context versus
+# agents awaiting a DecisionService that batches each tick into one call,
+# first for the policy alone and then for agents on an asyncio event loop.
+
+import asyncio
+import sys
+import time
+
+import numpy as np
+
+from src.agents.decision_service import DecisionService, LinearPolicy
+
+FEATURES = 64
+HIDDEN = 256
+ACTIONS = 8
+
+
+class MLPPolicy:
+    """A small two-layer network, standing in for a learned policy."""
+
+    def __init__(self, rng):
+        self.hidden = rng.normal(size=(FEATURES, HIDDEN)) / np.sqrt(FEATURES)
+        self.output = LinearPolicy(rng.normal(size=(HIDDEN, ACTIONS)) / np.sqrt(HIDDEN))
+        self.classes_ = self.output.classes_
+
+    def predict_proba(self, features):
+        return self.output.predict_proba(np.maximum(features @ self.hidden, 0.0))
+
+
+def main(num_agents=2000, ticks=10):
+    rng = np.random.default_rng(0)
+    policy = MLPPolicy(rng)
+    contexts = rng.normal(size=(num_agents, FEATURES))
+
+    async def per_agent_tick():
+        async def decide(context):
+            await asyncio.sleep(0)
+            return int(np.argmax(policy.predict_proba(context[None, :])[0]))
+        return await asyncio.gather(*(decide(context) for context in contexts))
+
+    def run(tick):
+        async def main():
+            start = time.perf_counter()
+            for _ in range(ticks):
+                decisions = await tick()
+            return time.perf_counter() - start, decisions
+        return asyncio.run(main())
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        expected = [int(np.argmax(policy.predict_proba(context[None, :])[0])) for context in contexts]
+    elapsed = time.perf_counter() - start
+    print(f"{'policy only, per agent':40s} {num_agents * ticks / elapsed:12,.0f} decisions/s")
+    service = DecisionService(policy)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        assert service.decide_batch(contexts) == expected
+    elapsed = time.perf_counter() - start
+    print(f"{'policy only, one batch':40s} {num_agents * ticks / elapsed:12,.0f} decisions/s")
+
+    elapsed, expected = run(per_agent_tick)
+    print(f"{'event loop, per agent':40s} {num_agents * ticks / elapsed:12,.0f} decisions/s")
+
+    for max_batch_size, max_wait in ((64, 0.001), (512, 0.001), (num_agents, 0.005)):
+        service = DecisionService(policy, max_batch_size=max_batch_size, max_wait=max_wait)
+
+        async def batched_tick():
+            return await asyncio.gather(*(service.decide(context) for context in contexts))
+
+        elapsed, decisions = run(batched_tick)
+        assert decisions == expected
+        label = f"event loop, batched ({max_batch_size}, {max_wait * 1000:g} ms)"
+        print(f"{label:40s} {num_agents * ticks / elapsed:12,.0f} decisions/s  "
+              f"mean batch {service.stats()['mean_batch_size']:.0f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,47 @@
+# bench_durable_queue.py
+# Usage: python -m benchmarks.bench_durable_queue [tasks]
+#
+# Enqueue and dequeue throughput of the SQLite-backed DurableTaskQueue on
+# local disk, for single and bulk operations.
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from src.planning.durable_queue import DurableTaskQueue
+
+
+def main(num_tasks=200_000):
+    directory = tempfile.mkdtemp()
+    try:
+        queue = DurableTaskQueue(os.path.join(directory, "single.db"))
+        start = time.perf_counter()
+        for i in range(num_tasks):
+            queue.enqueue({"task": i})
+        queue.flush()
+        print(f"enqueue:      {num_tasks / (time.perf_counter() - start):10,.0f} tasks/s")
+        queue.close()
+
+        queue = DurableTaskQueue(os.path.join(directory, "bulk.db"))
+        tasks = [{"task": i} for i in range(num_tasks)]
+        start = time.perf_counter()
+        for offset in range(0, num_tasks, 1000):
+            queue.enqueue_many(tasks[offset:offset + 1000])
+        print(f"enqueue_many: {num_tasks / (time.perf_counter() - start):10,.0f} tasks/s")
+
+        start = time.perf_counter()
+        while True:
+            leased = queue.dequeue(max_items=1000)
+            if not leased:
+                break
+            queue.ack([task_id for task_id, _ in leased])
+        print(f"dequeue+ack:  {num_tasks / (time.perf_counter() - start):10,.0f} tasks/s")
+        queue.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,37 @@
+# bench_fleet.py
+# Usage: python -m benchmarks.bench_fleet [agents] [tasks] [workers]
+#
+# Time for a FleetSupervisor to bring up its agents with each process start
+# method, and fleet-wide task throughput.
+
+import functools
+import multiprocessing
+import sys
+import time
+
+from src.agents.supervisor import FleetSupervisor
+
+
+def main(num_agents=1000, num_tasks=50000, num_workers=None):
+    task = functools.partial(sum, range(100))
+    for method in ("forkserver", "spawn", "fork"):
+        if method not in multiprocessing.get_all_start_methods():
+            continue
+        context = multiprocessing.get_context(method)
+        if method == "forkserver":
+            context.set_forkserver_preload(["src.agents.autonomous_agent"])
+        started = time.perf_counter()
+        with FleetSupervisor(num_agents=num_agents, num_workers=num_workers, mp_context=context) as fleet:
+            ready = time.perf_counter() - started
+            begin = time.perf_counter()
+            futures = [fleet.submit(task) for _ in range(num_tasks)]
+            for future in futures:
+                future.result()
+            throughput = num_tasks / (time.perf_counter() - begin)
+            workers = fleet.num_workers
+        print(f"{method:10s} {num_agents} agents on {workers} workers ready in {ready:5.2f}s, "
+              f"{throughput:10,.0f} tasks/s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:4]))
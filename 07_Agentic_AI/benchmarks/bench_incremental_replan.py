@@ -0,0 +1,40 @@
+# bench_incremental_replan.py
+# Usage: python -m benchmarks.bench_incremental_replan [backlog]
+#
+# Latency of re-optimizing a large TaskPlanner after a single add or remove,
+# incremental (cached plan) versus a full re-sort of the backlog.
+
+import random
+import sys
+import time
+
+from src.planning.task_planner import TaskPlanner
+
+
+def main(backlog=100_000, changes=200):
+    rng = random.Random(0)
+    planner = TaskPlanner()
+    for _ in range(backlog):
+        planner.add_task(rng.random())
+    planner.optimize_task_execution()
+
+    start = time.perf_counter()
+    for _ in range(changes):
+        task = rng.random()
+        planner.add_task(task)
+        planner.optimize_task_execution()
+        planner.remove_task(task)
+        planner.optimize_task_execution()
+    incremental = (time.perf_counter() - start) / (2 * changes)
+
+    start = time.perf_counter()
+    for _ in range(changes):
+        sorted(planner.tasks)
+    full = (time.perf_counter() - start) / changes
+
+    print(f"backlog {backlog:,}: incremental replan {incremental * 1e3:.2f} ms, "
+          f"full re-sort {full * 1e3:.2f} ms ({full / incremental:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,46 @@
+# bench_instrumentation.py
+# Usage: python -m benchmarks.bench_instrumentation [calls]
+#
+# Per-call cost of Tool.use with instrumentation disabled and enabled,
+# against calling the tool's function directly, checked against the 1 us
+# budget for enabled instrumentation. Each figure is the best of 5 runs.
+
+import sys
+import time
+
+from src.tools.agent_tools import Tool
+from src.tools.instrumentation import instrumentation
+
+
+BUDGET = 1e-6
+
+
+def per_call(function, calls, repeats=5):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(calls // repeats):
+            function(-1)
+        best = min(best, (time.perf_counter() - start) / (calls // repeats))
+    return best
+
+
+def main(calls=1000000):
+    tool = Tool("abs", abs)
+    direct = per_call(abs, calls)
+    instrumentation.disable()
+    disabled = per_call(tool.use, calls)
+    instrumentation.enable()
+    enabled = per_call(tool.use, calls)
+    instrumentation.disable()
+    print(f"direct call           {direct * 1e9:7.0f} ns")
+    print(f"Tool.use, disabled    {disabled * 1e9:7.0f} ns")
+    print(f"Tool.use, enabled     {enabled * 1e9:7.0f} ns  (+{(enabled - disabled) * 1e9:.0f} ns)")
+    overhead = enabled - direct
+    verdict = "within" if overhead < BUDGET else "OVER"
+    print(f"overhead vs. direct   {overhead * 1e9:7.0f} ns  {verdict} the {BUDGET * 1e9:.0f} ns budget")
+    print(instrumentation.to_prometheus(), end="")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
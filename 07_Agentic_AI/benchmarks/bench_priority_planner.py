@@ -0,0 +1,52 @@
+# bench_priority_planner.py
+# Usage: python -m benchmarks.bench_priority_planner
+#
+# A planner loop that enqueues tasks and repeatedly takes the most urgent
+# one: TaskPlanner re-sorts its list each step, PriorityTaskPlanner pops
+# from a heap. The re-sorting loop is timed over fewer steps at large sizes.
+
+import random
+import time
+
+from src.planning.priority_planner import PriorityTaskPlanner
+from src.planning.task_planner import TaskPlanner
+
+
+def sorted_loop(tasks, steps):
+    planner = TaskPlanner()
+    for task in tasks:
+        planner.add_task(task)
+    start = time.perf_counter()
+    for _ in range(steps):
+        best = planner.optimize_task_execution()[0]
+        planner.tasks.remove(best)
+    return (time.perf_counter() - start) / steps
+
+
+def heap_loop(tasks, steps):
+    planner = PriorityTaskPlanner(aging_rate=1e-6)
+    for priority, name in tasks:
+        planner.add_task(name, priority)
+    start = time.perf_counter()
+    for _ in range(steps):
+        planner.pop_task()
+    return (time.perf_counter() - start) / steps
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'tasks':>10} {'enqueue/s':>12} {'sorted step':>14} {'heap step':>12}")
+    for size in (1_000, 100_000, 1_000_000):
+        tasks = [(rng.random(), f"task-{i}") for i in range(size)]
+        planner = PriorityTaskPlanner()
+        start = time.perf_counter()
+        for priority, name in tasks:
+            planner.add_task(name, priority)
+        enqueue_rate = size / (time.perf_counter() - start)
+        sorted_step = sorted_loop(tasks, steps=max(1, 100_000 // size))
+        heap_step = heap_loop(tasks, steps=min(size, 100_000))
+        print(f"{size:>10,} {enqueue_rate:>12,.0f} {sorted_step * 1e6:>12,.1f}us {heap_step * 1e6:>10,.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# bench_replay_buffer.py
+# Usage: python -m benchmarks.bench_replay_buffer [capacity] [batch_size]
+#
+# Append and sampling throughput of the NumPy ring buffer, uniform and
+# prioritized, against a deque of tuples sampled with random.choices and
+# stacked into arrays, plus the same buffer spilled to memory-mapped files.
+
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import deque
+
+import numpy as np
+
+from src.memory.replay_buffer import ReplayBuffer
+
+STATE_SHAPE = (32,)
+SAMPLES = 200
+
+
+def rate(count, function):
+    start = time.perf_counter()
+    function()
+    return count / (time.perf_counter() - start)
+
+
+def report(label, appends, samples, batch_size):
+    print(f"{label:32s} {appends:12,.0f} appends/s  {samples:10,.0f} batches/s ({batch_size} per batch)")
+
+
+def bench(buffer, states, batch_size, prioritized=False):
+    count = len(states)
+
+    def append():
+        for i in range(count):
+            buffer.add(states[i], i % 4, 1.0, states[i])
+
+    def sample():
+        for _ in range(SAMPLES):
+            batch = buffer.sample(batch_size)
+            if prioritized:
+                buffer.update_priorities(batch["indices"], np.abs(batch["rewards"] - 0.5))
+
+    return rate(count, append), rate(SAMPLES, sample)
+
+
+def main(capacity=100000, batch_size=256):
+    states = np.random.default_rng(0).normal(size=(capacity, *STATE_SHAPE)).astype(np.float32)
+
+    experiences = deque(maxlen=capacity)
+
+    def append():
+        for i in range(capacity):
+            experiences.append((states[i], i % 4, 1.0, states[i], False))
+
+    def sample():
+        for _ in range(SAMPLES):
+            batch = random.choices(experiences, k=batch_size)
+            np.stack([e[0] for e in batch]), np.array([e[1] for e in batch]), np.array([e[2] for e in batch])
+            np.stack([e[3] for e in batch]), np.array([e[4] for e in batch])
+
+    report("deque of tuples", rate(capacity, append), rate(SAMPLES, sample), batch_size)
+    report("ring buffer, uniform", *bench(ReplayBuffer(capacity, STATE_SHAPE, seed=0), states, batch_size),
+           batch_size)
+    report("ring buffer, prioritized", *bench(ReplayBuffer(capacity, STATE_SHAPE, prioritized=True, seed=0),
+                                              states, batch_size, prioritized=True), batch_size)
+    buffer = ReplayBuffer(capacity, STATE_SHAPE, seed=0)
+    print(f"{'ring buffer, extend':32s} {rate(capacity, lambda: buffer.extend(states, np.zeros(capacity), np.ones(capacity), states)):12,.0f} appends/s")
+
+    directory = tempfile.mkdtemp()
+    try:
+        buffer = ReplayBuffer(capacity, STATE_SHAPE, path=directory, seed=0)
+        report("ring buffer, memory-mapped", *bench(buffer, states, batch_size), batch_size)
+        buffer.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
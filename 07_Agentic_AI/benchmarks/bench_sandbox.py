@@ -0,0 +1,49 @@
+# bench_sandbox.py
+# Usage: python -m benchmarks.bench_sandbox [calls] [array_mb]
+#
+# Per-call overhead of SandboxPool against calling a tool in-process, for a
+# tiny call and for a large array argument sent through shared memory or
+# pickled over the pipe.
+
+import sys
+import time
+
+import numpy as np
+
+from src.tools.agent_tools import Tool
+from src.tools.sandbox import SandboxPool
+
+
+def total(values):
+    return float(values.sum())
+
+
+def per_call(function, calls):
+    function()  # warm up: the first call ships the function to the worker
+    start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter() - start) / calls
+
+
+def main(calls=2000, array_mb=64):
+    tiny = Tool("abs", abs)
+    big = Tool("total", total)
+    values = np.ones(array_mb * (1 << 20) // 8)
+    big_calls = max(1, calls // 100)
+
+    with SandboxPool(num_workers=1) as shm_pool, \
+            SandboxPool(num_workers=1, shm_threshold=float("inf")) as pickle_pool:
+        rows = [
+            ("tiny, in-process", per_call(lambda: tiny.use(-1), calls)),
+            ("tiny, sandbox", per_call(lambda: shm_pool.call(tiny, (-1,)), calls)),
+            (f"{array_mb} MB, in-process", per_call(lambda: big.use(values), big_calls)),
+            (f"{array_mb} MB, sandbox + shm", per_call(lambda: shm_pool.call(big, (values,)), big_calls)),
+            (f"{array_mb} MB, sandbox + pickle", per_call(lambda: pickle_pool.call(big, (values,)), big_calls)),
+        ]
+    for label, seconds in rows:
+        print(f"{label:28s} {seconds * 1e6:10.1f} us/call")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
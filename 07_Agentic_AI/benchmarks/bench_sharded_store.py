@@ -0,0 +1,64 @@
+# bench_sharded_store.py
+# Usage: python -m benchmarks.bench_sharded_store [ops_per_thread]
+#
+# Compares the lock-striped ShardedStore against a dict behind one global
+# lock, at 1-64 threads, with a 90% read / 10% write workload.
+
+import random
+import sys
+import threading
+import time
+
+from src.memory.sharded_store import ShardedStore
+
+
+class GlobalLockStore:
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._data.get(key, default)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = value
+
+
+def run(store, num_threads, ops_per_thread, num_keys=10_000):
+    for key in range(num_keys):
+        store[key] = key
+    barrier = threading.Barrier(num_threads + 1)
+
+    def worker(seed):
+        rng = random.Random(seed)
+        keys = [rng.randrange(num_keys) for _ in range(ops_per_thread)]
+        writes = [rng.random() < 0.1 for _ in range(ops_per_thread)]
+        barrier.wait()
+        for key, write in zip(keys, writes):
+            if write:
+                store[key] = seed
+            else:
+                store.get(key)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    start = time.perf_counter()
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+    return num_threads * ops_per_thread / (time.perf_counter() - start)
+
+
+def main(ops_per_thread=50_000):
+    print(f"{'threads':>8} {'global lock ops/s':>18} {'sharded ops/s':>14}")
+    for num_threads in (1, 2, 4, 8, 16, 32, 64):
+        baseline = run(GlobalLockStore(), num_threads, ops_per_thread)
+        sharded = run(ShardedStore(64), num_threads, ops_per_thread)
+        print(f"{num_threads:>8} {baseline:>18,.0f} {sharded:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
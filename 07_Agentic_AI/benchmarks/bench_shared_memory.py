@@ -0,0 +1,63 @@
+# bench_shared_memory.py
+# Usage: python -m benchmarks.bench_shared_memory [workers] [reads_per_worker]
+#
+# Read throughput of pool workers sharing a knowledge base through a
+# SharedMemoryTable versus a multiprocessing Manager().dict() proxy.
+
+import multiprocessing
+import random
+import sys
+import time
+
+from src.memory.shared_memory_store import SharedMemoryTable
+
+NUM_KEYS = 10_000
+_store = None
+
+
+def _attach_table(name):
+    global _store
+    _store = SharedMemoryTable.attach(name)
+
+
+def _use_proxy(proxy):
+    global _store
+    _store = proxy
+
+
+def _read(args):
+    seed, reads = args
+    rng = random.Random(seed)
+    for _ in range(reads):
+        _store.get(f"fact-{rng.randrange(NUM_KEYS)}")
+    return reads
+
+
+def _measure(initializer, initargs, workers, reads):
+    with multiprocessing.Pool(workers, initializer=initializer, initargs=initargs) as pool:
+        start = time.perf_counter()
+        total = sum(pool.map(_read, [(i, reads) for i in range(workers)]))
+        return total / (time.perf_counter() - start)
+
+
+def main(workers=multiprocessing.cpu_count(), reads=20_000):
+    table = SharedMemoryTable.create(capacity=4 * NUM_KEYS, arena_size=8 << 20)
+    manager = multiprocessing.Manager()
+    proxy = manager.dict()
+    for i in range(NUM_KEYS):
+        table[f"fact-{i}"] = f"value {i}"
+    proxy.update({f"fact-{i}": f"value {i}" for i in range(NUM_KEYS)})
+    try:
+        shared = _measure(_attach_table, (table.name,), workers, reads)
+        baseline = _measure(_use_proxy, (proxy,), workers, reads // 10)
+        print(f"{workers} workers")
+        print(f"Manager().dict(): {baseline:12,.0f} reads/s")
+        print(f"SharedMemoryTable: {shared:11,.0f} reads/s ({shared / baseline:.0f}x)")
+    finally:
+        manager.shutdown()
+        table.close()
+        table.unlink()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
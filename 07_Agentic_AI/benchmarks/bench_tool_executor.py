@@ -0,0 +1,74 @@
+# bench_tool_executor.py
+# Usage: python -m benchmarks.bench_tool_executor [calls] [slow_ms]
+#
+# Tail latency of a healthy tool while another tool degrades, with one shared
+# thread pool versus ToolExecutor's per-tool lanes.
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.tools.agent_tools import Tool
+from src.tools.tool_executor import BulkheadFullError, CircuitOpenError, ToolExecutor
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def run_shared(fast, slow, calls, workers):
+    latencies = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for _ in range(calls):
+            pool.submit(slow.use)
+            submitted = time.perf_counter()
+            futures.append((submitted, pool.submit(fast.use)))
+            time.sleep(0.001)
+        for submitted, future in futures:
+            latencies.append(future.result() - submitted)
+    return latencies
+
+
+def run_isolated(fast, slow, calls, workers):
+    latencies = []
+    with ToolExecutor(max_concurrent=workers) as executor:
+        futures = []
+        for _ in range(calls):
+            try:
+                executor.submit(slow)
+            except (BulkheadFullError, CircuitOpenError):
+                pass  # the degraded tool is shed instead of queueing
+            submitted = time.perf_counter()
+            futures.append((submitted, executor.submit(fast)))
+            time.sleep(0.001)
+        for submitted, future in futures:
+            latencies.append(future.result() - submitted)
+    return latencies
+
+
+def main(calls=200, slow_ms=50, workers=4):
+    def fast_call():
+        time.sleep(0.001)
+
+    def slow_call():
+        time.sleep(slow_ms / 1000)
+
+    def stamped(function):
+        # Record completion time on the future's thread so queueing is included.
+        def call():
+            function()
+            return time.perf_counter()
+        return call
+
+    fast = Tool("fast", stamped(fast_call))
+    slow = Tool("slow", stamped(slow_call))
+    for name, run in (("shared pool", run_shared), ("bulkheads", run_isolated)):
+        latencies = run(fast, slow, calls, workers)
+        print(f"{name:12s} fast tool p50 {percentile(latencies, 0.5) * 1e3:7.2f} ms  "
+              f"p99 {percentile(latencies, 0.99) * 1e3:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,40 @@
+# bench_tool_registry.py
+# Usage: python -m benchmarks.bench_tool_registry [tools]
+#
+# Per-selection latency of ToolRegistry index lookups versus the linear
+# select_tool list comprehension over the same tools.
+
+import random
+import sys
+import time
+
+from src.tools.agent_tools import Tool, select_tool
+from src.tools.tool_registry import ToolRegistry
+
+TAGS = [f"tag{i}" for i in range(50)]
+
+
+def main(num_tools=5000, selections=2000):
+    rng = random.Random(0)
+    tools = [Tool(f"tool{i}", abs, tags=rng.sample(TAGS, 3), input_types=(rng.choice([str, int, bytes]),),
+                  cost=rng.randrange(100))
+             for i in range(num_tools)]
+    registry = ToolRegistry(tools)
+    queries = [(rng.choice(TAGS), rng.choice([str, int, bytes]), rng.randrange(100)) for _ in range(selections)]
+
+    start = time.perf_counter()
+    for tag, input_type, max_cost in queries:
+        select_tool(tools, lambda tool: tag in tool.tags and input_type in tool.input_types and tool.cost <= max_cost)
+    linear = (time.perf_counter() - start) / selections
+
+    start = time.perf_counter()
+    for tag, input_type, max_cost in queries:
+        registry.select({"tags": [tag], "input_type": input_type, "max_cost": max_cost})
+    indexed = (time.perf_counter() - start) / selections
+
+    print(f"{num_tools} tools: linear {linear * 1e6:.1f} us/selection, "
+          f"registry {indexed * 1e6:.1f} us/selection ({linear / indexed:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
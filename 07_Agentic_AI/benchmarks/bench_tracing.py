@@ -0,0 +1,40 @@
+# bench_tracing.py
+# Usage: python -m benchmarks.bench_tracing [steps]
+#
+# Per-step overhead of the tracer at several sample rates, and of the
+# sampling profiler, for a step made of three nested spans.
+
+import sys
+import time
+
+from src.profiling.sampling_profiler import SamplingProfiler
+from src.profiling.tracer import Tracer
+
+
+def run_steps(tracer, steps):
+    start = time.perf_counter()
+    for i in range(steps):
+        with tracer.span("step", agent="bench"):
+            with tracer.span("make_decision"):
+                i * 2
+            with tracer.span("interact_with_tool", tool="abs"):
+                abs(-i)
+    return (time.perf_counter() - start) / steps
+
+
+def main(steps=200000):
+    tracer = Tracer()
+    baseline = run_steps(tracer, steps)
+    print(f"{'disabled':20s} {baseline * 1e9:8.0f} ns/step")
+    for rate in (0.01, 0.1, 1.0):
+        tracer.enable(sample_rate=rate)
+        tracer.clear()
+        print(f"{f'sample_rate={rate}':20s} {run_steps(tracer, steps) * 1e9:8.0f} ns/step")
+    tracer.disable()
+    with SamplingProfiler(interval=0.005) as profiler:
+        profiled = run_steps(tracer, steps)
+    print(f"{'profiler (5 ms)':20s} {profiled * 1e9:8.0f} ns/step  ({profiler.sample_count} samples)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,42 @@
+# bench_work_stealing.py
+# Usage: python -m benchmarks.bench_work_stealing [tasks]
+#
+# Scaling of WorkStealingExecutor from 1 to N cores on a CPU-bound,
+# embarrassingly parallel task set with uneven task sizes.
+
+import os
+import sys
+import time
+
+from src.planning.work_stealing import WorkStealingExecutor
+
+
+def burn(n):
+    total = 0
+    for i in range(n):
+        total += i * i
+    return total
+
+
+def main(num_tasks=2000):
+    # Every 16th task is 10x heavier, so static partitioning would be unbalanced.
+    tasks = [200_000 if i % 16 == 0 else 20_000 for i in range(num_tasks)]
+    start = time.perf_counter()
+    for n in tasks:
+        burn(n)
+    serial = time.perf_counter() - start
+    print(f"serial: {serial:.2f}s")
+
+    cores = os.cpu_count()
+    counts = sorted({1, 2, 4, 8, 16, 32, 64, cores} & set(range(1, cores + 1)))
+    for workers in counts:
+        with WorkStealingExecutor(num_workers=workers) as executor:
+            start = time.perf_counter()
+            executor.map(burn, tasks)
+            elapsed = time.perf_counter() - start
+        print(f"{workers:>3} workers: {elapsed:6.2f}s  speedup {serial / elapsed:5.2f}x  "
+              f"efficiency {serial / elapsed / workers:4.0%}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
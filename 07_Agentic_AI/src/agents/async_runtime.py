@@ -0,0 +1,99 @@
+import asyncio
+import time
+
+from src.tools.instrumentation import LatencyHistogram
+
+
+class AgentRuntime:
+    """Runs the async methods of many AutonomousAgents on one event loop.
+
+    Each agent gets a semaphore so it never has more than
+    ``max_concurrency_per_agent`` tasks in flight. Tasks can be given a
+    timeout and can be cancelled per agent or all at once. An agent's
+    semaphore lives only while it has tasks in flight, so the runtime can
+    be reused across event loops and keeps no state for idle agents.
+    """
+
+    def __init__(self, max_concurrency_per_agent=1, default_timeout=None):
+        self.max_concurrency_per_agent = max_concurrency_per_agent
+        self.default_timeout = default_timeout
+        self.latencies = LatencyHistogram()  # nanoseconds, fixed memory
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self._agents = {}  # agent -> (semaphore, set of running futures)
+
+    def submit(self, agent, task, timeout=None):
+        """Schedule ``agent.execute_task_async(task)``; must be called from the loop."""
+        timeout = self.default_timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        state = self._agents.get(agent)
+        if state is None:
+            state = self._agents[agent] = (asyncio.Semaphore(self.max_concurrency_per_agent), set())
+        limit, running = state
+        future = loop.create_task(self._run(agent, task, timeout, limit))
+        running.add(future)
+        future.add_done_callback(lambda done: self._done(agent, done))
+        return future
+
+    def cancel(self, agent=None):
+        """Cancel the pending tasks of one agent, or of every agent."""
+        agents = [agent] if agent is not None else list(self._agents)
+        for each in agents:
+            for future in list(self._agents.get(each, (None, ()))[1]):
+                future.cancel()
+
+    async def join(self):
+        """Wait for every submitted task; exceptions are returned, not raised."""
+        futures = [future for _, running in self._agents.values() for future in running]
+        return await asyncio.gather(*futures, return_exceptions=True)
+
+    def run(self, assignments, timeout=None):
+        """Run ``(agent, task)`` pairs to completion and return their results."""
+
+        async def main():
+            futures = [self.submit(agent, task, timeout) for agent, task in assignments]
+            return await asyncio.gather(*futures, return_exceptions=True)
+
+        return asyncio.run(main())
+
+    def stats(self):
+        def percentile(p):
+            return self.latencies.percentile(p) / 1e9
+
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "cancelled": self.cancelled,
+            "p50_latency": percentile(0.50),
+            "p99_latency": percentile(0.99),
+        }
+
+    def _done(self, agent, future):
+        running = self._agents[agent][1]
+        running.discard(future)
+        if not running:
+            del self._agents[agent]
+
+    async def _run(self, agent, task, timeout, limit):
+        start = time.perf_counter_ns()
+        try:
+            async with limit:
+                if timeout is None:
+                    result = await agent.execute_task_async(task)
+                else:
+                    result = await asyncio.wait_for(agent.execute_task_async(task), timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        self.completed += 1
+        self.latencies.record(time.perf_counter_ns() - start)
+        return result
@@ -1,17 +1,83 @@
+import asyncio
+import inspect
+
+from src.agents.base_agent import BaseAgent, create_once
+from src.planning.task_planner import TaskPlanner
+from src.profiling.tracer import tracer
+from src.tools.agent_tools import Tool
+from src.tools.instrumentation import instrumentation
+
+
 class AutonomousAgent(BaseAgent):
-    def __init__(self, name):
-        super().__init__(name)
-        self.memory = AgentMemory()
-        self.task_planner = TaskPlanner()
+    __slots__ = ("_task_planner", "decision_service")
+
+    def __init__(self, name, memory=None, decision_service=None):
+        super().__init__(name, memory)
+        self._task_planner = None  # created on first use, like memory
+        # Optional DecisionService that batches decisions across agents.
+        self.decision_service = decision_service
+
+    @property
+    def task_planner(self):
+        task_planner = self._task_planner
+        if task_planner is None:
+            task_planner = create_once(self, "_task_planner", TaskPlanner)
+        return task_planner
+
+    @task_planner.setter
+    def task_planner(self, task_planner):
+        self._task_planner = task_planner
 
     def execute_task(self, task):
         # Implement task execution logic
-        print(f"{self.name} is executing task: {task}")
+        with tracer.span("execute_task", agent=self.name):
+            print(f"{self.name} is executing task: {task}")
 
     def interact_with_tool(self, tool):
         # Implement interaction with tools
-        print(f"{self.name} is using tool: {tool}")
+        with tracer.span("interact_with_tool", agent=self.name, tool=getattr(tool, "name", tool)):
+            print(f"{self.name} is using tool: {tool}")
 
     def make_decision(self, context):
         # Implement decision-making logic based on context
-        print(f"{self.name} is making a decision based on context: {context}")
\ No newline at end of file
+        with tracer.span("make_decision", agent=self.name):
+            print(f"{self.name} is making a decision based on context: {context}")
+
+    # Async variants used by AgentRuntime. Callables are run rather than
+    # printed; blocking callables are moved to a worker thread so one slow
+    # call never stalls the event loop.
+
+    async def execute_task_async(self, task):
+        if callable(task):
+            with tracer.span("execute_task", agent=self.name):
+                return await _call(task)
+        self.execute_task(task)
+
+    async def interact_with_tool_async(self, tool, *args, **kwargs):
+        function = tool.function if isinstance(tool, Tool) else tool
+        if not isinstance(tool, Tool) and not callable(tool):
+            return self.interact_with_tool(tool)
+        with tracer.span("interact_with_tool", agent=self.name, tool=getattr(tool, "name", tool)):
+            if inspect.iscoroutinefunction(function):
+                if isinstance(tool, Tool) and instrumentation.enabled:
+                    return await instrumentation.call_async(tool.name, function, args, kwargs)
+                return await function(*args, **kwargs)
+            if isinstance(tool, Tool):
+                return await asyncio.to_thread(tool.use, *args, **kwargs)
+            return await asyncio.to_thread(tool, *args, **kwargs)
+
+    async def make_decision_async(self, context):
+        if self.decision_service is not None:
+            with tracer.span("make_decision", agent=self.name):
+                return await self.decision_service.decide(context)
+        await asyncio.sleep(0)
+        return self.make_decision(context)
+
+
+async def _call(function, *args, **kwargs):
+    if inspect.iscoroutinefunction(function):
+        return await function(*args, **kwargs)
+    result = await asyncio.to_thread(function, *args, **kwargs)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
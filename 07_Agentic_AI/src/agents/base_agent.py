@@ -1,16 +1,54 @@
+import threading
+
+from src.memory.agent_memory import AgentMemory
+
+_lazy_lock = threading.Lock()
+
+
+def create_once(agent, attribute, factory):
+    """Set ``agent.<attribute>`` to ``factory()`` unless another thread already did."""
+    with _lazy_lock:
+        value = getattr(agent, attribute)
+        if value is None:
+            value = factory()
+            setattr(agent, attribute, value)
+    return value
+
+
+def _private_memory():
+    # One locked shard rather than the default 16: one agent rarely contends with itself.
+    return AgentMemory(num_shards=1)
+
+
 class BaseAgent:
-    def __init__(self, name):
+    # Slots keep large fleets small; subclasses without __slots__ still get a __dict__.
+    __slots__ = ("name", "_memory")
+
+    def __init__(self, name, memory=None):
         self.name = name
-        self.memory = {}
+        # Pass an AgentMemory to share one thread-safe store between agents.
+        # Otherwise a private, single-shard one is created the first time it is used.
+        self._memory = memory
+
+    @property
+    def memory(self):
+        memory = self._memory
+        if memory is None:
+            memory = create_once(self, "_memory", _private_memory)
+        return memory
+
+    @memory.setter
+    def memory(self, memory):
+        self._memory = memory
     
     def store_memory(self, key, value):
-        self.memory[key] = value
+        self.memory.store_memory(key, value)
     
     def retrieve_memory(self, key):
-        return self.memory.get(key, None)
+        return self.memory.retrieve_memory(key)
     
     def act(self):
         raise NotImplementedError("Subclasses should implement this method.")
     
     def learn(self, experience):
-        raise NotImplementedError("Subclasses should implement this method.")
\ No newline at end of file
+        raise NotImplementedError("Subclasses should implement this method.")
@@ -0,0 +1,177 @@
+import mmap
+import os
+import pickle
+import struct
+import threading
+
+from src.memory.agent_memory import AgentMemory
+
+# Header: magic, format version, kind (full or delta), index offset, index length,
+# metadata offset, metadata length. Value blobs follow the header.
+HEADER = struct.Struct("<4sHH4Q")
+MAGIC = b"AGCK"
+VERSION = 1
+FULL, DELTA = 0, 1
+_MISSING = object()
+
+
+def save_checkpoint(agent, path, incremental=False):
+    """Write the agent's name, memory and planner queue to ``path``.
+
+    A full checkpoint stores every memory entry. An incremental one stores
+    only the keys changed or evicted since the previous checkpoint, and is
+    restored by passing it after its base to ``restore_agent``.
+    """
+    memory = agent.memory
+    delta = memory.checkpoint_delta()
+    try:
+        _write_checkpoint(agent, memory, path, incremental, *delta)
+    except BaseException:
+        memory.restore_checkpoint_delta(delta)  # the next checkpoint must still cover these keys
+        raise
+
+
+def _write_checkpoint(agent, memory, path, incremental, changed, removed, cleared):
+    if incremental:
+        items = []
+        removed = set(removed)
+        for key in changed:
+            value = memory.memory_store.get(key, _MISSING)
+            if value is _MISSING:
+                removed.add(key)  # expired or deleted since it changed
+            else:
+                items.append((key, value))
+    else:
+        items = memory.memory_store.items()
+        removed, cleared = set(), True
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(bytes(HEADER.size))
+        index = {}
+        for key, value in items:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            index[key] = (handle.tell(), len(blob))
+            handle.write(blob)
+        sections = []
+        for section in (index, {"name": agent.name, "tasks": list(agent.task_planner.tasks),
+                                "removed": removed, "cleared": cleared}):
+            blob = pickle.dumps(section, protocol=pickle.HIGHEST_PROTOCOL)
+            sections.extend((handle.tell(), len(blob)))
+            handle.write(blob)
+        handle.seek(0)
+        handle.write(HEADER.pack(MAGIC, VERSION, DELTA if incremental else FULL, *sections))
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+def restore_agent(paths, agent_class=None):
+    """Rebuild an agent from a full checkpoint followed by any deltas.
+
+    Only the indexes are read up front. Memory values stay in the mmapped
+    files and are decoded the first time each key is accessed; call
+    ``agent.memory.memory_store.close()`` to release the files.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    if agent_class is None:
+        from src.agents.autonomous_agent import AutonomousAgent
+        agent_class = AutonomousAgent
+
+    store = LazySnapshotStore()
+    meta = None
+    for path in paths:
+        meta = store.load(path)
+    agent = agent_class(meta["name"], memory=AgentMemory(store=store))
+    agent.task_planner.tasks = meta["tasks"]
+    return agent
+
+
+class LazySnapshotStore:
+    """A dict-like AgentMemory store that decodes checkpoint values on demand."""
+
+    def __init__(self):
+        self._values = {}
+        self._pending = {}  # key -> (mmap, offset, length)
+        self._maps = []
+        self._lock = threading.Lock()
+
+    def load(self, path):
+        with open(path, "rb") as handle:
+            buf = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, kind, index_off, index_len, meta_off, meta_len = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != VERSION:
+            buf.close()
+            raise ValueError(f"'{path}' is not an agent checkpoint.")
+        if kind == FULL and self._maps:
+            raise ValueError("A full checkpoint must come first.")
+        if kind == DELTA and not self._maps:
+            raise ValueError("A delta checkpoint needs a full checkpoint before it.")
+        index = pickle.loads(buf[index_off:index_off + index_len])
+        meta = pickle.loads(buf[meta_off:meta_off + meta_len])
+        with self._lock:
+            if meta["cleared"] and kind == DELTA:
+                self._values.clear()
+                self._pending.clear()
+            for key in meta["removed"]:
+                self._values.pop(key, None)
+                self._pending.pop(key, None)
+            for key, (offset, length) in index.items():
+                self._values.pop(key, None)
+                self._pending[key] = (buf, offset, length)
+            self._maps.append(buf)
+        return meta
+
+    def _decode(self, key):
+        location = self._pending.pop(key, None)
+        if location is not None:
+            buf, offset, length = location
+            self._values[key] = pickle.loads(buf[offset:offset + length])
+
+    def get(self, key, default=None):
+        if key in self._pending:
+            with self._lock:
+                self._decode(key)
+        return self._values.get(key, default)
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._pending.pop(key, None)
+            self._values[key] = value
+
+    def __delitem__(self, key):
+        with self._lock:
+            if self._pending.pop(key, None) is None:
+                del self._values[key]
+
+    def __contains__(self, key):
+        return key in self._values or key in self._pending
+
+    def __len__(self):
+        return len(self._values) + len(self._pending)
+
+    def keys(self):
+        return list(self._values) + list(self._pending)
+
+    def items(self):
+        return [(key, self.get(key)) for key in self.keys()]
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+            self._pending.clear()
+
+    def close(self):
+        """Decode everything still pending and release the mapped files."""
+        with self._lock:
+            for key in list(self._pending):
+                self._decode(key)
+            for buf in self._maps:
+                buf.close()
+            self._maps = []
@@ -0,0 +1,113 @@
+import asyncio
+import time
+
+import numpy as np
+
+
+class LinearPolicy:
+    """A softmax policy over a linear score: ``softmax(X @ weights + bias)``.
+
+    Exposes ``predict_proba`` like a scikit-learn classifier, so either can
+    be handed to a DecisionService.
+    """
+
+    def __init__(self, weights, bias=None, classes=None):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = np.zeros(self.weights.shape[1]) if bias is None else np.asarray(bias, dtype=np.float64)
+        self.classes_ = np.arange(self.weights.shape[1]) if classes is None else np.asarray(classes)
+
+    def predict_proba(self, features):
+        scores = np.asarray(features, dtype=np.float64) @ self.weights + self.bias
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+
+class DecisionService:
+    """Batches make_decision calls from many agents into one policy evaluation.
+
+    Agents ``await decide(context)``. The first pending context opens a batch
+    window of ``max_wait`` seconds on the event loop; when it closes, or as
+    soon as ``max_batch_size`` contexts are pending, the contexts are turned
+    into one feature matrix, the policy's ``predict_proba`` runs once on
+    it, and each agent's future gets its own decision. ``featurize`` maps a
+    context to a feature vector (by default the context itself). A decision
+    is the most probable entry of the policy's ``classes_``. The service
+    serves one event loop at a time and resets when called from a new one.
+    """
+
+    def __init__(self, policy, max_batch_size=256, max_wait=0.002, featurize=None):
+        self.policy = policy
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.featurize = featurize
+        self.batches = 0
+        self.decisions = 0
+        self.policy_time = 0.0
+        self._pending = []
+        self._timer = None
+        self._loop = None  # the loop that owns _pending and _timer
+
+    async def decide(self, context):
+        """Return the decision for ``context``; must be awaited on the event loop."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # A new loop (e.g. another asyncio.run): whatever the old one left is dead.
+            if self._timer is not None:
+                self._timer.cancel()
+            self._pending, self._timer, self._loop = [], None, loop
+        future = loop.create_future()
+        entry = (context, future)
+        self._pending.append(entry)
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self.flush)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if entry in self._pending:
+                self._pending.remove(entry)
+                if not self._pending and self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            raise
+
+    def flush(self):
+        """Evaluate everything pending now instead of waiting for the window."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            decisions = self.decide_batch([context for context, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), decision in zip(batch, decisions):
+            if not future.done():  # the agent may have been cancelled
+                future.set_result(decision)
+
+    def decide_batch(self, contexts):
+        """Return the decisions for a list of contexts with one policy call."""
+        if self.featurize is not None:
+            contexts = [self.featurize(context) for context in contexts]
+        features = np.asarray(contexts, dtype=np.float64)
+        if features.ndim != 2:
+            raise ValueError(f"Contexts must be feature vectors of one length, got shape {features.shape}.")
+        start = time.perf_counter()
+        probabilities = self.policy.predict_proba(features)
+        self.policy_time += time.perf_counter() - start
+        self.batches += 1
+        self.decisions += len(contexts)
+        return np.asarray(self.policy.classes_)[np.argmax(probabilities, axis=1)].tolist()
+
+    def stats(self):
+        return {"batches": self.batches, "decisions": self.decisions,
+                "mean_batch_size": self.decisions / self.batches if self.batches else 0.0,
+                "decisions_per_second": self.decisions / self.policy_time if self.policy_time else 0.0}
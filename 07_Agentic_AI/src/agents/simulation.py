@@ -0,0 +1,166 @@
+import random
+import time
+
+import numpy as np
+
+from src.agents.base_agent import BaseAgent
+
+
+class AgentColumns:
+    """Struct-of-arrays agent state: one NumPy column per attribute, one row per agent."""
+
+    def __init__(self, size):
+        self.size = size
+        self._columns = {}
+
+    def add(self, name, dtype=np.float64, shape=(), fill=0):
+        """Add a column of ``size`` rows, each of ``shape``, and return it."""
+        if name in self._columns:
+            raise ValueError(f"Column '{name}' already exists.")
+        column = np.full((self.size,) + tuple(shape), fill, dtype=dtype)
+        self._columns[name] = column
+        return column
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def names(self):
+        return list(self._columns)
+
+    def row(self, index):
+        """One agent's state as a dict, for inspection and debugging."""
+        return {name: column[index] for name, column in self._columns.items()}
+
+
+class VectorizedBehavior:
+    """The shared act/learn logic of a group of agents, written over all of them at once.
+
+    Where BaseAgent.act and BaseAgent.learn handle one agent, ``act`` and
+    ``learn`` here take the group's AgentColumns and update whole columns
+    with NumPy. ``init_state`` adds the columns the behavior needs.
+    """
+
+    def init_state(self, state):
+        pass
+
+    def act(self, state):
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    def learn(self, state, experience):
+        raise NotImplementedError("Subclasses should implement this method.")
+
+
+class SimulationEngine:
+    """Steps a population of agents in lock-step.
+
+    Agents that share their logic are added as a group with ``add_group``:
+    their state lives in NumPy columns and each step is one vectorized
+    ``act`` and ``learn`` over the whole group. Agents with custom logic
+    are added with ``add_agents`` as ordinary BaseAgent subclasses and are
+    stepped one by one. Either way a step is ``learn(act())``.
+    """
+
+    def __init__(self):
+        self.groups = {}  # name -> (behavior, state)
+        self.agents = []
+        self.steps = 0
+        self.elapsed = 0.0
+
+    def add_group(self, name, behavior, size):
+        """Add ``size`` agents driven by ``behavior``; returns their AgentColumns."""
+        if name in self.groups:
+            raise ValueError(f"Group '{name}' already exists.")
+        state = AgentColumns(size)
+        behavior.init_state(state)
+        self.groups[name] = (behavior, state)
+        return state
+
+    def add_agents(self, agents):
+        self.agents.extend(agents)
+
+    @property
+    def num_agents(self):
+        return sum(state.size for _, state in self.groups.values()) + len(self.agents)
+
+    def step(self):
+        for behavior, state in self.groups.values():
+            behavior.learn(state, behavior.act(state))
+        for agent in self.agents:
+            agent.learn(agent.act())
+        self.steps += 1
+
+    def run(self, steps):
+        start = time.perf_counter()
+        for _ in range(steps):
+            self.step()
+        self.elapsed += time.perf_counter() - start
+        return self.stats()
+
+    def stats(self):
+        steps_per_second = self.steps / self.elapsed if self.elapsed else 0.0
+        return {"agents": self.num_agents, "steps": self.steps,
+                "steps_per_second": steps_per_second,
+                "agent_steps_per_second": steps_per_second * self.num_agents}
+
+
+class BanditBehavior(VectorizedBehavior):
+    """Epsilon-greedy agents learning a multi-armed bandit with Gaussian rewards.
+
+    Each agent keeps its own value estimate per arm. BanditAgent is the same
+    agent written one object at a time.
+    """
+
+    def __init__(self, arm_means, epsilon=0.1, step_size=0.1, seed=None):
+        self.arm_means = np.asarray(arm_means, dtype=np.float64)
+        self.epsilon = epsilon
+        self.step_size = step_size
+        self.rng = np.random.default_rng(seed)
+
+    def init_state(self, state):
+        state.add("estimates", shape=(len(self.arm_means),))
+        state.add("total_reward")
+
+    def act(self, state):
+        actions = state["estimates"].argmax(axis=1)
+        explore = self.rng.random(state.size) < self.epsilon
+        actions[explore] = self.rng.integers(len(self.arm_means), size=int(explore.sum()))
+        rewards = self.rng.normal(self.arm_means[actions], 1.0)
+        return actions, rewards
+
+    def learn(self, state, experience):
+        actions, rewards = experience
+        estimates = state["estimates"]
+        rows = np.arange(state.size)
+        chosen = estimates[rows, actions]
+        estimates[rows, actions] = chosen + self.step_size * (rewards - chosen)
+        total_reward = state["total_reward"]
+        total_reward += rewards
+
+
+class BanditAgent(BaseAgent):
+    """One epsilon-greedy bandit agent; see BanditBehavior."""
+
+    __slots__ = ("arm_means", "epsilon", "step_size", "estimates", "total_reward")
+
+    def __init__(self, name, arm_means, epsilon=0.1, step_size=0.1):
+        super().__init__(name)
+        self.arm_means = list(arm_means)
+        self.epsilon = epsilon
+        self.step_size = step_size
+        self.estimates = [0.0] * len(self.arm_means)
+        self.total_reward = 0.0
+
+    def act(self):
+        if random.random() < self.epsilon:
+            action = random.randrange(len(self.arm_means))
+        else:
+            action = max(range(len(self.estimates)), key=self.estimates.__getitem__)
+        return action, random.gauss(self.arm_means[action], 1.0)
+
+    def learn(self, experience):
+        action, reward = experience
+        self.estimates[action] += self.step_size * (reward - self.estimates[action])
+        self.total_reward += reward
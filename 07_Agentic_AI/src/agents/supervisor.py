@@ -0,0 +1,253 @@
+import itertools
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+from multiprocessing.reduction import ForkingPickler
+
+
+class BackpressureError(RuntimeError):
+    """An agent's worker already has ``queue_size`` tasks waiting."""
+
+
+class WorkerCrashedError(RuntimeError):
+    """A task kept crashing its worker process and was given up on."""
+
+
+def _run_agent_task(agent, task):
+    if callable(task):
+        return task()
+    return agent.execute_task(task)
+
+
+def _worker_main(agent_names, tasks, results, current):
+    # Imported here, not at module level, so the supervisor process stays
+    # light and a forkserver preload can pay the import cost once.
+    from src.agents.autonomous_agent import AutonomousAgent
+
+    agents = {name: AutonomousAgent(name) for name in agent_names}
+    results.send((0, True, "ready"))
+    while True:
+        message = tasks.get()
+        if message is None:
+            return
+        task_id, agent_name, payload = message
+        current.value = task_id
+        try:
+            reply = (task_id, True, _run_agent_task(agents[agent_name], pickle.loads(payload)))
+        except Exception as exc:
+            reply = (task_id, False, exc)
+        current.value = 0
+        try:
+            results.send(reply)
+        except Exception as exc:  # an unpicklable result or exception
+            results.send((task_id, False, RuntimeError(f"Task result could not be pickled: {exc!r}")))
+
+
+class _Slot:
+    """One worker process and the agents it hosts."""
+
+    def __init__(self, index, agent_names):
+        self.index = index
+        self.agent_names = agent_names
+        self.pending = {}  # task_id -> [agent_name, pickled task, attempts, future]
+        self.process = None
+
+
+class FleetSupervisor:
+    """Runs a fleet of AutonomousAgents spread over a pool of processes.
+
+    Each worker process hosts ``num_agents / num_workers`` agents. Tasks are
+    sent to an agent by name or round-robin, and ``submit`` returns a Future.
+    An agent's worker may have at most ``queue_size`` tasks outstanding;
+    beyond that ``submit`` blocks, or raises BackpressureError when
+    ``block`` is false or ``timeout`` runs out. A worker that dies is
+    restarted and its unfinished tasks are re-sent; the task it was running
+    is failed with WorkerCrashedError after ``max_task_attempts`` crashes.
+
+    Workers start from a forkserver (where available) that has already
+    imported the agent modules, so a large fleet comes up in seconds.
+    Tasks must be picklable (``submit`` raises TypeError otherwise): a
+    callable is called, anything else is passed to ``agent.execute_task``.
+    """
+
+    def __init__(self, num_agents=1000, num_workers=None, queue_size=1000, max_task_attempts=3,
+                 mp_context=None):
+        self.num_agents = num_agents
+        self.num_workers = min(num_workers or os.cpu_count(), num_agents)
+        self.queue_size = queue_size
+        self.max_task_attempts = max_task_attempts
+        if mp_context is None:
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                mp_context = multiprocessing.get_context("forkserver")
+                mp_context.set_forkserver_preload(["src.agents.autonomous_agent"])
+            else:
+                mp_context = multiprocessing.get_context()
+        self._context = mp_context
+        self.agent_names = [f"agent-{i}" for i in range(num_agents)]
+        self._agent_slot = {name: i % self.num_workers for i, name in enumerate(self.agent_names)}
+        self._round_robin = itertools.cycle(self.agent_names)
+        self._task_ids = itertools.count(1)
+        self._condition = threading.Condition()
+        self._closing = False
+        self._abandoned = False
+        self.completed = 0
+        self.failed = 0
+        self.restarts = 0
+
+        started = time.perf_counter()
+        self._slots = [_Slot(i, self.agent_names[i::self.num_workers]) for i in range(self.num_workers)]
+        for slot in self._slots:
+            self._start(slot)
+        for slot in self._slots:
+            slot.results.recv()  # the "ready" message: the worker's agents exist
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+        self.startup_seconds = time.perf_counter() - started
+        self._started_at = time.perf_counter()
+
+    def submit(self, task, agent=None, block=True, timeout=None):
+        """Queue ``task`` for an agent (round-robin by default); returns a Future."""
+        # Pickled here rather than in the queue's feeder thread, so that an
+        # unpicklable task fails the call instead of leaving a Future that never resolves.
+        try:
+            payload = bytes(ForkingPickler.dumps(task))
+        except Exception as exc:
+            raise TypeError(f"Task could not be pickled: {exc!r}") from exc
+        with self._condition:
+            if self._closing:
+                raise RuntimeError("The supervisor is shut down.")
+            agent = agent if agent is not None else next(self._round_robin)
+            slot = self._slots[self._agent_slot[agent]]
+            if len(slot.pending) >= self.queue_size:
+                if not block:
+                    raise BackpressureError(f"Worker {slot.index} already has {self.queue_size} tasks queued.")
+                ready = self._condition.wait_for(lambda: len(slot.pending) < self.queue_size or self._closing,
+                                                 timeout)
+                if not ready:
+                    raise BackpressureError(f"Worker {slot.index} stayed full for {timeout}s.")
+                if self._closing:
+                    raise RuntimeError("The supervisor is shut down.")
+            task_id = next(self._task_ids)
+            future = Future()
+            future.set_running_or_notify_cancel()  # once queued, a task cannot be recalled
+            slot.pending[task_id] = [agent, payload, 0, future]
+            slot.tasks.put((task_id, agent, payload))
+        return future
+
+    def map(self, tasks):
+        """Run every task across the fleet and return the results in order."""
+        futures = [self.submit(task) for task in tasks]
+        return [future.result() for future in futures]
+
+    def stats(self):
+        elapsed = time.perf_counter() - self._started_at
+        with self._condition:
+            queued = sum(len(slot.pending) for slot in self._slots)
+        return {"agents": self.num_agents, "workers": self.num_workers, "queued": queued,
+                "completed": self.completed, "failed": self.failed, "restarts": self.restarts,
+                "startup_seconds": self.startup_seconds,
+                "tasks_per_second": (self.completed + self.failed) / elapsed if elapsed else 0.0}
+
+    def shutdown(self, wait=True):
+        """Stop the workers; with ``wait`` they finish their queued tasks first."""
+        with self._condition:
+            self._closing = True
+            self._abandoned = not wait
+            self._condition.notify_all()
+            if wait:
+                self._condition.wait_for(lambda: not any(slot.pending for slot in self._slots))
+        for slot in self._slots:
+            if wait:
+                slot.tasks.put(None)
+            else:
+                slot.process.kill()
+        for slot in self._slots:
+            slot.process.join()
+        self._collector.join()
+        for slot in self._slots:
+            for _, _, _, future in slot.pending.values():
+                future.set_exception(RuntimeError("The supervisor was shut down before the task ran."))
+            slot.results.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def _start(self, slot):
+        # Fresh channels on every start: a worker that died mid-read or
+        # mid-write may have left the old ones unusable.
+        slot.tasks = self._context.Queue()
+        slot.results, child_results = self._context.Pipe(duplex=False)
+        slot.current = self._context.Value("q", 0, lock=False)
+        slot.process = self._context.Process(target=_worker_main, daemon=True,
+                                             args=(slot.agent_names, slot.tasks, child_results, slot.current))
+        slot.process.start()
+        child_results.close()
+
+    def _collect(self):
+        while True:
+            with self._condition:
+                slots = list(self._slots)
+                if self._closing and not any(slot.process.is_alive() for slot in slots):
+                    return
+            waitables = {}
+            for slot in slots:
+                waitables[slot.results] = slot
+                waitables[slot.process.sentinel] = slot
+            for ready in wait(list(waitables), timeout=0.1):
+                slot = waitables[ready]
+                if ready is slot.results:
+                    self._drain(slot)
+                elif ready is slot.process.sentinel:
+                    self._drain(slot)
+                    self._restart(slot)
+
+    def _drain(self, slot):
+        while True:
+            try:
+                if not slot.results.poll():
+                    return
+                task_id, ok, value = slot.results.recv()
+            except (EOFError, OSError):
+                return
+            with self._condition:
+                entry = slot.pending.pop(task_id, None)
+                self._condition.notify_all()
+            if entry is None:
+                continue
+            future = entry[3]
+            if ok:
+                self.completed += 1
+                future.set_result(value)
+            else:
+                self.failed += 1
+                future.set_exception(value)
+
+    def _restart(self, slot):
+        with self._condition:
+            if self._abandoned or (self._closing and not slot.pending):
+                return
+            culprit = slot.current.value
+            given_up = []
+            if culprit in slot.pending:
+                slot.pending[culprit][2] += 1
+                if slot.pending[culprit][2] >= self.max_task_attempts:
+                    given_up.append(slot.pending.pop(culprit))
+            slot.process.join()
+            slot.results.close()
+            self._start(slot)
+            self.restarts += 1
+            for task_id in sorted(slot.pending):
+                agent, payload, _, _ = slot.pending[task_id]
+                slot.tasks.put((task_id, agent, payload))
+            self.failed += len(given_up)
+            self._condition.notify_all()
+        for agent, task, attempts, future in given_up:
+            future.set_exception(WorkerCrashedError(
+                f"Task for '{agent}' crashed its worker {attempts} times."))
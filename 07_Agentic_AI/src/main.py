@@ -1,11 +1,37 @@
 # main.py
+#
+# Usage: python -m src.main [--agents N] [--workers N] [--tasks N] [--queue-size N]
+#
+# Starts a fleet of agents under a FleetSupervisor, spreads a demo workload
+# across them and reports fleet-wide throughput.
+
+import argparse
+import functools
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a fleet of autonomous agents.")
+    parser.add_argument("--agents", type=int, default=1000, help="number of agents in the fleet")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--tasks", type=int, default=100000, help="demo tasks to run")
+    parser.add_argument("--queue-size", type=int, default=1000, help="max queued tasks per worker")
+    args = parser.parse_args(argv)
 
-def main():
     print("Initializing Agentic AI...")
-    # Here you would initialize your agent and set up the environment
-    # For example:
-    # agent = AutonomousAgent()
-    # agent.start()
+    # Imported lazily so `--help` and the forkserver start quickly.
+    from src.agents.supervisor import FleetSupervisor
+
+    with FleetSupervisor(num_agents=args.agents, num_workers=args.workers, queue_size=args.queue_size) as fleet:
+        print(f"{args.agents} agents on {fleet.num_workers} workers ready in {fleet.startup_seconds:.2f}s")
+        task = functools.partial(sum, range(1000))
+        futures = [fleet.submit(task) for _ in range(args.tasks)]
+        for future in futures:
+            future.result()
+        stats = fleet.stats()
+    print(f"{stats['completed']} tasks completed, {stats['failed']} failed, {stats['restarts']} worker restarts, "
+          f"{stats['tasks_per_second']:,.0f} tasks/s")
+    return stats
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,18 +1,154 @@
+import threading
+
+from src.memory.eviction import EvictionCache
+from src.memory.sharded_store import ShardedStore
+
+
 class AgentMemory:
-    def __init__(self):
-        self.memory_store = {}
+    """Agent memory backed by a thread-safe, lock-striped ShardedStore.
 
-    def store_memory(self, key, value):
-        self.memory_store[key] = value
+    Pass ``store`` to share one backing store between several AgentMemory
+    instances (and so between agents). Bounded memories default to a single
+    shard so that limits are exact; a larger ``num_shards`` splits the
+    bounds evenly across shards in exchange for less write contention.
+    """
+
+    # Dicts used as sets for change tracking: an empty dict is a third the size of a set.
+    __slots__ = ("on_evict", "vector_index", "bounded", "memory_store", "_delta_lock", "_dirty", "_removed",
+                 "_cleared")
+
+    def __init__(self, max_entries=None, max_bytes=None, ttl=None, policy="lru",
+                 on_evict=None, vector_index=None, store=None, num_shards=None):
+        self.on_evict = on_evict
+        self.vector_index = vector_index
+        self._delta_lock = threading.Lock()
+        self.mark_checkpoint()
+        self.bounded = not (max_entries is None and max_bytes is None and ttl is None)
+        if store is not None:
+            self.memory_store = store
+        elif not self.bounded:
+            self.memory_store = ShardedStore(num_shards or 16)
+        else:
+            num_shards = num_shards or 1
+
+            def make_shard():
+                return EvictionCache(
+                    max_entries=None if max_entries is None else -(-max_entries // num_shards),
+                    max_bytes=None if max_bytes is None else -(-max_bytes // num_shards),
+                    ttl=ttl, policy=policy, on_evict=self._evicted)
+
+            self.memory_store = ShardedStore(num_shards, shard_factory=make_shard)
+
+    def store_memory(self, key, value, ttl=None, vector=None):
+        if ttl is not None:
+            if not self.bounded:
+                raise ValueError("Per-key TTL requires a bounded AgentMemory.")
+            self.memory_store.put(key, value, ttl=ttl)
+        else:
+            self.memory_store[key] = value
+        self._changed(key)
+        if vector is not None:
+            self._index_vector(key, vector)
 
     def retrieve_memory(self, key):
         return self.memory_store.get(key, None)
 
-    def update_memory(self, key, value):
-        if key in self.memory_store:
-            self.memory_store[key] = value
+    def update_memory(self, key, value, vector=None):
+        if isinstance(self.memory_store, ShardedStore):
+            found = self.memory_store.replace(key, value)
         else:
+            found = key in self.memory_store
+            if found:
+                self.memory_store[key] = value
+        if not found:
             raise KeyError(f"Memory key '{key}' not found.")
+        self._changed(key)
+        if vector is not None:
+            self._index_vector(key, vector)
 
     def clear_memory(self):
-        self.memory_store.clear()
\ No newline at end of file
+        self.memory_store.clear()
+        with self._delta_lock:
+            self._dirty = {}
+            self._removed = {}
+            self._cleared = True
+        if self.vector_index is not None:
+            self.vector_index.clear()
+
+    def recall(self, query_vector, k=5):
+        """Return up to k (key, value, score) tuples most similar to the query."""
+        return self.recall_batch([query_vector], k)[0]
+
+    def recall_batch(self, query_vectors, k=5):
+        if self.vector_index is None:
+            return [[] for _ in query_vectors]
+        results = []
+        for hits in self.vector_index.search(query_vectors, k):
+            results.append([(key, self.memory_store.get(key), score) for key, score in hits])
+        return results
+
+    def checkpoint_delta(self):
+        """Take (changed keys, removed keys, cleared) since the last checkpoint.
+
+        The tracking is reset in the same step, so a change made while the
+        checkpoint is being written lands in the next one. Hand the delta
+        to ``restore_checkpoint_delta`` if the checkpoint could not be written.
+        """
+        with self._delta_lock:
+            delta = set(self._dirty), set(self._removed), self._cleared
+            self._dirty = {}
+            self._removed = {}
+            self._cleared = False
+        return delta
+
+    def restore_checkpoint_delta(self, delta):
+        """Merge back a delta taken by ``checkpoint_delta`` that was never saved."""
+        changed, removed, cleared = delta
+        with self._delta_lock:
+            if self._cleared:
+                return  # a later clear already supersedes it
+            # Newer changes and removals win over the returned ones.
+            for key in changed:
+                if key not in self._removed:
+                    self._dirty[key] = None
+            for key in removed:
+                if key not in self._dirty:
+                    self._removed[key] = None
+            self._cleared = cleared
+
+    def mark_checkpoint(self):
+        with self._delta_lock:
+            self._dirty = {}
+            self._removed = {}
+            self._cleared = False
+
+    def memory_stats(self):
+        stats = {"entries": len(self.memory_store)}
+        if hasattr(self.memory_store, "stats"):
+            stats.update(self.memory_store.stats())
+        for shard in getattr(self.memory_store, "shards", []):
+            if isinstance(shard, EvictionCache):
+                for name, value in shard.stats().items():
+                    if name != "entries":
+                        stats[name] = stats.get(name, 0) + value
+        return stats
+
+    def _index_vector(self, key, vector):
+        if self.vector_index is None:
+            from src.memory.vector_index import BruteForceIndex
+            self.vector_index = BruteForceIndex(dim=len(vector))
+        self.vector_index.add(key, vector)
+
+    def _changed(self, key):
+        with self._delta_lock:
+            self._dirty[key] = None
+            self._removed.pop(key, None)
+
+    def _evicted(self, key, value):
+        with self._delta_lock:
+            self._dirty.pop(key, None)
+            self._removed[key] = None
+        if self.vector_index is not None:
+            self.vector_index.remove(key)
+        if self.on_evict is not None:
+            self.on_evict(key, value)
@@ -0,0 +1,189 @@
+import sys
+import time
+from collections import OrderedDict
+
+
+class EvictionCache:
+    """A bounded key/value store with LRU or LFU eviction and per-key TTL.
+
+    Behaves like a dict for the operations AgentMemory needs. Every get and
+    put is O(1); limits are enforced on insert.
+    """
+
+    POLICIES = ("lru", "lfu")
+
+    def __init__(self, max_entries=None, max_bytes=None, ttl=None, policy="lru",
+                 on_evict=None, sizeof=sys.getsizeof):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown eviction policy '{policy}'.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.policy = policy
+        self.on_evict = on_evict
+        self.sizeof = sizeof
+
+        self._data = OrderedDict()  # key -> value, in LRU order
+        self._sizes = {}
+        self._expires = {}
+        self._freq = {}  # LFU: key -> access count
+        self._buckets = {}  # LFU: count -> OrderedDict of keys
+        self._min_freq = 0
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # -- dict protocol -------------------------------------------------
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(list(self._data))
+
+    def __contains__(self, key):
+        if key not in self._data:
+            return False
+        if self._expired(key):
+            self._remove(key, expired=True)
+            return False
+        return True
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __delitem__(self, key):
+        if key not in self._data:
+            raise KeyError(key)
+        self._drop(key)
+
+    def get(self, key, default=None):
+        if key not in self:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._touch(key)
+        return self._data[key]
+
+    def keys(self):
+        return list(self._data)
+
+    def items(self):
+        return [(key, self._data[key]) for key in self if key in self]
+
+    def clear(self):
+        self._data.clear()
+        self._sizes.clear()
+        self._expires.clear()
+        self._freq.clear()
+        self._buckets.clear()
+        self._min_freq = 0
+        self.total_bytes = 0
+
+    # -- cache operations ----------------------------------------------
+
+    def put(self, key, value, ttl=None):
+        """Insert or replace a value, evicting other entries if needed."""
+        if key in self._data:
+            self.total_bytes -= self._sizes[key]
+            self._data[key] = value
+            self._touch(key)
+        else:
+            self._data[key] = value
+            if self.policy == "lfu":
+                self._freq[key] = 1
+                self._buckets.setdefault(1, OrderedDict())[key] = None
+                self._min_freq = 1
+
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        self._sizes[key] = size
+        self.total_bytes += size
+
+        ttl = self.ttl if ttl is None else ttl
+        if ttl is not None:
+            self._expires[key] = time.monotonic() + ttl
+        else:
+            self._expires.pop(key, None)
+
+        self._enforce_limits(protect=key)
+
+    def stats(self):
+        return {
+            "entries": len(self._data),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    # -- internals -----------------------------------------------------
+
+    def _expired(self, key):
+        deadline = self._expires.get(key)
+        return deadline is not None and deadline <= time.monotonic()
+
+    def _touch(self, key):
+        if self.policy == "lru":
+            self._data.move_to_end(key)
+            return
+        count = self._freq[key]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_freq == count:
+                self._min_freq = count + 1
+        self._freq[key] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def _victim(self, protect):
+        if self.policy == "lru":
+            # The protected key was just moved to the end, so it is never first
+            # unless it is the only entry.
+            return next(iter(self._data))
+        for key in self._buckets[self._min_freq]:
+            if key != protect:
+                return key
+        next_freq = min(count for count in self._buckets if count > self._min_freq)
+        return next(iter(self._buckets[next_freq]))
+
+    def _over_limit(self):
+        if self.max_entries is not None and len(self._data) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self.total_bytes > self.max_bytes
+
+    def _enforce_limits(self, protect):
+        while self._over_limit() and len(self._data) > 1:
+            self._remove(self._victim(protect))
+
+    def _drop(self, key):
+        value = self._data.pop(key)
+        self.total_bytes -= self._sizes.pop(key)
+        self._expires.pop(key, None)
+        if self.policy == "lfu":
+            count = self._freq.pop(key)
+            bucket = self._buckets[count]
+            del bucket[key]
+            if not bucket:
+                del self._buckets[count]
+                if self._min_freq == count:
+                    self._min_freq = min(self._buckets, default=0)
+        return value
+
+    def _remove(self, key, expired=False):
+        value = self._drop(key)
+        if expired:
+            self.expirations += 1
+        else:
+            self.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(key, value)
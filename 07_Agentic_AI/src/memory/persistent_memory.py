@@ -0,0 +1,325 @@
+import mmap
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+# Log record: crc32, key length, value length, op, then key and value bytes.
+RECORD_HEADER = struct.Struct("<IIIB")
+# Index record: key length, value offset in the log, value length, then key bytes.
+INDEX_HEADER = struct.Struct("<IQI")
+
+OP_PUT = 0
+OP_DELETE = 1
+TOMBSTONE = 0xFFFFFFFF
+
+
+def _scan_log(buf, start):
+    """Yield (key_bytes, op, value_offset, value_length, end) for each intact record.
+
+    Scanning stops at the first torn or corrupt record; the caller truncates there.
+    """
+    offset = start
+    size = len(buf)
+    while offset + RECORD_HEADER.size <= size:
+        crc, klen, vlen, op = RECORD_HEADER.unpack_from(buf, offset)
+        body = offset + RECORD_HEADER.size
+        end = body + klen + vlen
+        if end > size or zlib.crc32(buf[offset + 12:end]) != crc:
+            return
+        yield bytes(buf[body:body + klen]), op, body + klen, vlen, end
+        offset = end
+
+
+def _encode_record(op, key_bytes, value_bytes=b""):
+    payload = struct.pack("<B", op) + key_bytes + value_bytes
+    header = struct.pack("<III", zlib.crc32(payload), len(key_bytes), len(value_bytes))
+    return header + payload
+
+
+class PersistentMemory:
+    """Append-only, crash-safe on-disk memory with the AgentMemory API.
+
+    Values are appended to ``memory.log`` and located through ``memory.idx``,
+    a compact index of (key, offset, length) records. Reads go through an
+    mmap of the log, so a lookup decodes straight from the page cache.
+    Startup parses only the index plus any log tail the index has not yet
+    covered; a torn record left by a crash is truncated away.
+    """
+
+    def __init__(self, directory, sync=False, compact_ratio=0.5, compact_min_bytes=1 << 20):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.sync = sync
+        self.compact_ratio = compact_ratio
+        self.compact_min_bytes = compact_min_bytes
+        self.log_path = os.path.join(directory, "memory.log")
+        self.index_path = os.path.join(directory, "memory.idx")
+
+        self._lock = threading.RLock()
+        self._compactor = None
+        self._compaction = threading.Lock()  # one compaction at a time, foreground or background
+        self._generation = 0
+        self._map = None
+        self._open()
+
+    # -- AgentMemory API -------------------------------------------------
+
+    def store_memory(self, key, value):
+        key_bytes = pickle.dumps(key)
+        value_bytes = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._append(OP_PUT, key, key_bytes, value_bytes)
+        self._maybe_compact()
+
+    def retrieve_memory(self, key):
+        with self._lock:
+            location = self._index.get(key)
+            if location is None:
+                return None
+            offset, length = location
+            if self._map is None or offset + length > len(self._map):
+                self._remap()
+            view = memoryview(self._map)[offset:offset + length]
+            try:
+                return pickle.loads(view)
+            finally:
+                view.release()
+
+    def update_memory(self, key, value):
+        with self._lock:
+            if key not in self._index:
+                raise KeyError(f"Memory key '{key}' not found.")
+            self.store_memory(key, value)
+
+    def delete_memory(self, key):
+        with self._lock:
+            if key not in self._index:
+                raise KeyError(f"Memory key '{key}' not found.")
+            self._append(OP_DELETE, key, pickle.dumps(key))
+
+    def clear_memory(self):
+        with self._lock:
+            self._close_files()
+            open(self.log_path, "wb").close()
+            open(self.index_path, "wb").close()
+            self._generation += 1
+            self._open()
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def keys(self):
+        return list(self._index)
+
+    # -- lifecycle -------------------------------------------------------
+
+    def flush(self):
+        with self._lock:
+            self._log.flush()
+            self._idx.flush()
+            if self.sync:
+                os.fsync(self._log.fileno())
+                os.fsync(self._idx.fileno())
+
+    def close(self):
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        with self._lock:
+            self.flush()
+            self._close_files()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def compact(self, background=False):
+        """Rewrite the log with only live values and rebuild the index."""
+        if background:
+            with self._lock:
+                if self._compactor is None:
+                    self._compactor = threading.Thread(target=self._compact_in_background, daemon=True)
+                    self._compactor.start()
+                return self._compactor
+        self._compact()  # waits for a running background compaction first
+        return None
+
+    # -- internals -------------------------------------------------------
+
+    def _open(self):
+        self._log = open(self.log_path, "ab")
+        self._idx = open(self.index_path, "ab")
+        self._index = {}
+        self._log_size = self._log.tell()
+        self._live_bytes = 0
+        covered = self._load_index()
+        if covered > self._log_size:
+            # The index outran the log before a crash: rebuild from the log.
+            self._idx.truncate(0)
+            self._index = {}
+            self._live_bytes = 0
+            covered = 0
+        self._recover_tail(covered)
+        self._remap()
+
+    def _load_index(self):
+        size = os.path.getsize(self.index_path)
+        if size == 0:
+            return 0
+        covered = 0
+        offset = 0
+        with open(self.index_path, "rb") as handle:
+            buf = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                while offset + INDEX_HEADER.size <= size:
+                    klen, value_offset, vlen = INDEX_HEADER.unpack_from(buf, offset)
+                    end = offset + INDEX_HEADER.size + klen
+                    if end > size:
+                        break
+                    key = pickle.loads(buf[offset + INDEX_HEADER.size:end])
+                    if vlen == TOMBSTONE:
+                        self._forget(key)
+                        covered = max(covered, value_offset)
+                    else:
+                        self._remember(key, value_offset, vlen)
+                        covered = max(covered, value_offset + vlen)
+                    offset = end
+            finally:
+                buf.close()
+        if offset != size:
+            self._idx.truncate(offset)
+        return covered
+
+    def _recover_tail(self, covered):
+        if covered >= self._log_size:
+            return
+        with open(self.log_path, "rb") as handle:
+            handle.seek(covered)
+            tail = handle.read()
+        end = covered
+        for key_bytes, op, value_offset, vlen, record_end in _scan_log(tail, 0):
+            self._index_record(pickle.loads(key_bytes), key_bytes, op,
+                               covered + value_offset, vlen, covered + record_end)
+            end = covered + record_end
+        if end != self._log_size:
+            self._log.truncate(end)
+            self._log.seek(end)
+            self._log_size = end
+        self._idx.flush()
+
+    def _append(self, op, key, key_bytes, value_bytes=b""):
+        record = _encode_record(op, key_bytes, value_bytes)
+        self._log.write(record)
+        self._log.flush()
+        if self.sync:
+            os.fsync(self._log.fileno())
+        value_offset = self._log_size + RECORD_HEADER.size + len(key_bytes)
+        self._log_size += len(record)
+        self._index_record(key, key_bytes, op, value_offset, len(value_bytes), self._log_size)
+
+    def _index_record(self, key, key_bytes, op, value_offset, vlen, end):
+        if op == OP_DELETE:
+            self._forget(key)
+            self._idx.write(INDEX_HEADER.pack(len(key_bytes), end, TOMBSTONE) + key_bytes)
+        else:
+            self._remember(key, value_offset, vlen)
+            self._idx.write(INDEX_HEADER.pack(len(key_bytes), value_offset, vlen) + key_bytes)
+
+    def _remember(self, key, offset, length):
+        self._forget(key)
+        self._index[key] = (offset, length)
+        self._live_bytes += length
+
+    def _forget(self, key):
+        old = self._index.pop(key, None)
+        if old is not None:
+            self._live_bytes -= old[1]
+
+    def _remap(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._log_size:
+            with open(self.log_path, "rb") as handle:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _close_files(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._log.close()
+        self._idx.close()
+
+    def _maybe_compact(self):
+        dead = self._log_size - self._live_bytes
+        if dead >= self.compact_min_bytes and dead > self.compact_ratio * self._log_size:
+            self.compact(background=True)
+
+    def _compact_in_background(self):
+        try:
+            self._compact()
+        finally:
+            with self._lock:
+                self._compactor = None
+
+    def _compact(self):
+        with self._compaction:
+            with self._lock:
+                self._log.flush()
+                snapshot = dict(self._index)
+                snapshot_end = self._log_size
+                generation = self._generation
+            tmp_log = self.log_path + ".compact"
+            new_index = {}
+            # Copy live values from a private handle so writers are not blocked.
+            with open(self.log_path, "rb") as src, open(tmp_log, "wb") as dst:
+                written = 0
+                for key, (offset, length) in snapshot.items():
+                    src.seek(offset)
+                    key_bytes = pickle.dumps(key)
+                    record = _encode_record(OP_PUT, key_bytes, src.read(length))
+                    dst.write(record)
+                    new_index[key] = (written + RECORD_HEADER.size + len(key_bytes), length)
+                    written += len(record)
+                with self._lock:
+                    if generation != self._generation:
+                        dst.close()
+                        os.remove(tmp_log)
+                        return
+                    # Replay whatever was appended while we were copying.
+                    self._log.flush()
+                    src.seek(snapshot_end)
+                    tail = src.read()
+                    for key_bytes, op, value_offset, vlen, _ in _scan_log(tail, 0):
+                        key = pickle.loads(key_bytes)
+                        if op == OP_DELETE:
+                            new_index.pop(key, None)
+                            continue
+                        record = _encode_record(OP_PUT, key_bytes, tail[value_offset:value_offset + vlen])
+                        dst.write(record)
+                        new_index[key] = (written + RECORD_HEADER.size + len(key_bytes), vlen)
+                        written += len(record)
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                    self._swap(tmp_log, new_index)
+
+    def _swap(self, tmp_log, new_index):
+        tmp_index = self.index_path + ".compact"
+        with open(tmp_index, "wb") as handle:
+            for key, (offset, length) in new_index.items():
+                key_bytes = pickle.dumps(key)
+                handle.write(INDEX_HEADER.pack(len(key_bytes), offset, length) + key_bytes)
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._close_files()
+        os.replace(tmp_log, self.log_path)
+        os.replace(tmp_index, self.index_path)
+        self._generation += 1
+        self._open()
@@ -0,0 +1,235 @@
+import json
+import os
+
+import numpy as np
+
+
+class SumTree:
+    """A binary tree of priorities where each node holds the sum of its children.
+
+    Leaf ``i`` holds the priority of slot ``i``. Updates are O(log n) per
+    slot and ``find`` maps a batch of prefix sums to slots with one
+    vectorized descent, so prioritized sampling costs O(batch * log n).
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.leaves = 1 << max(0, (capacity - 1).bit_length())
+        self.depth = self.leaves.bit_length() - 1
+        self.tree = np.zeros(2 * self.leaves, dtype=np.float64)
+
+    @property
+    def total(self):
+        return self.tree[1]
+
+    def get(self, indices):
+        return self.tree[np.asarray(indices) + self.leaves]
+
+    def set(self, index, priority):
+        """``update`` for a single slot, without the array overhead."""
+        tree = self.tree
+        node = index + self.leaves
+        tree[node] = priority
+        node >>= 1
+        while node:
+            tree[node] = tree[2 * node] + tree[2 * node + 1]
+            node >>= 1
+
+    def update(self, indices, priorities):
+        nodes = np.asarray(indices, dtype=np.int64) + self.leaves
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes >> 1)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values):
+        """Return the slot whose cumulative priority range contains each value."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = self.tree[2 * nodes]
+            right = values >= left
+            values -= np.where(right, left, 0.0)
+            nodes = 2 * nodes + right
+        return nodes - self.leaves
+
+
+class ReplayBuffer:
+    """A preallocated ring buffer of (state, action, reward, next_state, done) experiences.
+
+    Each field is one NumPy column, so ``add`` is a handful of row writes
+    and the oldest experience is overwritten once ``capacity`` is reached.
+    ``sample`` draws a batch uniformly, or in proportion to
+    ``priority ** alpha`` when ``prioritized`` (new experiences get the
+    highest priority seen so far; ``update_priorities`` takes the new TD
+    errors). ``view`` and ``iter_batches`` return slices of the columns
+    themselves, not copies, in slot order: once the buffer has wrapped
+    that is not insertion order. ``chronological`` returns copies ordered
+    oldest first.
+
+    With ``path`` the columns are memory-mapped ``.npy`` files in that
+    directory, so the buffer can be larger than RAM and survives a
+    restart: reopening the same path with the same shapes picks up where
+    ``flush`` last left it. The buffer is meant for a single writer.
+    """
+
+    def __init__(self, capacity, state_shape=(), action_shape=(), state_dtype=np.float32,
+                 action_dtype=np.int64, prioritized=False, alpha=0.6, epsilon=1e-6, path=None, seed=None):
+        self.capacity = capacity
+        self.prioritized = prioritized
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.path = path
+        self.rng = np.random.default_rng(seed)
+        self.size = 0
+        self.position = 0
+        self.max_priority = 1.0
+
+        layout = {
+            "states": (tuple(state_shape), state_dtype),
+            "actions": (tuple(action_shape), action_dtype),
+            "rewards": ((), np.float32),
+            "next_states": (tuple(state_shape), state_dtype),
+            "dones": ((), np.bool_),
+        }
+        restored = False
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            restored = os.path.exists(self._meta_path)
+        self.columns = {name: self._allocate(name, (capacity,) + shape, dtype, restored)
+                        for name, (shape, dtype) in layout.items()}
+        self.states = self.columns["states"]
+        self.actions = self.columns["actions"]
+        self.rewards = self.columns["rewards"]
+        self.next_states = self.columns["next_states"]
+        self.dones = self.columns["dones"]
+        self.tree = SumTree(capacity) if prioritized else None
+        if restored:
+            with open(self._meta_path) as handle:
+                meta = json.load(handle)
+            self.size, self.position = meta["size"], meta["position"]
+            if self.tree is not None and self.size:
+                # Priorities are not persisted; every stored experience starts over at the max.
+                self.tree.update(np.arange(self.size), self.max_priority ** alpha)
+
+    @property
+    def _meta_path(self):
+        return os.path.join(self.path, "replay.json")
+
+    def _allocate(self, name, shape, dtype, restored):
+        if self.path is None:
+            return np.zeros(shape, dtype=dtype)
+        filename = os.path.join(self.path, f"{name}.npy")
+        if restored:
+            column = np.load(filename, mmap_mode="r+")
+            if column.shape != shape or column.dtype != np.dtype(dtype):
+                raise ValueError(f"{filename} holds {column.dtype}{column.shape}, expected {np.dtype(dtype)}{shape}.")
+            return column
+        return np.lib.format.open_memmap(filename, mode="w+", dtype=dtype, shape=shape)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, state, action, reward, next_state, done=False):
+        """Store one experience; returns its slot."""
+        index = self.position
+        self.states[index] = state
+        self.actions[index] = action
+        self.rewards[index] = reward
+        self.next_states[index] = next_state
+        self.dones[index] = done
+        if self.tree is not None:
+            self.tree.set(index, self.max_priority ** self.alpha)
+        self.position = (index + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return index
+
+    def store(self, experience):
+        """``add`` for an experience tuple, as handed to ``BaseAgent.learn``."""
+        return self.add(*experience)
+
+    def extend(self, states, actions, rewards, next_states, dones=False):
+        """Store a batch of experiences with one write per column; returns their slots."""
+        count = len(rewards)
+        keep = min(count, self.capacity)
+        indices = (self.position + np.arange(count - keep, count)) % self.capacity
+        batch = {"states": states, "actions": actions, "rewards": rewards, "next_states": next_states,
+                 "dones": np.broadcast_to(dones, (count,))}
+        for name, values in batch.items():
+            self.columns[name][indices] = np.asarray(values)[count - keep:]
+        if self.tree is not None:
+            self.tree.update(indices, self.max_priority ** self.alpha)
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+        return indices
+
+    def sample(self, batch_size, beta=0.4):
+        """Draw ``batch_size`` experiences with replacement.
+
+        Returns a dict of gathered columns plus ``indices``; prioritized
+        buffers also return importance-sampling ``weights``, normalised to a
+        maximum of 1 and annealed by ``beta``.
+        """
+        if self.size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer.")
+        if self.tree is None:
+            return self._gather(self.rng.integers(self.size, size=batch_size))
+        total = self.tree.total
+        # Stratified: one draw from each of batch_size equal slices of the total priority.
+        bounds = (np.arange(batch_size) + self.rng.random(batch_size)) * (total / batch_size)
+        indices = np.minimum(self.tree.find(bounds), self.size - 1)
+        batch = self._gather(indices)
+        probabilities = self.tree.get(indices) / total
+        weights = (self.size * probabilities) ** -beta
+        batch["weights"] = (weights / weights.max()).astype(np.float32)
+        return batch
+
+    def _gather(self, indices):
+        batch = {name: column[indices] for name, column in self.columns.items()}
+        batch["indices"] = indices
+        return batch
+
+    def update_priorities(self, indices, priorities):
+        """Set new priorities (typically absolute TD errors) for sampled experiences."""
+        if self.tree is None:
+            raise ValueError("update_priorities needs a buffer created with prioritized=True.")
+        priorities = np.abs(np.asarray(priorities, dtype=np.float64)) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
+
+    def view(self, start=0, stop=None):
+        """Zero-copy views of slots ``start:stop`` of every column, in slot order."""
+        stop = self.size if stop is None else stop
+        return {name: column[start:stop] for name, column in self.columns.items()}
+
+    def iter_batches(self, batch_size):
+        """Yield zero-copy views over every stored experience, ``batch_size`` at a time, in slot order."""
+        for start in range(0, self.size, batch_size):
+            yield self.view(start, min(start + batch_size, self.size))
+
+    def chronological(self, start=0, stop=None):
+        """Copies of experiences ``start:stop`` of every column, counted from the oldest."""
+        stop = self.size if stop is None else stop
+        oldest = self.position if self.size == self.capacity else 0
+        indices = (oldest + np.arange(self.size)[start:stop]) % self.capacity
+        return {name: column[indices] for name, column in self.columns.items()}
+
+    def flush(self):
+        """Write a disk-backed buffer's columns and position through to disk."""
+        if self.path is None:
+            return
+        for column in self.columns.values():
+            column.flush()
+        with open(self._meta_path + ".tmp", "w") as handle:
+            json.dump({"size": self.size, "position": self.position}, handle)
+        os.replace(self._meta_path + ".tmp", self._meta_path)
+
+    def close(self):
+        self.flush()
+        self.columns = self.states = self.actions = self.rewards = self.next_states = self.dones = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,102 @@
+import threading
+
+
+class ShardedStore:
+    """A dict-like store split into shards, each guarded by its own lock.
+
+    Writers only lock the shard that owns the key, so writes to different
+    keys rarely contend. When shards are plain dicts, reads take no lock at
+    all (a single dict lookup is atomic), so readers never block each other.
+    Shards with mutating reads, such as an LRU EvictionCache, lock on read too.
+    """
+
+    __slots__ = ("_mask", "_shards", "_locks", "_lock_free_reads")
+
+    def __init__(self, num_shards=16, shard_factory=dict):
+        if num_shards < 1 or num_shards & (num_shards - 1):
+            raise ValueError("num_shards must be a power of two.")
+        self._mask = num_shards - 1
+        self._shards = [shard_factory() for _ in range(num_shards)]
+        self._locks = [threading.Lock() for _ in range(num_shards)]
+        self._lock_free_reads = all(type(shard) is dict for shard in self._shards)
+
+    @property
+    def shards(self):
+        return list(self._shards)
+
+    def _slot(self, key):
+        return hash(key) & self._mask
+
+    def get(self, key, default=None):
+        i = self._slot(key)
+        if self._lock_free_reads:
+            return self._shards[i].get(key, default)
+        with self._locks[i]:
+            return self._shards[i].get(key, default)
+
+    def __getitem__(self, key):
+        i = self._slot(key)
+        if self._lock_free_reads:
+            return self._shards[i][key]
+        with self._locks[i]:
+            return self._shards[i][key]
+
+    def __contains__(self, key):
+        i = self._slot(key)
+        if self._lock_free_reads:
+            return key in self._shards[i]
+        with self._locks[i]:
+            return key in self._shards[i]
+
+    def __setitem__(self, key, value):
+        i = self._slot(key)
+        with self._locks[i]:
+            self._shards[i][key] = value
+
+    def put(self, key, value, ttl=None):
+        i = self._slot(key)
+        with self._locks[i]:
+            if ttl is None:
+                self._shards[i][key] = value
+            else:
+                self._shards[i].put(key, value, ttl=ttl)
+
+    def replace(self, key, value):
+        """Atomically overwrite an existing key; return False if it is absent."""
+        i = self._slot(key)
+        with self._locks[i]:
+            shard = self._shards[i]
+            if key not in shard:
+                return False
+            shard[key] = value
+            return True
+
+    def __delitem__(self, key):
+        i = self._slot(key)
+        with self._locks[i]:
+            del self._shards[i][key]
+
+    def __len__(self):
+        return sum(len(shard) for shard in self._shards)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self):
+        keys = []
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                keys.extend(shard.keys())
+        return keys
+
+    def items(self):
+        items = []
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                items.extend(shard.items())
+        return items
+
+    def clear(self):
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
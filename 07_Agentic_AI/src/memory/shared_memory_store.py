@@ -0,0 +1,245 @@
+import hashlib
+import pickle
+import struct
+import time
+from multiprocessing import shared_memory
+
+# Header: seqlock counter, slot capacity, arena size, arena bytes used, entry count.
+HEADER = struct.Struct("<QQQQQ")
+# Slot: key hash (0 = empty), key offset, value offset, key length, value length, value tag.
+SLOT = struct.Struct("<QQQIIB3x")
+
+TAG_BYTES, TAG_STR, TAG_INT, TAG_FLOAT, TAG_PICKLE = range(5)
+
+
+def _encode_key(key):
+    if isinstance(key, str):
+        return b"s" + key.encode("utf-8")
+    if isinstance(key, bytes):
+        return b"b" + key
+    raise TypeError("SharedMemoryTable keys must be str or bytes.")
+
+
+def _hash(key_bytes):
+    return int.from_bytes(hashlib.blake2b(key_bytes, digest_size=8).digest(), "little") | 1
+
+
+def _encode_value(value):
+    if isinstance(value, bytes):
+        return TAG_BYTES, value
+    if isinstance(value, str):
+        return TAG_STR, value.encode("utf-8")
+    if isinstance(value, bool):
+        return TAG_PICKLE, pickle.dumps(value)
+    if isinstance(value, int) and -(1 << 63) <= value < (1 << 63):
+        return TAG_INT, struct.pack("<q", value)
+    if isinstance(value, float):
+        return TAG_FLOAT, struct.pack("<d", value)
+    return TAG_PICKLE, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _decode_value(tag, raw):
+    if tag == TAG_BYTES:
+        return bytes(raw)
+    if tag == TAG_STR:
+        return str(raw, "utf-8")
+    if tag == TAG_INT:
+        return struct.unpack("<q", raw)[0]
+    if tag == TAG_FLOAT:
+        return struct.unpack("<d", raw)[0]
+    return pickle.loads(raw)
+
+
+class SharedMemoryTable:
+    """A fixed-layout hash table in a ``multiprocessing.shared_memory`` block.
+
+    The block holds a header, an open-addressing slot array and a value
+    arena. Slots point at offsets in the arena, and str/bytes/int/float
+    values are decoded straight from the buffer without pickling. Readers
+    in any process use a seqlock and retry if a write was in progress.
+    Writes must come from a single writer, or hold the multiprocessing lock
+    passed as ``lock``. Arena space is append-only and is reclaimed only
+    by ``clear``.
+
+    Use it as the store of an AgentMemory so pool workers share one
+    knowledge base::
+
+        table = SharedMemoryTable.create(capacity=1 << 16, arena_size=64 << 20)
+        # in each worker
+        memory = AgentMemory(store=SharedMemoryTable.attach(table.name))
+    """
+
+    MAX_LOAD = 0.75
+
+    def __init__(self, shm, lock=None, owner=False):
+        self._shm = shm
+        self._buf = shm.buf
+        self.lock = lock
+        self.owner = owner
+        _, self.capacity, self.arena_size, _, _ = HEADER.unpack_from(self._buf, 0)
+        self._arena_start = HEADER.size + self.capacity * SLOT.size
+
+    @classmethod
+    def create(cls, capacity=1 << 16, arena_size=16 << 20, name=None, lock=None):
+        size = HEADER.size + capacity * SLOT.size + arena_size
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        shm.buf[:HEADER.size + capacity * SLOT.size] = bytes(HEADER.size + capacity * SLOT.size)
+        HEADER.pack_into(shm.buf, 0, 0, capacity, arena_size, 0, 0)
+        return cls(shm, lock=lock, owner=True)
+
+    @classmethod
+    def attach(cls, name, lock=None):
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # Python < 3.13 has no track argument.
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, lock=lock)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def close(self):
+        self._buf = None
+        self._shm.close()
+
+    def unlink(self):
+        self._shm.unlink()
+
+    # -- reads -----------------------------------------------------------
+
+    def get(self, key, default=None):
+        key_bytes = _encode_key(key)
+        key_hash = _hash(key_bytes)
+        buf = self._buf
+        while True:
+            seq = HEADER.unpack_from(buf, 0)[0]
+            if seq & 1:
+                time.sleep(0)
+                continue
+            try:
+                slot = self._find(buf, key_bytes, key_hash)
+                if slot is None:
+                    result = default
+                else:
+                    _, _, val_off, _, val_len, tag = slot[1]
+                    result = _decode_value(tag, buf[val_off:val_off + val_len])
+            except Exception:
+                # A concurrent write can leave us decoding garbage; retry.
+                if HEADER.unpack_from(buf, 0)[0] == seq:
+                    raise
+                continue
+            if HEADER.unpack_from(buf, 0)[0] == seq:
+                return result
+
+    def __getitem__(self, key):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        missing = object()
+        return self.get(key, missing) is not missing
+
+    def __len__(self):
+        return HEADER.unpack_from(self._buf, 0)[4]
+
+    def keys(self):
+        return [key for key, _ in self.items()]
+
+    def items(self):
+        buf = self._buf
+        while True:
+            seq = HEADER.unpack_from(buf, 0)[0]
+            if seq & 1:
+                time.sleep(0)
+                continue
+            items = []
+            for i in range(self.capacity):
+                key_hash, key_off, val_off, key_len, val_len, tag = SLOT.unpack_from(
+                    buf, HEADER.size + i * SLOT.size)
+                if key_hash:
+                    raw_key = bytes(buf[key_off:key_off + key_len])
+                    key = raw_key[1:].decode("utf-8") if raw_key[:1] == b"s" else raw_key[1:]
+                    items.append((key, _decode_value(tag, buf[val_off:val_off + val_len])))
+            if HEADER.unpack_from(buf, 0)[0] == seq:
+                return items
+
+    # -- writes ----------------------------------------------------------
+
+    def __setitem__(self, key, value):
+        key_bytes = _encode_key(key)
+        key_hash = _hash(key_bytes)
+        tag, raw = _encode_value(value)
+        if self.lock is not None:
+            with self.lock:
+                self._write(key_bytes, key_hash, tag, raw)
+        else:
+            self._write(key_bytes, key_hash, tag, raw)
+
+    def clear(self):
+        if self.lock is not None:
+            with self.lock:
+                self._clear()
+        else:
+            self._clear()
+
+    # -- internals -------------------------------------------------------
+
+    def _find(self, buf, key_bytes, key_hash):
+        """Return (slot index, slot fields) for the key, or None if absent."""
+        i = key_hash % self.capacity
+        for _ in range(self.capacity):
+            fields = SLOT.unpack_from(buf, HEADER.size + i * SLOT.size)
+            if fields[0] == 0:
+                return None
+            if fields[0] == key_hash and buf[fields[1]:fields[1] + fields[3]] == key_bytes:
+                return i, fields
+            i = (i + 1) % self.capacity
+        return None
+
+    def _free_slot(self, buf, key_hash):
+        i = key_hash % self.capacity
+        while SLOT.unpack_from(buf, HEADER.size + i * SLOT.size)[0] != 0:
+            i = (i + 1) % self.capacity
+        return i
+
+    def _alloc(self, used, size):
+        if used + size > self.arena_size:
+            raise MemoryError("SharedMemoryTable arena is full.")
+        return self._arena_start + used
+
+    def _write(self, key_bytes, key_hash, tag, raw):
+        buf = self._buf
+        seq, _, _, used, count = HEADER.unpack_from(buf, 0)
+        found = self._find(buf, key_bytes, key_hash)
+        if found is None:
+            if count + 1 > self.MAX_LOAD * self.capacity:
+                raise MemoryError("SharedMemoryTable is full.")
+            index = self._free_slot(buf, key_hash)
+            key_off = self._alloc(used, len(key_bytes) + len(raw))
+            buf[key_off:key_off + len(key_bytes)] = key_bytes
+            val_off = key_off + len(key_bytes)
+            used += len(key_bytes) + len(raw)
+            count += 1
+        else:
+            index, fields = found
+            key_off = fields[1]
+            val_off = self._alloc(used, len(raw))
+            used += len(raw)
+        # The value lands in unused arena space first; only the slot update
+        # is visible to readers, so it alone sits inside the seqlock.
+        buf[val_off:val_off + len(raw)] = raw
+        HEADER.pack_into(buf, 0, seq + 1, self.capacity, self.arena_size, used, count)
+        SLOT.pack_into(buf, HEADER.size + index * SLOT.size,
+                       key_hash, key_off, val_off, len(key_bytes), len(raw), tag)
+        HEADER.pack_into(buf, 0, seq + 2, self.capacity, self.arena_size, used, count)
+
+    def _clear(self):
+        buf = self._buf
+        seq = HEADER.unpack_from(buf, 0)[0]
+        HEADER.pack_into(buf, 0, seq + 1, self.capacity, self.arena_size, 0, 0)
+        buf[HEADER.size:self._arena_start] = bytes(self._arena_start - HEADER.size)
+        HEADER.pack_into(buf, 0, seq + 2, self.capacity, self.arena_size, 0, 0)
@@ -0,0 +1,190 @@
+import pickle
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+
+from src.memory.persistent_memory import PersistentMemory
+
+
+class TieredMemory:
+    """A dict-like store with hot, warm and cold tiers.
+
+    New and frequently used entries live in the hot tier as plain objects.
+    When the hot tier is over budget its least recently used entries are
+    demoted to the warm tier as zlib-compressed pickles, and warm overflow
+    is demoted to an on-disk PersistentMemory. An entry read
+    ``promote_after`` times in a lower tier moves up one tier. Values that
+    cannot be pickled are never demoted and stay in the hot tier.
+
+    Use it as the store of an AgentMemory::
+
+        memory = AgentMemory(store=TieredMemory(hot_max_entries=10_000,
+                                                warm_max_bytes=256 << 20))
+    """
+
+    def __init__(self, hot_max_entries=1024, warm_max_bytes=64 << 20, cold_directory=None,
+                 promote_after=2, compression_level=1):
+        self.hot_max_entries = hot_max_entries
+        self.warm_max_bytes = warm_max_bytes
+        self.promote_after = promote_after
+        self.compression_level = compression_level
+        self.cold_directory = cold_directory or tempfile.mkdtemp(prefix="agent-cold-")
+
+        self._hot = OrderedDict()
+        self._warm = OrderedDict()
+        self._warm_bytes = 0
+        self._cold = PersistentMemory(self.cold_directory)
+        self._accesses = {}
+        self._lock = threading.RLock()
+
+        self.hits = {"hot": 0, "warm": 0, "cold": 0}
+        self.misses = 0
+        self.promotions = 0
+        self.demotions = 0
+
+    # -- dict protocol -------------------------------------------------
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._hot:
+                self.hits["hot"] += 1
+                self._hot.move_to_end(key)
+                return self._hot[key]
+            if key in self._warm:
+                self.hits["warm"] += 1
+                value = self._decompress(self._warm[key])
+                if self._accessed(key):
+                    self._remove_warm(key)
+                    self._put_hot(key, value)
+                else:
+                    self._warm.move_to_end(key)
+                return value
+            if key in self._cold:
+                self.hits["cold"] += 1
+                value = self._cold.retrieve_memory(key)
+                if self._accessed(key):
+                    self._cold.delete_memory(key)
+                    self._put_warm(key, self._compress(value))
+                return value
+            self.misses += 1
+            return default
+
+    def __getitem__(self, key):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._discard(key)
+            self._put_hot(key, value)
+
+    def __delitem__(self, key):
+        with self._lock:
+            if not self._discard(key):
+                raise KeyError(key)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._hot or key in self._warm or key in self._cold
+
+    def __len__(self):
+        return len(self._hot) + len(self._warm) + len(self._cold)
+
+    def keys(self):
+        with self._lock:
+            return list(self._hot) + list(self._warm) + self._cold.keys()
+
+    def items(self):
+        return [(key, self.get(key)) for key in self.keys()]
+
+    def clear(self):
+        with self._lock:
+            self._hot.clear()
+            self._warm.clear()
+            self._warm_bytes = 0
+            self._accesses.clear()
+            self._cold.clear_memory()
+
+    def close(self):
+        self._cold.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hot_entries": len(self._hot),
+                "warm_entries": len(self._warm),
+                "warm_bytes": self._warm_bytes,
+                "cold_entries": len(self._cold),
+                "hot_hits": self.hits["hot"],
+                "warm_hits": self.hits["warm"],
+                "cold_hits": self.hits["cold"],
+                "misses": self.misses,
+                "promotions": self.promotions,
+                "demotions": self.demotions,
+            }
+
+    # -- internals -----------------------------------------------------
+
+    def _compress(self, value):
+        return zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                             self.compression_level)
+
+    def _decompress(self, blob):
+        return pickle.loads(zlib.decompress(blob))
+
+    def _accessed(self, key):
+        """Count a lower-tier read and report whether the entry should move up."""
+        count = self._accesses.get(key, 0) + 1
+        if count >= self.promote_after:
+            self._accesses.pop(key, None)
+            self.promotions += 1
+            return True
+        self._accesses[key] = count
+        return False
+
+    def _discard(self, key):
+        self._accesses.pop(key, None)
+        if key in self._hot:
+            del self._hot[key]
+            return True
+        if key in self._warm:
+            self._remove_warm(key)
+            return True
+        if key in self._cold:
+            self._cold.delete_memory(key)
+            return True
+        return False
+
+    def _remove_warm(self, key):
+        blob = self._warm.pop(key, None)
+        if blob is not None:
+            self._warm_bytes -= len(blob)
+
+    def _put_hot(self, key, value):
+        self._hot[key] = value
+        unpicklable = []  # cannot leave the hot tier; they still count against its budget
+        while self._hot and len(self._hot) + len(unpicklable) > self.hot_max_entries:
+            old_key, old_value = self._hot.popitem(last=False)
+            try:
+                blob = self._compress(old_value)
+            except Exception:
+                unpicklable.append((old_key, old_value))
+                continue
+            self.demotions += 1
+            self._put_warm(old_key, blob)
+        for old_key, old_value in reversed(unpicklable):
+            self._hot[old_key] = old_value
+            self._hot.move_to_end(old_key, last=False)
+
+    def _put_warm(self, key, blob):
+        self._warm[key] = blob
+        self._warm_bytes += len(blob)
+        while self._warm_bytes > self.warm_max_bytes and self._warm:
+            old_key, old_blob = self._warm.popitem(last=False)
+            self._warm_bytes -= len(old_blob)
+            self.demotions += 1
+            self._cold.store_memory(old_key, self._decompress(old_blob))
@@ -0,0 +1,186 @@
+import numpy as np
+
+
+def _normalize(vectors):
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores, k):
+    """Return (indices, scores) of the k best columns of each row, best first."""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.int64), empty
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1)
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+
+class BruteForceIndex:
+    """Exact cosine-similarity search over a preallocated NumPy matrix.
+
+    Inserts amortize to O(d), deletes swap the last row into the hole, and a
+    batch of queries is answered with a single matrix product.
+    """
+
+    def __init__(self, dim, capacity=1024):
+        self.dim = dim
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._keys = []
+        self._rows = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    def add(self, key, vector):
+        vector = _normalize(vector)[0]
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self._keys)
+            if row == len(self._vectors):
+                grown = np.zeros((2 * len(self._vectors), self.dim), dtype=np.float32)
+                grown[:row] = self._vectors
+                self._vectors = grown
+            self._keys.append(key)
+            self._rows[key] = row
+        self._vectors[row] = vector
+
+    def add_batch(self, keys, vectors):
+        for key, vector in zip(keys, _normalize(vectors)):
+            self.add(key, vector)
+
+    def remove(self, key):
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        last = len(self._keys) - 1
+        if row != last:
+            moved = self._keys[last]
+            self._vectors[row] = self._vectors[last]
+            self._keys[row] = moved
+            self._rows[moved] = row
+        self._keys.pop()
+
+    def clear(self):
+        self._keys = []
+        self._rows = {}
+
+    def keys(self):
+        return list(self._keys)
+
+    def vectors(self):
+        return self._vectors[:len(self._keys)]
+
+    def search(self, queries, k=5, normalized=False):
+        """Return, for each query row, a list of (key, score) best first."""
+        queries = queries if normalized else _normalize(queries)
+        scores = queries @ self.vectors().T
+        indices, best = _top_k(scores, k)
+        return [[(self._keys[i], float(s)) for i, s in zip(row, row_scores)]
+                for row, row_scores in zip(indices, best)]
+
+
+class IVFIndex:
+    """Approximate search with an inverted file of k-means clusters.
+
+    Vectors are bucketed by their nearest centroid and a query only scans the
+    ``nprobe`` closest buckets. Until ``train_size`` vectors have been added
+    the index behaves like a single brute-force bucket.
+    """
+
+    def __init__(self, dim, nlist=256, nprobe=8, train_size=None, iterations=10, seed=0):
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_size = train_size if train_size is not None else 32 * nlist
+        self.iterations = iterations
+        self._rng = np.random.default_rng(seed)
+        self.centroids = None
+        self._lists = [BruteForceIndex(dim)]
+        self._assignment = {}
+
+    def __len__(self):
+        return len(self._assignment)
+
+    def __contains__(self, key):
+        return key in self._assignment
+
+    def add(self, key, vector):
+        self.add_batch([key], [vector])
+
+    def add_batch(self, keys, vectors):
+        vectors = _normalize(vectors)
+        last = {key: row for row, key in enumerate(keys)}
+        if len(last) < len(vectors):
+            # A key repeated within the batch keeps only its last vector.
+            keys, vectors = list(last), vectors[list(last.values())]
+        for key in keys:
+            self.remove(key)
+        lists = self._assign(vectors)
+        for key, vector, list_id in zip(keys, vectors, lists):
+            self._lists[list_id].add(key, vector)
+            self._assignment[key] = list_id
+        if self.centroids is None and len(self) >= self.train_size:
+            self.train()
+
+    def remove(self, key):
+        list_id = self._assignment.pop(key, None)
+        if list_id is not None:
+            self._lists[list_id].remove(key)
+
+    def clear(self):
+        self.centroids = None
+        self._lists = [BruteForceIndex(self.dim)]
+        self._assignment = {}
+
+    def train(self):
+        """Cluster the stored vectors and redistribute them into buckets."""
+        keys = [key for bucket in self._lists for key in bucket.keys()]
+        data = np.concatenate([bucket.vectors() for bucket in self._lists])
+        nlist = min(self.nlist, len(keys))
+        sample = data[self._rng.choice(len(data), size=min(len(data), 64 * nlist), replace=False)]
+        centroids = sample[self._rng.choice(len(sample), size=nlist, replace=False)]
+        for _ in range(self.iterations):
+            nearest = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[nearest == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids = _normalize(centroids)
+        self.centroids = centroids
+        self._lists = [BruteForceIndex(self.dim, capacity=max(16, 2 * len(keys) // nlist))
+                       for _ in range(nlist)]
+        self._assignment = {}
+        lists = self._assign(data)
+        for key, vector, list_id in zip(keys, data, lists):
+            self._lists[list_id].add(key, vector)
+            self._assignment[key] = list_id
+
+    def search(self, queries, k=5):
+        queries = _normalize(queries)
+        if self.centroids is None:
+            return self._lists[0].search(queries, k, normalized=True)
+        nprobe = min(self.nprobe, len(self.centroids))
+        probes, _ = _top_k(queries @ self.centroids.T, nprobe)
+        # Group queries by bucket so each bucket is scanned with one matmul.
+        candidates = [[] for _ in range(len(queries))]
+        for list_id in np.unique(probes):
+            bucket = self._lists[list_id]
+            if not len(bucket):
+                continue
+            rows = np.nonzero((probes == list_id).any(axis=1))[0]
+            for row, hits in zip(rows, bucket.search(queries[rows], k, normalized=True)):
+                candidates[row].extend(hits)
+        return [sorted(hits, key=lambda hit: hit[1], reverse=True)[:k] for hits in candidates]
+
+    def _assign(self, vectors):
+        if self.centroids is None:
+            return np.zeros(len(vectors), dtype=np.int64)
+        return np.argmax(vectors @ self.centroids.T, axis=1)
@@ -0,0 +1,229 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from src.planning.task_planner import TaskPlanner
+
+
+def _noop():
+    return None
+
+
+class PlannedTask:
+    """A task node: its dependencies, estimated cost and resource tags."""
+
+    __slots__ = ("task", "function", "depends_on", "cost", "resources", "dependents", "priority")
+
+    def __init__(self, task, function, depends_on, cost, resources):
+        self.task = task
+        self.function = function
+        self.depends_on = tuple(depends_on)
+        self.cost = cost
+        self.resources = frozenset(resources)
+        self.dependents = []
+        self.priority = cost  # cost of the longest path from here to a sink
+
+
+class DAGPlanner(TaskPlanner):
+    """A TaskPlanner for tasks with dependencies.
+
+    Tasks are ordered critical-path first: a task's priority is the cost of
+    the longest chain of work that still depends on it. ``run`` dispatches
+    every ready task to a thread or process pool, never runs two tasks that
+    share a resource tag at once, and accepts new tasks while it runs.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.nodes = {}
+        self.makespan = None
+        self._lock = threading.Lock()
+        self._done = set()
+        self._started = set()
+        self._waiting_on = {}
+        self._ready = []  # heap of (-priority, insertion order, task)
+        self._order = {}
+        self._counter = itertools.count()
+
+    def add_task(self, task, depends_on=(), cost=1.0, resources=(), function=None):
+        if function is None and callable(task):
+            function = task
+        with self._lock:
+            if task in self.nodes:
+                raise ValueError(f"Task '{task}' already exists.")
+            node = PlannedTask(task, function, depends_on, cost, resources)
+            self.nodes[task] = node
+            cycle = self._find_cycle(task)
+            if cycle:
+                del self.nodes[task]
+                raise ValueError(f"Adding '{task}' creates a cycle: {' -> '.join(map(str, cycle))}")
+            super().add_task(task)
+            self._order[task] = next(self._counter)
+            for dep in node.depends_on:
+                if dep in self.nodes:
+                    self.nodes[dep].dependents.append(node)
+                else:
+                    self._waiting_on.setdefault(dep, []).append(node)
+            # Link tasks that named this one as a dependency before it existed.
+            node.dependents.extend(self._waiting_on.pop(task, []))
+            self._update_priority(node)
+
+    def remove_task(self, task):
+        """Remove a task that has not started; tasks depending on it wait for it to be re-added."""
+        with self._lock:
+            node = self.nodes.get(task)
+            if node is None:
+                raise ValueError(f"Task '{task}' not found.")
+            if task in self._started:
+                raise ValueError(f"Task '{task}' has already started.")
+            del self.nodes[task]
+            del self._order[task]
+            super().remove_task(task)
+            for dep in node.depends_on:
+                if dep in self.nodes:
+                    self.nodes[dep].dependents.remove(node)
+                    self._update_priority(self.nodes[dep])
+                else:
+                    waiting = self._waiting_on[dep]
+                    waiting.remove(node)
+                    if not waiting:
+                        del self._waiting_on[dep]
+            if node.dependents:
+                self._waiting_on[task] = node.dependents
+
+    def create_task_sequence(self):
+        return list(self.tasks)
+
+    def optimize_task_execution(self):
+        """Return a topological order that starts the critical path first."""
+        self._check_complete()
+        remaining = {task: len(node.depends_on) for task, node in self.nodes.items()}
+        ready = [(-node.priority, self._order[task], task)
+                 for task, node in self.nodes.items() if not node.depends_on]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, _, task = heapq.heappop(ready)
+            order.append(task)
+            for dependent in self.nodes[task].dependents:
+                remaining[dependent.task] -= 1
+                if remaining[dependent.task] == 0:
+                    heapq.heappush(ready, (-dependent.priority, self._order[dependent.task], dependent.task))
+        return order
+
+    def plan_diff(self):
+        raise NotImplementedError("DAGPlanner does not track plan diffs.")
+
+    def estimate_makespan(self, workers=1):
+        """Simulate list scheduling of the estimated costs on ``workers`` slots."""
+        finish = {}
+        free_at = [0.0] * workers
+        for task in self.optimize_task_execution():
+            node = self.nodes[task]
+            ready_at = max((finish[dep] for dep in node.depends_on), default=0.0)
+            slot = min(range(workers), key=free_at.__getitem__)
+            start = max(ready_at, free_at[slot])
+            finish[task] = free_at[slot] = start + node.cost
+        return max(finish.values(), default=0.0)
+
+    def run(self, max_workers=4, executor=None):
+        """Execute all tasks and return {task: result}; sets ``self.makespan``."""
+        self._check_complete()
+        owns_executor = executor is None
+        executor = executor or ThreadPoolExecutor(max_workers=max_workers)
+        results = {}
+        running = {}
+        busy = set()
+        error = None
+        start = time.perf_counter()
+        try:
+            while True:
+                with self._lock:
+                    if error is None:
+                        self._dispatch(executor, running, busy, max_workers)
+                    if not running:
+                        if error is None and len(self._done) < len(self.nodes):
+                            raise ValueError("Some tasks depend on tasks that were never added.")
+                        break
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                with self._lock:
+                    for future in finished:
+                        node = running.pop(future)
+                        busy -= node.resources
+                        if future.exception() is not None:
+                            error = error or future.exception()
+                            continue
+                        results[node.task] = future.result()
+                        self._complete(node)
+        finally:
+            if owns_executor:
+                executor.shutdown()
+        self.makespan = time.perf_counter() - start
+        if error is not None:
+            raise error
+        return results
+
+    def _dispatch(self, executor, running, busy, max_workers):
+        blocked = []
+        while self._ready and len(running) < max_workers:
+            entry = heapq.heappop(self._ready)
+            node = self.nodes.get(entry[2])
+            if node is None or -entry[0] != node.priority or node.task in self._started:
+                # Stale entry from before a re-plan or removal; any current one is queued too.
+                continue
+            if node.resources & busy:
+                blocked.append(entry)
+                continue
+            busy |= node.resources
+            self._started.add(node.task)
+            running[executor.submit(node.function or _noop)] = node
+        for entry in blocked:
+            heapq.heappush(self._ready, entry)
+
+    def _complete(self, node):
+        self._done.add(node.task)
+        for dependent in node.dependents:
+            if self._is_ready(dependent):
+                heapq.heappush(self._ready, (-dependent.priority, self._order[dependent.task], dependent.task))
+
+    def _is_ready(self, node):
+        return node.task not in self._done and all(dep in self._done for dep in node.depends_on)
+
+    def _update_priority(self, node):
+        """Recompute the node's priority and propagate changes to its ancestors only."""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            priority = current.cost + max((d.priority for d in current.dependents), default=0.0)
+            if priority == current.priority and current is not node:
+                continue
+            current.priority = priority
+            if self._is_ready(current):
+                heapq.heappush(self._ready, (-priority, self._order[current.task], current.task))
+            stack.extend(self.nodes[dep] for dep in current.depends_on if dep in self.nodes)
+
+    def _find_cycle(self, start):
+        """Return a dependency path from ``start`` back to itself, if any."""
+        parents = {start: None}
+        stack = [start]
+        while stack:
+            task = stack.pop()
+            for dep in self.nodes[task].depends_on:
+                if dep == start:
+                    chain = []
+                    while task is not None:
+                        chain.append(task)
+                        task = parents[task]
+                    return chain[::-1] + [start]
+                if dep in self.nodes and dep not in parents:
+                    parents[dep] = task
+                    stack.append(dep)
+        return None
+
+    def _check_complete(self):
+        for node in self.nodes.values():
+            missing = [dep for dep in node.depends_on if dep not in self.nodes]
+            if missing:
+                raise ValueError(f"Task '{node.task}' depends on unknown tasks: {missing}")
@@ -0,0 +1,167 @@
+import pickle
+import sqlite3
+import threading
+import time
+
+from src.planning.task_planner import TaskPlanner
+
+
+class DurableTaskQueue:
+    """A crash-safe task queue in a local SQLite file.
+
+    Delivery is at-least-once: ``dequeue`` leases tasks for
+    ``visibility_timeout`` seconds, and a task that is not ``ack``-ed before
+    its lease runs out (for example because the worker crashed) is handed
+    out again. Single enqueues are grouped into one transaction until
+    ``batch_size`` tasks accumulate or ``flush_interval`` seconds pass since
+    the first of them, whether or not more tasks arrive. Each commit is
+    fsync-ed (``synchronous=FULL``), so the fsync cost is paid per batch. A
+    task is durable once its batch is committed; call ``flush`` to commit
+    immediately.
+    """
+
+    def __init__(self, path, visibility_timeout=30.0, batch_size=1000, flush_interval=0.05):
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._timer = None
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " payload BLOB NOT NULL,"
+            " visible_at REAL NOT NULL DEFAULT 0,"
+            " attempts INTEGER NOT NULL DEFAULT 0)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS tasks_visible ON tasks (visible_at, id)")
+
+    def enqueue(self, task):
+        with self._lock:
+            self._begin()
+            self._db.execute("INSERT INTO tasks (payload) VALUES (?)", (pickle.dumps(task),))
+            self._pending += 1
+            if self._pending >= self.batch_size:
+                self._commit()
+            elif self._timer is None:
+                # Commit the batch when its window closes even if no more tasks arrive.
+                self._timer = threading.Timer(self.flush_interval, self._flush_due)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def enqueue_many(self, tasks):
+        with self._lock:
+            self._begin()
+            self._db.executemany("INSERT INTO tasks (payload) VALUES (?)",
+                                 ((pickle.dumps(task),) for task in tasks))
+            self._commit()
+
+    def dequeue(self, max_items=1, visibility_timeout=None):
+        """Lease up to ``max_items`` visible tasks and return [(task_id, task)]."""
+        timeout = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        now = time.time()
+        with self._lock:
+            self._begin()
+            rows = self._db.execute(
+                "SELECT id, payload FROM tasks WHERE visible_at <= ? ORDER BY id LIMIT ?",
+                (now, max_items)).fetchall()
+            self._db.executemany(
+                "UPDATE tasks SET visible_at = ?, attempts = attempts + 1 WHERE id = ?",
+                ((now + timeout, task_id) for task_id, _ in rows))
+            self._commit()
+        return [(task_id, pickle.loads(payload)) for task_id, payload in rows]
+
+    def ack(self, task_ids):
+        """Mark tasks as done and remove them from the queue."""
+        with self._lock:
+            self._begin()
+            self._db.executemany("DELETE FROM tasks WHERE id = ?", ((task_id,) for task_id in task_ids))
+            self._commit()
+
+    def nack(self, task_ids):
+        """Release leased tasks so they can be dequeued again right away."""
+        with self._lock:
+            self._begin()
+            self._db.executemany("UPDATE tasks SET visible_at = 0 WHERE id = ?",
+                                 ((task_id,) for task_id in task_ids))
+            self._commit()
+
+    def remove(self, task):
+        """Delete the earliest queued task equal to ``task``, leased or not."""
+        with self._lock:
+            for task_id, payload in self._db.execute("SELECT id, payload FROM tasks ORDER BY id").fetchall():
+                if pickle.loads(payload) == task:
+                    self._begin()
+                    self._db.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+                    self._commit()
+                    return
+        raise ValueError(f"Task '{task}' not found.")
+
+    def attempts(self, task_id):
+        row = self._db.execute("SELECT attempts FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def peek_all(self):
+        """Return every queued task, leased or not, in enqueue order."""
+        with self._lock:
+            rows = self._db.execute("SELECT payload FROM tasks ORDER BY id").fetchall()
+        return [pickle.loads(payload) for payload, in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def flush(self):
+        with self._lock:
+            self._commit()
+
+    def close(self):
+        with self._lock:
+            self._commit()
+            self._db.close()
+
+    def _flush_due(self):
+        with self._lock:
+            if self._pending:  # not already committed by a full batch, flush or close
+                self._commit()
+
+    def _begin(self):
+        if not self._db.in_transaction:
+            self._db.execute("BEGIN")
+
+    def _commit(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._db.in_transaction:
+            self._db.execute("COMMIT")
+        self._pending = 0
+
+
+class DurableTaskPlanner(TaskPlanner):
+    """A TaskPlanner whose queued tasks survive a crash or restart."""
+
+    def __init__(self, path, **queue_options):
+        self.queue = DurableTaskQueue(path, **queue_options)
+
+    @property
+    def tasks(self):
+        return self.queue.peek_all()
+
+    def add_task(self, task):
+        self.queue.enqueue(task)
+
+    def remove_task(self, task):
+        self.queue.remove(task)
+
+    def create_task_sequence(self):
+        return self.tasks
+
+    def optimize_task_execution(self):
+        return sorted(self.tasks)
+
+    def plan_diff(self):
+        raise NotImplementedError("DurableTaskPlanner does not track plan diffs.")
@@ -0,0 +1,117 @@
+import heapq
+import itertools
+
+from src.planning.task_planner import TaskPlanner
+
+_REMOVED = object()
+
+
+class PriorityTaskPlanner(TaskPlanner):
+    """A heap-backed TaskPlanner with O(log n) add, pop, cancel and re-prioritize.
+
+    Lower priority values run first. With ``aging_rate`` > 0 every later
+    enqueue pushes newer tasks back by that amount, so long-waiting tasks
+    are eventually served ahead of a stream of new high-priority work.
+    Cancelled or re-prioritized entries are dropped lazily, and the heap top
+    is always kept valid so ``peek_task`` is O(1).
+    """
+
+    def __init__(self, aging_rate=0.0):
+        self.aging_rate = aging_rate
+        self._heap = []  # [key, seq, task_id, task]
+        self._entries = {}  # task_id -> heap entry
+        self._priorities = {}  # task_id -> priority, in insertion order
+        self._seq = itertools.count()
+        self._ids = itertools.count()
+
+    @property
+    def tasks(self):
+        return [self._entries[task_id][3] for task_id in self._priorities]
+
+    @tasks.setter
+    def tasks(self, tasks):
+        self._heap = []
+        self._entries = {}
+        self._priorities = {}
+        for task in tasks:
+            self.add_task(task)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add_task(self, task, priority=0):
+        """Queue a task and return its id for cancel/change_priority."""
+        task_id = next(self._ids)
+        self._priorities[task_id] = priority
+        self._push(task_id, task, priority)
+        return task_id
+
+    def peek_task(self):
+        if not self._heap:
+            raise IndexError("peek from an empty planner")
+        return self._heap[0][3]
+
+    def pop_task(self):
+        if not self._heap:
+            raise IndexError("pop from an empty planner")
+        _, _, task_id, task = heapq.heappop(self._heap)
+        del self._entries[task_id]
+        del self._priorities[task_id]
+        self._purge()
+        return task
+
+    def cancel(self, task_id):
+        entry = self._entries.pop(task_id, None)
+        if entry is None:
+            return False
+        del self._priorities[task_id]
+        entry[2] = _REMOVED
+        self._purge()
+        return True
+
+    def remove_task(self, task):
+        """Cancel the earliest queued entry equal to ``task``."""
+        for task_id in self._priorities:
+            if self._entries[task_id][3] == task:
+                self.cancel(task_id)
+                return
+        raise ValueError(f"Task '{task}' not found.")
+
+    def change_priority(self, task_id, priority):
+        """Move a queued task to a new priority (decrease-key or increase-key)."""
+        entry = self._entries.get(task_id)
+        if entry is None:
+            raise KeyError(f"Task id '{task_id}' not found.")
+        if priority == self._priorities[task_id]:
+            return  # same key; re-pushing would also tie with the dead entry
+        entry[2] = _REMOVED
+        self._priorities[task_id] = priority
+        # Keep the original enqueue seq so the task keeps the aging it has earned.
+        self._push(task_id, entry[3], priority, entry[1])
+        self._purge()
+
+    def create_task_sequence(self):
+        return self.tasks
+
+    def optimize_task_execution(self):
+        """Return the queued tasks in the order pop_task would return them."""
+        return [entry[3] for entry in sorted(self._entries.values())]
+
+    def plan_diff(self):
+        raise NotImplementedError("PriorityTaskPlanner does not track plan diffs.")
+
+    def _push(self, task_id, task, priority, seq=None):
+        if seq is None:
+            seq = next(self._seq)
+        entry = [priority + self.aging_rate * seq, seq, task_id, task]
+        self._entries[task_id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _purge(self):
+        heap = self._heap
+        while heap and heap[0][2] is _REMOVED:
+            heapq.heappop(heap)
+        # Rebuild if dead entries dominate, to bound memory.
+        if len(heap) > 64 and len(heap) > 2 * len(self._entries):
+            self._heap = [entry for entry in heap if entry[2] is not _REMOVED]
+            heapq.heapify(self._heap)
@@ -1,9 +1,70 @@
+import bisect
+
+
+def _mutator(name):
+    method = getattr(list, name)
+
+    def mutate(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+
+    mutate.__name__ = name
+    return mutate
+
+
+class _TaskList(list):
+    """A list that counts its edits, so a cached plan can tell it is stale."""
+
+    __slots__ = ("version",)
+
+    def __init__(self, tasks=()):
+        super().__init__(tasks)
+        self.version = 0
+
+
+for _name in ("append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+              "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(_TaskList, _name, _mutator(_name))
+
+
 class TaskPlanner:
+    __slots__ = ("_tasks", "_plan", "_plan_version", "_changes", "last_diff")
+
     def __init__(self):
         self.tasks = []
+        # Cached optimized order, kept up to date by add_task/remove_task so
+        # that re-optimizing after a small change does not re-sort everything.
+        self._plan = None
+        self._plan_version = None
+        self._changes = []
+        self.last_diff = []
+
+    @property
+    def tasks(self):
+        return self._tasks
+
+    @tasks.setter
+    def tasks(self, tasks):
+        self._tasks = _TaskList(tasks)
+        self._plan = None
 
     def add_task(self, task):
-        self.tasks.append(task)
+        current = self._plan_is_current()
+        self._tasks.append(task)
+        if current:
+            index = bisect.bisect_right(self._plan, task)
+            self._plan.insert(index, task)
+            self._plan_version = self._tasks.version
+            self._changes.append(("add", index, task))
+
+    def remove_task(self, task):
+        current = self._plan_is_current()
+        self._tasks.remove(task)
+        if current:
+            index = bisect.bisect_left(self._plan, task)
+            del self._plan[index]
+            self._plan_version = self._tasks.version
+            self._changes.append(("remove", index, task))
 
     def create_task_sequence(self):
         # Logic to create a sequence of tasks
@@ -11,4 +72,26 @@ class TaskPlanner:
 
     def optimize_task_execution(self):
         # Logic to optimize the order of tasks
-        return sorted(self.tasks)  # Example optimization by sorting tasks
\ No newline at end of file
+        if not self._plan_is_current():
+            self._plan = sorted(self._tasks)  # Example optimization by sorting tasks
+            self._plan_version = self._tasks.version
+            self._changes = [("replan", 0, None)]
+        self.last_diff = self._changes
+        self._changes = []
+        return list(self._plan)
+
+    def plan_diff(self):
+        """Describe how the last optimize_task_execution() differed from the one before.
+
+        Returns the length of the untouched plan prefix and the list of
+        ("add" | "remove", index, task) edits applied after it.
+        """
+        if not self.last_diff:
+            return {"unchanged_prefix": len(self._plan) if self._plan is not None else 0, "changes": []}
+        return {"unchanged_prefix": min(index for _, index, _ in self.last_diff),
+                "changes": list(self.last_diff)}
+
+    def _plan_is_current(self):
+        # Any edit of self.tasks other than add_task/remove_task bumps its
+        # version, and replacing it drops the plan, so both force a re-sort.
+        return self._plan is not None and self._plan_version == self._tasks.version
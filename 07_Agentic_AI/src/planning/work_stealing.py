@@ -0,0 +1,152 @@
+import multiprocessing
+import os
+import queue
+import random
+import threading
+from collections import deque
+
+
+class WorkerDiedError(RuntimeError):
+    """A worker process exited while a job was running; its chunk is lost."""
+
+
+def _run_task(task):
+    return task()
+
+
+def _worker(index, queues, results):
+    """Drain our own queue first, then steal chunks from the other workers."""
+    own = queues[index]
+    others = [q for i, q in enumerate(queues) if i != index]
+    rng = random.Random(index)
+    while True:
+        try:
+            job = own.get(timeout=0.005)
+        except queue.Empty:
+            job = None
+            rng.shuffle(others)
+            for victim in others:
+                try:
+                    job = victim.get_nowait()
+                    break
+                except queue.Empty:
+                    continue
+            if job is None:
+                continue
+        if job == "stop":
+            return
+        job_id, function, chunk = job
+        output = []
+        for position, item in chunk:
+            try:
+                output.append((position, True, function(item)))
+            except Exception as exc:
+                output.append((position, False, exc))
+        results.put((job_id, output))
+
+
+class WorkStealingExecutor:
+    """A process pool where each worker owns a queue and idle workers steal.
+
+    Work is split into chunks so per-item IPC cost is amortized, dealt out
+    round-robin to the workers' queues, and results are streamed back as
+    each chunk finishes. A worker whose queue runs dry takes chunks from a
+    random busy peer, which keeps all cores busy when item costs are uneven.
+    Functions and items must be picklable. Several jobs can stream at once;
+    a stream abandoned part way just has its remaining results dropped. If
+    a worker dies, running jobs fail with WorkerDiedError.
+    """
+
+    def __init__(self, num_workers=None, chunk_size=None, mp_context=None):
+        self.num_workers = num_workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        context = mp_context or multiprocessing.get_context()
+        self._queues = [context.Queue() for _ in range(self.num_workers)]
+        self._results = context.Queue()
+        self._workers = [context.Process(target=_worker, args=(i, self._queues, self._results), daemon=True)
+                         for i in range(self.num_workers)]
+        for worker in self._workers:
+            worker.start()
+        self._lock = threading.Lock()
+        self._reader = threading.Lock()  # held by whichever caller is reading results
+        self._job_ids = 0
+        self._outputs = {}  # job_id -> deque of finished chunk outputs
+
+    def map_stream(self, function, items):
+        """Yield (position, result) pairs in completion order."""
+        items = list(items)
+        chunk_size = self.chunk_size or max(1, len(items) // (self.num_workers * 8))
+        indexed = list(enumerate(items))
+        chunks = [indexed[start:start + chunk_size] for start in range(0, len(indexed), chunk_size)]
+        with self._lock:
+            self._job_ids += 1
+            job_id = self._job_ids
+            self._outputs[job_id] = deque()
+        try:
+            for i, chunk in enumerate(chunks):
+                self._queues[i % self.num_workers].put((job_id, function, chunk))
+            for _ in chunks:
+                for position, ok, value in self._next_output(job_id):
+                    if not ok:
+                        raise value
+                    yield position, value
+        finally:
+            # Late results of an abandoned or failed job are dropped on arrival.
+            with self._lock:
+                del self._outputs[job_id]
+
+    def map(self, function, items):
+        """Return ``[function(item) for item in items]`` computed in parallel."""
+        items = list(items)
+        results = [None] * len(items)
+        for position, value in self.map_stream(function, items):
+            results[position] = value
+        return results
+
+    def run_sequence(self, planner, function=None):
+        """Run a TaskPlanner's sequence, yielding (task, result) as each completes.
+
+        Tasks are called directly unless ``function`` is given, in which case
+        ``function(task)`` is computed for each one.
+        """
+        tasks = planner.create_task_sequence()
+        for position, value in self.map_stream(function or _run_task, tasks):
+            yield tasks[position], value
+
+    def _next_output(self, job_id):
+        """Wait for the next finished chunk of ``job_id``, routing others' chunks to them."""
+        while True:
+            with self._lock:
+                pending = self._outputs[job_id]
+                if pending:
+                    return pending.popleft()
+            if not self._reader.acquire(timeout=0.05):
+                continue
+            try:
+                try:
+                    finished_job, output = self._results.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+                else:
+                    with self._lock:
+                        if finished_job in self._outputs:
+                            self._outputs[finished_job].append(output)
+                # Checked on every pass, as other jobs' results may keep arriving
+                # while this job waits on a chunk that died with its worker.
+                dead = [worker.pid for worker in self._workers if not worker.is_alive()]
+                if dead:
+                    raise WorkerDiedError(f"Worker process {dead[0]} exited during job {job_id}.")
+            finally:
+                self._reader.release()
+
+    def shutdown(self):
+        for q in self._queues:
+            q.put("stop")
+        for worker in self._workers:
+            worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
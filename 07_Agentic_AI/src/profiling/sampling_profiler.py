@@ -0,0 +1,91 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+
+def _label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """A statistical profiler that can be started and stopped at runtime.
+
+    A background thread wakes every ``interval`` seconds and records the
+    Python stack of every other thread, so the cost is set by the interval
+    rather than by how much code runs. Samples are kept as folded-stack
+    counts; export with ``to_folded`` for flame graph tools. Threads that are
+    blocked (for example in a lock, sleep or socket read) are sampled too
+    unless ``threads`` limits sampling to particular thread idents.
+    """
+
+    def __init__(self, interval=0.005, threads=None):
+        self.interval = interval
+        self.threads = threads
+        self.samples = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def clear(self):
+        self.samples.clear()
+        self.sample_count = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def sample(self):
+        """Record one sample of every thread's stack."""
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own or (self.threads is not None and ident not in self.threads):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_label(frame))
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+        self.sample_count += 1
+
+    def to_folded(self):
+        """Return folded stacks ("outer;inner;leaf sample_count" per line)."""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.samples.items()))
+
+    def write_folded(self, path):
+        with open(path, "w") as handle:
+            handle.write(self.to_folded())
+
+    def _run(self):
+        next_sample = time.perf_counter()
+        while not self._stop.is_set():
+            self.sample()
+            next_sample += self.interval
+            delay = next_sample - time.perf_counter()
+            if delay < 0:  # fell behind; skip missed samples instead of bursting
+                next_sample = time.perf_counter()
+                delay = 0
+            self._stop.wait(delay)
@@ -0,0 +1,145 @@
+import contextvars
+import itertools
+import json
+import os
+import random
+import threading
+from collections import defaultdict, deque
+from time import perf_counter_ns
+
+_current = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed region of a sampled trace."""
+
+    def __init__(self, tracer, name, attributes, parent):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.error = None
+        if parent is None:
+            self.path = (name,)
+            self.parent_id = None
+        else:
+            self.path = parent.path + (name,)
+            self.parent_id = parent.span_id
+
+    def __enter__(self):
+        self.span_id = next(self.tracer._ids)
+        self._token = _current.set(self)
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        end = perf_counter_ns()
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        self.tracer._finish(self, end)
+        return False
+
+
+class _UnsampledRoot:
+    """Marks a trace that was not sampled so its nested spans cost nothing."""
+
+    def __enter__(self):
+        self._token = _current.set(_UNSAMPLED)
+        return None
+
+    def __exit__(self, *exc_info):
+        _current.reset(self._token)
+        return False
+
+
+class _NoSpan:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+_UNSAMPLED = object()
+
+
+class Tracer:
+    """Records nested, timed spans for agent steps.
+
+    ``span`` is a context manager that works across threads and asyncio
+    tasks. Whole traces are sampled at ``sample_rate`` when their root span
+    starts, so overhead scales with the rate and the tracer can stay on in
+    production; a disabled tracer costs one attribute check per span. At
+    most ``max_spans`` finished spans are kept. Export with
+    ``to_chrome_trace`` (chrome://tracing, Perfetto) or ``to_folded``
+    (flamegraph.pl, speedscope).
+    """
+
+    def __init__(self, enabled=False, sample_rate=1.0, max_spans=100000):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.spans = deque(maxlen=max_spans)
+        self._ids = itertools.count(1)
+        self._epoch = perf_counter_ns()
+
+    def enable(self, sample_rate=None):
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        self.spans.clear()
+
+    def span(self, name, **attributes):
+        if not self.enabled:
+            return _NO_SPAN
+        parent = _current.get()
+        if parent is _UNSAMPLED:
+            return _NO_SPAN
+        if parent is None and self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return _UnsampledRoot()
+        return Span(self, name, attributes, parent)
+
+    def _finish(self, span, end):
+        self.spans.append((span.name, span.path, span.span_id, span.parent_id, span.start, end - span.start,
+                           threading.get_ident(), span.attributes, span.error))
+
+    def to_chrome_trace(self):
+        """Return the spans as a Chrome trace-event JSON object."""
+        pid = os.getpid()
+        events = []
+        for name, _, span_id, parent_id, start, duration, thread, attributes, error in list(self.spans):
+            args = dict(attributes, span_id=span_id, parent_id=parent_id)
+            if error is not None:
+                args["error"] = error
+            events.append({"name": name, "cat": "agent", "ph": "X", "pid": pid, "tid": thread,
+                           "ts": (start - self._epoch) / 1000, "dur": duration / 1000, "args": args})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path):
+        with open(path, "w") as handle:
+            json.dump(self.to_chrome_trace(), handle, default=str)
+
+    def to_folded(self):
+        """Return folded stacks ("root;child;leaf self_microseconds" per line)."""
+        spans = list(self.spans)
+        child_time = defaultdict(int)
+        for _, _, _, parent_id, _, duration, _, _, _ in spans:
+            if parent_id is not None:
+                child_time[parent_id] += duration
+        folded = defaultdict(int)
+        for _, path, span_id, _, _, duration, _, _, _ in spans:
+            folded[";".join(part.replace(";", ":") for part in path)] += max(0, duration - child_time[span_id])
+        return "".join(f"{stack} {total // 1000}\n" for stack, total in sorted(folded.items()))
+
+    def write_folded(self, path):
+        with open(path, "w") as handle:
+            handle.write(self.to_folded())
+
+
+# The process-wide tracer the agents report to; disabled until enable() is called.
+tracer = Tracer()
@@ -1,5 +1,13 @@
+from time import perf_counter_ns
+
+from src.tools.instrumentation import instrumentation
+from src.tools.tool_registry import ToolRegistry
+
+
 def select_tool(tools, criteria):
     """Select a tool based on specified criteria."""
+    if isinstance(tools, ToolRegistry):
+        return tools.select(criteria)
     selected_tools = [tool for tool in tools if criteria(tool)]
     return selected_tools
 
@@ -11,11 +19,59 @@ def execute_tool(tool, *args, **kwargs):
 
 class Tool:
     """A class representing a tool that an agent can use."""
+
+    __slots__ = ("name", "function", "batch_function", "tags", "input_types", "cost", "cache")
     
-    def __init__(self, name, function):
+    def __init__(self, name, function, tags=(), input_types=(), cost=0, cache=None,
+                 batch_function=None):
+        if not callable(function):
+            raise ValueError("The provided tool is not callable.")
         self.name = name
         self.function = function
+        # Optional function mapping a list of inputs to a list of outputs in one call.
+        self.batch_function = batch_function
+        self.tags = frozenset(tags)
+        self.input_types = tuple(input_types)
+        self.cost = cost
+        # Opt-in memoization for deterministic tools; pass True or a ToolCache.
+        if cache is True:
+            from src.tools.tool_cache import ToolCache
+            cache = ToolCache()
+        self.cache = cache or None
 
     def use(self, *args, **kwargs):
         """Use the tool with the given arguments."""
-        return execute_tool(self.function, *args, **kwargs)
\ No newline at end of file
+        if not instrumentation.enabled:
+            if self.cache is None:
+                return self.function(*args, **kwargs)
+            return self.cache.call(self.function, args, kwargs)
+        # Recorded inline rather than through instrumentation.call: one clock
+        # pair and this thread's preallocated metrics for the tool.
+        metrics = instrumentation.recorder(self.name)
+        metrics.in_flight += 1
+        start = perf_counter_ns()
+        try:
+            if self.cache is None:
+                return self.function(*args, **kwargs)
+            return self.cache.call(self.function, args, kwargs)
+        except BaseException:
+            metrics.errors += 1
+            raise
+        finally:
+            metrics.latency.record(perf_counter_ns() - start)
+            metrics.in_flight -= 1
+            metrics.calls += 1
+
+    def use_batch(self, inputs):
+        """Use the tool on many inputs at once and return the outputs in order.
+
+        Calls ``batch_function`` once when the tool has one, and otherwise
+        falls back to calling ``function`` on each input.
+        """
+        inputs = list(inputs)
+        if self.batch_function is None:
+            return [self.use(item) for item in inputs]
+        outputs = list(execute_tool(self.batch_function, inputs))
+        if len(outputs) != len(inputs):
+            raise ValueError(f"Tool '{self.name}' returned {len(outputs)} results for {len(inputs)} inputs.")
+        return outputs
@@ -0,0 +1,104 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """Gathers single calls from many agents into batched Tool.use_batch calls.
+
+    ``submit`` returns a Future right away. A background thread waits for
+    the first pending call, keeps collecting until ``max_batch_size`` calls
+    or ``max_wait`` seconds, runs the whole batch through the tool, and
+    scatters the outputs back to the callers' futures. A tool without a
+    ``batch_function`` is called once per item, so a bad input fails only
+    its own future; a failing ``batch_function`` fails the whole batch.
+    """
+
+    def __init__(self, tool, max_batch_size=64, max_wait=0.005):
+        self.tool = tool
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.items = 0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The batcher is closed.")
+            self._queue.put((item, future))
+        return future
+
+    def __call__(self, item, timeout=None):
+        return self.submit(item).result(timeout)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def stats(self):
+        return {"batches": self.batches, "items": self.items,
+                "mean_batch_size": self.items / self.batches if self.batches else 0.0}
+
+    def _loop(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            stopping = False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            self._run(batch)
+            if stopping:
+                return
+
+    def _run(self, batch):
+        # Drop calls cancelled while queued; the rest can no longer be cancelled.
+        batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        if self.tool.batch_function is None:
+            for item, future in batch:
+                try:
+                    future.set_result(self.tool.use(item))
+                except Exception as exc:
+                    future.set_exception(exc)
+            return
+        try:
+            outputs = self.tool.use_batch([item for item, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        for (_, future), output in zip(batch, outputs):
+            future.set_result(output)
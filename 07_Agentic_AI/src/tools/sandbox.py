@@ -0,0 +1,297 @@
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from src.tools.agent_tools import Tool
+from src.tools.tool_executor import ToolTimeoutError
+
+ALIGNMENT = 64
+
+
+class SandboxError(RuntimeError):
+    """A sandbox worker died or could not run the call."""
+
+
+class _SharedArray:
+    """A pickled stand-in for a NumPy array packed into an _Arena."""
+
+    def __init__(self, offset, shape, dtype):
+        self.offset = offset
+        self.shape = shape
+        self.dtype = dtype
+
+
+class _Arena:
+    """A shared memory buffer that is reused call after call.
+
+    Arrays are packed into it back to back; it is only reallocated when a
+    call needs more room than it has, so steady-state calls pay for one
+    memcpy per array rather than a fresh mapping and its page faults.
+    """
+
+    def __init__(self):
+        self.shm = None
+
+    def export(self, value, threshold):
+        """Return ``value`` with large arrays packed into the arena, and the arena's name."""
+        arrays = []
+        value = self._replace(value, threshold, arrays, [0])
+        if not arrays:
+            return value, None
+        size = arrays[-1][0].offset + arrays[-1][1].nbytes
+        if self.shm is None or self.shm.size < size:
+            self.release()
+            self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for stand_in, array in arrays:
+            np.ndarray(array.shape, array.dtype, buffer=self.shm.buf, offset=stand_in.offset)[...] = array
+        return value, self.shm.name
+
+    def _replace(self, value, threshold, arrays, offset):
+        if isinstance(value, np.ndarray) and value.nbytes >= threshold and value.dtype != object:
+            stand_in = _SharedArray(offset[0], value.shape, value.dtype.str)
+            offset[0] += -(-value.nbytes // ALIGNMENT) * ALIGNMENT
+            arrays.append((stand_in, value))
+            return stand_in
+        if type(value) in (tuple, list):
+            return type(value)(self._replace(item, threshold, arrays, offset) for item in value)
+        if type(value) is dict:
+            return {key: self._replace(item, threshold, arrays, offset) for key, item in value.items()}
+        return value
+
+    def release(self):
+        if self.shm is not None:
+            self.shm.close()
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+            self.shm = None
+
+
+class _Mapping:
+    """The receiving side of another process's _Arena."""
+
+    def __init__(self):
+        self.shm = None
+
+    def load(self, value, name, copy):
+        """Replace _SharedArray stand-ins in ``value`` with views or copies."""
+        if name is None:
+            return value
+        if self.shm is None or self.shm.name != name:
+            self.close()
+            try:
+                self.shm = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:  # Python < 3.13 has no track argument.
+                self.shm = shared_memory.SharedMemory(name=name)
+        return self._restore(value, copy)
+
+    def _restore(self, value, copy):
+        if isinstance(value, _SharedArray):
+            array = np.ndarray(value.shape, np.dtype(value.dtype), buffer=self.shm.buf, offset=value.offset)
+            return array.copy() if copy else array
+        if type(value) in (tuple, list):
+            return type(value)(self._restore(item, copy) for item in value)
+        if type(value) is dict:
+            return {key: self._restore(item, copy) for key, item in value.items()}
+        return value
+
+    def close(self):
+        if self.shm is not None:
+            try:
+                self.shm.close()
+            except BufferError:
+                pass  # a tool kept a view; the mapping goes away with the process
+            self.shm = None
+
+
+def _rss():
+    """Resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # peak, not current
+
+
+def _worker(conn, threshold):
+    functions = {}
+    incoming = _Mapping()
+    outgoing = _Arena()
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                return
+            if message is None:
+                return
+            name, function, arena, args, kwargs = message
+            if function is not None:
+                functions[name] = function
+            try:
+                args, kwargs = incoming.load((args, kwargs), arena, copy=False)
+                result = functions[name](*args, **kwargs)
+                del args, kwargs
+                reply = (True,) + outgoing.export(result, threshold)
+                del result
+            except BaseException as exc:
+                reply = (False, exc, None)
+            try:
+                payload = pickle.dumps(reply + (_rss(),), protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as exc:  # an unpicklable result or exception
+                error = SandboxError(f"Tool '{name}' returned something that cannot be pickled: {exc!r}")
+                payload = pickle.dumps((False, error, None, _rss()))
+            conn.send_bytes(payload)
+    finally:
+        incoming.close()
+        outgoing.release()
+
+
+class _Worker:
+    def __init__(self, context, threshold):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker, args=(child, threshold), daemon=True)
+        self.process.start()
+        child.close()
+        self.calls = 0
+        self.loaded = set()  # tool names whose function this worker already has
+        self.arguments = _Arena()
+        self.results = _Mapping()
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+        self.process.join()
+        self.conn.close()
+        self.arguments.release()
+        if kill and self.results.shm is not None:
+            try:
+                self.results.shm.unlink()  # the worker had no chance to
+            except FileNotFoundError:
+                pass
+        self.results.close()
+
+
+class _WorkerGroup:
+    def __init__(self, pool, size):
+        self.workers = [pool._spawn() for _ in range(size)]
+        self.idle = queue.Queue()
+        for worker in self.workers:
+            self.idle.put(worker)
+
+
+class SandboxPool:
+    """Runs tools in warm worker processes instead of the agent process.
+
+    Workers are started up front and keep each tool's function loaded, so a
+    call costs one round trip over a pipe. NumPy arrays of at least
+    ``shm_threshold`` bytes in the arguments or result travel through a
+    reusable shared memory arena per worker instead of the pipe: the tool
+    sees zero-copy views of its array arguments, which it must not keep
+    after returning, and the caller gets a private copy of the result. A
+    worker is replaced after ``max_calls`` calls, when its RSS exceeds
+    ``max_rss`` bytes, when a call times out, or when it dies. ``pin`` gives
+    a tool its own workers; other tools share the rest. Workers cache
+    functions by tool name, so tool names must be unique, and the functions
+    must be picklable.
+    """
+
+    def __init__(self, num_workers=2, max_calls=None, max_rss=None, shm_threshold=1 << 16,
+                 mp_context=None):
+        self.max_calls = max_calls
+        self.max_rss = max_rss
+        self.shm_threshold = shm_threshold
+        self._context = mp_context or multiprocessing.get_context()
+        # Forked workers must share our resource tracker; one of their own
+        # would unlink live segments when the worker is recycled.
+        resource_tracker.ensure_running()
+        self._lock = threading.Lock()
+        self._shared = _WorkerGroup(self, num_workers)
+        self._pinned = {}
+        self.recycled = 0
+
+    def pin(self, tool, num_workers=1):
+        """Give ``tool`` dedicated workers that no other tool uses."""
+        name = tool.name if isinstance(tool, Tool) else tool
+        with self._lock:
+            if name in self._pinned:
+                raise ValueError(f"Tool '{name}' is already pinned.")
+            self._pinned[name] = _WorkerGroup(self, num_workers)
+
+    def call(self, tool, args=(), kwargs=None, timeout=None):
+        """Run ``tool`` with the arguments in a worker and return its result."""
+        group = self._pinned.get(tool.name, self._shared)
+        worker = group.idle.get()
+        try:
+            (args, kwargs), arena = worker.arguments.export((tuple(args), dict(kwargs or {})),
+                                                            self.shm_threshold)
+            function = None if tool.name in worker.loaded else tool.function
+            try:
+                worker.conn.send((tool.name, function, arena, args, kwargs))
+                worker.loaded.add(tool.name)
+                finished = timeout is None or worker.conn.poll(timeout)
+                if finished:
+                    ok, value, arena, rss = pickle.loads(worker.conn.recv_bytes())
+            except (EOFError, OSError) as exc:
+                worker = self._replace(group, worker, kill=True)
+                raise SandboxError(f"Sandbox worker died while running tool '{tool.name}'.") from exc
+            if not finished:
+                worker = self._replace(group, worker, kill=True)
+                raise ToolTimeoutError(f"Tool '{tool.name}' timed out after {timeout}s.")
+            if ok:
+                # Copy out before the worker is reused and overwrites its arena.
+                value = worker.results.load(value, arena, copy=True)
+            worker.calls += 1
+            if ((self.max_calls is not None and worker.calls >= self.max_calls)
+                    or (self.max_rss is not None and rss > self.max_rss)):
+                worker = self._replace(group, worker)
+        finally:
+            group.idle.put(worker)
+        if not ok:
+            raise value
+        return value
+
+    def sandboxed(self, tool):
+        """Return a Tool with the same metadata whose calls run in this pool."""
+        def run(*args, **kwargs):
+            return self.call(tool, args, kwargs)
+        return Tool(tool.name, run, tags=tool.tags, input_types=tool.input_types, cost=tool.cost)
+
+    def stats(self):
+        groups = {"shared": self._shared, **{f"pinned:{name}": group for name, group in self._pinned.items()}}
+        return {"recycled": self.recycled,
+                "workers": {label: [worker.calls for worker in group.workers] for label, group in groups.items()}}
+
+    def close(self):
+        for group in [self._shared, *self._pinned.values()]:
+            for worker in group.workers:
+                worker.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _spawn(self):
+        return _Worker(self._context, self.shm_threshold)
+
+    def _replace(self, group, worker, kill=False):
+        worker.stop(kill=kill)
+        fresh = self._spawn()
+        with self._lock:
+            group.workers[group.workers.index(worker)] = fresh
+            self.recycled += 1
+        return fresh
@@ -0,0 +1,145 @@
+import hashlib
+import pickle
+import threading
+import time
+from concurrent.futures import Future
+
+from src.memory.eviction import EvictionCache
+
+_MISSING = object()
+
+
+def _canonical(value):
+    """Turn arguments into a hashable key that is equal for equal arguments."""
+    if value is None or isinstance(value, (str, bytes)):
+        return value
+    if isinstance(value, (bool, int, float, complex)):
+        # 1, 1.0 and True are equal and hash alike; keep their results apart.
+        return (type(value).__name__, value)
+    if isinstance(value, (tuple, list)):
+        return (type(value).__name__, tuple(_canonical(item) for item in value))
+    if isinstance(value, dict):
+        items = sorted(((_canonical(k), _canonical(v)) for k, v in value.items()), key=repr)
+        return ("dict", tuple(items))
+    if isinstance(value, (set, frozenset)):
+        return ("set", frozenset(_canonical(item) for item in value))
+    if hasattr(value, "tobytes") and hasattr(value, "dtype"):  # NumPy arrays
+        return ("array", str(value.dtype), value.shape, value.tobytes())
+    try:
+        hash(value)
+        return (type(value).__qualname__, value)
+    except TypeError:
+        return ("pickle", pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def make_key(args, kwargs):
+    return _canonical((args, kwargs))
+
+
+class ToolCache:
+    """Memoizes a deterministic tool's results.
+
+    Entries are bounded by count and optional TTL through an EvictionCache.
+    Concurrent identical calls are de-duplicated: the first caller runs the
+    function and the rest wait for its result. With ``disk_directory`` set,
+    results also go to a PersistentMemory and survive restarts; the disk
+    tier honours the same TTL (stored next to each value) and keeps at most
+    ``max_entries`` results, dropping the oldest first.
+    """
+
+    def __init__(self, max_entries=1024, ttl=None, disk_directory=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = EvictionCache(max_entries=max_entries, ttl=ttl)
+        self._disk = None
+        if disk_directory is not None:
+            from src.memory.persistent_memory import PersistentMemory
+            self._disk = PersistentMemory(disk_directory)
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.coalesced = 0
+
+    def call(self, function, args=(), kwargs=None):
+        kwargs = kwargs or {}
+        owner = None
+        key = make_key(args, kwargs)
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+            else:
+                self.misses += 1
+                future = self._in_flight[key] = Future()
+                future.set_running_or_notify_cancel()
+                owner = future
+        if future is not owner:
+            # Someone else is already computing this call; share their result.
+            return future.result()
+        try:
+            value = self._load_or_compute(key, function, args, kwargs)
+        except BaseException as exc:
+            future.set_exception(exc)
+            with self._lock:
+                del self._in_flight[key]
+            raise
+        with self._lock:
+            self._entries.put(key, value)
+            del self._in_flight[key]
+        future.set_result(value)
+        return value
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._disk is not None:
+                self._disk.clear_memory()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "coalesced": self.coalesced,
+                "evictions": self._entries.evictions,
+                "hit_rate": (self.hits + self.coalesced + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+    def _load_or_compute(self, key, function, args, kwargs):
+        if self._disk is None:
+            return function(*args, **kwargs)
+        disk_key = hashlib.blake2b(pickle.dumps(key, protocol=4), digest_size=16).hexdigest()
+        stored = self._disk.retrieve_memory(disk_key)
+        if stored is not None:
+            expires_at, value = stored
+            if expires_at is None or time.time() < expires_at:
+                self.disk_hits += 1
+                return value
+            self._disk.delete_memory(disk_key)
+        value = function(*args, **kwargs)
+        # Wall-clock expiry, so it still holds after a restart.
+        expires_at = None if self.ttl is None else time.time() + self.ttl
+        self._disk.store_memory(disk_key, (expires_at, value))
+        excess = len(self._disk) - self.max_entries
+        if excess > 0:
+            for oldest in self._disk.keys()[:excess]:
+                self._disk.delete_memory(oldest)
+        return value
+
+
+def cache_stats(tools):
+    """Return {tool name: cache stats} for every tool that has a cache."""
+    return {tool.name: tool.cache.stats() for tool in tools if tool.cache is not None}
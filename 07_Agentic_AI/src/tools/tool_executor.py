@@ -0,0 +1,227 @@
+import asyncio
+import inspect
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from src.tools.instrumentation import instrumentation
+
+
+class ToolTimeoutError(TimeoutError):
+    """A tool call did not finish within its timeout."""
+
+
+class BulkheadFullError(RuntimeError):
+    """A tool already has its maximum number of calls in flight."""
+
+
+class CircuitOpenError(RuntimeError):
+    """A tool's circuit breaker is open, so the call failed fast."""
+
+
+class CircuitBreaker:
+    """Opens when the error rate over the last ``window`` calls is too high.
+
+    While open every call fails fast. After ``reset_timeout`` seconds one
+    trial call is let through (half-open); its outcome closes or re-opens
+    the circuit.
+    """
+
+    def __init__(self, window=20, failure_rate=0.5, min_calls=5, reset_timeout=5.0):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._results = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record(self, success):
+        with self._lock:
+            if self.state == "half_open":
+                self._trial_running = False
+                if success:
+                    self.state = "closed"
+                    self._results.clear()
+                else:
+                    self._open()
+                return
+            self._results.append(success)
+            failures = self._results.count(False)
+            if len(self._results) >= self.min_calls and failures / len(self._results) >= self.failure_rate:
+                self._open()
+
+    def cancel(self):
+        """Give back a half-open trial whose call never ran, without an outcome."""
+        with self._lock:
+            self._trial_running = False
+
+    def _open(self):
+        self.state = "open"
+        self._opened_at = time.monotonic()
+
+
+class _Lane:
+    """The isolated resources of one tool: thread pool, bulkhead and breaker."""
+
+    def __init__(self, max_concurrent, breaker):
+        self.pool = ThreadPoolExecutor(max_workers=max_concurrent)
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.breaker = breaker
+        self.lock = threading.Lock()  # orders a call's completion against its timeout
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejected = 0
+
+
+class ToolExecutor:
+    """Runs Tool calls off the caller's thread, one isolated lane per tool.
+
+    Each tool gets its own thread pool and a bulkhead of ``max_concurrent``
+    in-flight calls, so a slow tool can only exhaust its own lane. Calls can
+    time out, queued calls can be cancelled, and a per-tool CircuitBreaker
+    fails calls fast while the tool's recent error rate is high. Note that
+    a timed-out synchronous call keeps running in its thread (Python cannot
+    kill threads) and holds its bulkhead slot until it returns; coroutine
+    tools run on the event loop in ``call_async`` and are truly cancelled.
+    """
+
+    def __init__(self, max_concurrent=4, timeout=None, breaker_factory=CircuitBreaker):
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+        self.breaker_factory = breaker_factory
+        self._lanes = {}
+        self._lock = threading.Lock()
+
+    def submit(self, tool, args=(), kwargs=None):
+        """Start a call and return its concurrent.futures.Future."""
+        lane = self._admit(tool)
+        try:
+            future = lane.pool.submit(tool.use, *args, **(kwargs or {}))
+        except BaseException:
+            self._abort(lane)
+            raise
+        future.add_done_callback(lambda done: self._finished(lane, done))
+        return future
+
+    def call(self, tool, args=(), kwargs=None, timeout=None):
+        """Run a call in the tool's lane and wait for its result."""
+        timeout = self.timeout if timeout is None else timeout
+        future = self.submit(tool, args, kwargs)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            if not self._timed_out(self._lanes[tool.name], future):
+                return future.result()  # it finished just as the timeout fired
+            raise ToolTimeoutError(f"Tool '{tool.name}' timed out after {timeout}s.") from None
+
+    async def call_async(self, tool, args=(), kwargs=None, timeout=None):
+        """Await a call; coroutine tools run on the loop, others in the tool's lane."""
+        timeout = self.timeout if timeout is None else timeout
+        kwargs = kwargs or {}
+        if not inspect.iscoroutinefunction(tool.function):
+            inner = self.submit(tool, args, kwargs)
+            future = asyncio.wrap_future(inner)
+        else:
+            lane = self._admit(tool)
+            try:
+                if instrumentation.enabled:
+                    call = instrumentation.call_async(tool.name, tool.function, args, kwargs)
+                else:
+                    call = tool.function(*args, **kwargs)  # raises here on bad arguments
+            except BaseException:
+                self._abort(lane)
+                raise
+            inner = future = asyncio.ensure_future(call)
+            future.add_done_callback(lambda done: self._finished(lane, done))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            if not self._timed_out(self._lanes[tool.name], inner):
+                return inner.result()
+            raise ToolTimeoutError(f"Tool '{tool.name}' timed out after {timeout}s.") from None
+
+    def stats(self):
+        return {name: {"calls": lane.calls, "failures": lane.failures, "timeouts": lane.timeouts,
+                       "rejected": lane.rejected, "circuit": lane.breaker.state}
+                for name, lane in self._lanes.items()}
+
+    def shutdown(self, wait=True):
+        for lane in self._lanes.values():
+            lane.pool.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def _lane(self, tool):
+        lane = self._lanes.get(tool.name)
+        if lane is None:
+            with self._lock:
+                lane = self._lanes.get(tool.name)
+                if lane is None:
+                    lane = self._lanes[tool.name] = _Lane(self.max_concurrent, self.breaker_factory())
+        return lane
+
+    def _admit(self, tool):
+        lane = self._lane(tool)
+        # Take the slot first: a half-open trial granted to a call the
+        # bulkhead then rejects would never be given back.
+        if not lane.slots.acquire(blocking=False):
+            lane.rejected += 1
+            raise BulkheadFullError(f"Tool '{tool.name}' already has {self.max_concurrent} calls in flight.")
+        if not lane.breaker.allow():
+            lane.slots.release()
+            lane.rejected += 1
+            raise CircuitOpenError(f"Circuit for tool '{tool.name}' is open.")
+        lane.calls += 1
+        return lane
+
+    def _abort(self, lane):
+        # Admitted, but the call never started.
+        lane.slots.release()
+        lane.breaker.cancel()
+
+    def _finished(self, lane, future):
+        lane.slots.release()
+        with lane.lock:
+            if getattr(future, "timed_out", False):
+                return
+            if not future.cancelled():
+                future.settled = True
+        if future.cancelled():
+            lane.breaker.cancel()  # no outcome; give back a half-open trial
+            return
+        failed = future.exception() is not None
+        if failed:
+            lane.failures += 1
+        lane.breaker.record(not failed)
+
+    def _timed_out(self, lane, future):
+        """Count a timeout unless the call settled first; returns whether it timed out."""
+        with lane.lock:
+            if getattr(future, "settled", False):
+                return False
+            # A late completion of this call must not count as a second outcome.
+            future.timed_out = True
+        lane.timeouts += 1
+        lane.breaker.record(False)
+        return True
@@ -0,0 +1,150 @@
+import bisect
+
+
+class ToolQuery:
+    """A precompiled selection over a ToolRegistry's indexes.
+
+    Criteria is a dict with any of:
+      name        exact tool name
+      tags        tags a tool must all have
+      any_tags    tags a tool must have at least one of
+      input_type  an accepted input type
+      max_cost / min_cost   inclusive cost bounds
+      where       a callable predicate, applied only to the indexed matches
+    """
+
+    KEYS = {"name", "tags", "any_tags", "input_type", "max_cost", "min_cost", "where"}
+
+    def __init__(self, criteria):
+        unknown = set(criteria) - self.KEYS
+        if unknown:
+            raise ValueError(f"Unknown tool criteria: {sorted(unknown)}")
+        self.name = criteria.get("name")
+        self.tags = tuple(criteria.get("tags", ()))
+        self.any_tags = tuple(criteria.get("any_tags", ()))
+        self.input_type = criteria.get("input_type")
+        self.max_cost = criteria.get("max_cost")
+        self.min_cost = criteria.get("min_cost")
+        self.where = criteria.get("where")
+
+    def run(self, registry):
+        candidates = []
+        if self.name is not None:
+            candidates.append({self.name} if self.name in registry._by_name else set())
+        for tag in self.tags:
+            candidates.append(registry._by_tag.get(tag, set()))
+        if self.any_tags:
+            candidates.append(set().union(*(registry._by_tag.get(tag, set()) for tag in self.any_tags)))
+        if self.input_type is not None:
+            candidates.append(registry._by_input.get(self.input_type, set()))
+        cost_filtered = self.max_cost is not None or self.min_cost is not None
+        if cost_filtered:
+            lo, hi = registry._cost_range(self.min_cost, self.max_cost)
+            if not candidates or hi - lo < min(map(len, candidates)):
+                candidates.append({name for _, _, name in registry._costs[lo:hi]})
+                cost_filtered = False
+
+        if candidates:
+            # Intersect smallest first so the work tracks the result size.
+            candidates.sort(key=len)
+            names = set(candidates[0])
+            for other in candidates[1:]:
+                names &= other
+                if not names:
+                    break
+        else:
+            names = registry._by_name.keys()
+
+        tools = [registry._by_name[name] for name in sorted(names, key=registry._order.__getitem__)]
+        if cost_filtered:
+            # The other indexes already narrowed things down more than the cost range would.
+            tools = [tool for tool in tools if self._cost_ok(tool.cost)]
+        if self.where is not None:
+            tools = [tool for tool in tools if self.where(tool)]
+        return tools
+
+
+    def _cost_ok(self, cost):
+        return ((self.min_cost is None or cost >= self.min_cost)
+                and (self.max_cost is None or cost <= self.max_cost))
+
+
+class ToolRegistry:
+    """Tools indexed by name, tag, input type and cost for fast selection."""
+
+    def __init__(self, tools=()):
+        self._by_name = {}
+        self._by_tag = {}
+        self._by_input = {}
+        self._costs = []  # sorted (cost, order, name)
+        self._order = {}
+        self._next_order = 0
+        self._queries = {}
+        for tool in tools:
+            self.register(tool)
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def __iter__(self):
+        return iter(self._by_name.values())
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def get(self, name):
+        return self._by_name.get(name)
+
+    def register(self, tool):
+        if tool.name in self._by_name:
+            self.unregister(tool.name)
+        self._by_name[tool.name] = tool
+        self._order[tool.name] = self._next_order
+        self._next_order += 1
+        for tag in tool.tags:
+            self._by_tag.setdefault(tag, set()).add(tool.name)
+        for input_type in tool.input_types:
+            self._by_input.setdefault(input_type, set()).add(tool.name)
+        bisect.insort(self._costs, (tool.cost, self._order[tool.name], tool.name))
+
+    def unregister(self, name):
+        tool = self._by_name.pop(name)
+        order = self._order.pop(name)
+        for tag in tool.tags:
+            self._by_tag[tag].discard(name)
+        for input_type in tool.input_types:
+            self._by_input[input_type].discard(name)
+        del self._costs[bisect.bisect_left(self._costs, (tool.cost, order, name))]
+
+    def compile(self, criteria):
+        """Build (and cache) a ToolQuery for a criteria dict."""
+        key = tuple(sorted((k, _freeze(v)) for k, v in criteria.items()))
+        query = self._queries.get(key)
+        if query is None:
+            if len(self._queries) >= 1024:
+                self._queries.clear()
+            query = self._queries[key] = ToolQuery(criteria)
+        return query
+
+    def select(self, criteria):
+        """Return matching tools in registration order.
+
+        ``criteria`` is a dict (see ToolQuery), a compiled ToolQuery, or a
+        plain predicate, which falls back to checking every tool.
+        """
+        if isinstance(criteria, ToolQuery):
+            return criteria.run(self)
+        if isinstance(criteria, dict):
+            return self.compile(criteria).run(self)
+        return [tool for tool in self._by_name.values() if criteria(tool)]
+
+    def _cost_range(self, min_cost, max_cost):
+        lo = 0 if min_cost is None else bisect.bisect_left(self._costs, (min_cost,))
+        hi = len(self._costs) if max_cost is None else bisect.bisect_right(self._costs, (max_cost, float("inf")))
+        return lo, hi
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(value)
+    return value
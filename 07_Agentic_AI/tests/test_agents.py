@@ -1,6 +1,18 @@
+import asyncio
+import functools
+import os
+import shutil
+import tempfile
+import time
 import unittest
 from src.agents.base_agent import BaseAgent
 from src.agents.autonomous_agent import AutonomousAgent
+from src.agents.async_runtime import AgentRuntime
+from src.agents.checkpoint import restore_agent, save_checkpoint
+from src.agents.decision_service import DecisionService, LinearPolicy
+from src.agents.simulation import BanditAgent, BanditBehavior, SimulationEngine
+from src.agents.supervisor import BackpressureError, FleetSupervisor, WorkerCrashedError
+from src.memory.agent_memory import AgentMemory
 
 class TestAgents(unittest.TestCase):
 
@@ -17,12 +29,311 @@ class TestAgents(unittest.TestCase):
         self.assertIsNotNone(self.autonomous_agent)
 
     def test_base_agent_functionality(self):
-        # Add tests for base agent functionalities
-        pass
+        self.base_agent.store_memory("goal", "explore")
+        self.assertEqual(self.base_agent.retrieve_memory("goal"), "explore")
+        self.assertEqual(self.base_agent.memory.retrieve_memory("goal"), "explore")
+        self.assertIsNone(self.base_agent.retrieve_memory("missing"))
 
     def test_autonomous_agent_functionality(self):
-        # Add tests for autonomous agent functionalities
-        pass
+        self.autonomous_agent.store_memory("goal", "explore")
+        self.autonomous_agent.memory.update_memory("goal", "rest")
+        self.assertEqual(self.autonomous_agent.retrieve_memory("goal"), "rest")
+
+    def test_agents_share_memory(self):
+        shared = AgentMemory()
+        first = BaseAgent(name="First", memory=shared)
+        second = AutonomousAgent(name="Second", memory=shared)
+        first.store_memory("map", "known")
+        self.assertEqual(second.retrieve_memory("map"), "known")
+
+    def test_compact_agents_build_memory_and_planner_lazily(self):
+        agent = AutonomousAgent(name="Lazy")
+        self.assertFalse(hasattr(agent, "__dict__"))
+        self.assertIsNone(agent._memory)
+        self.assertIsNone(agent._task_planner)
+        self.assertIs(agent.task_planner, agent.task_planner)
+        agent.store_memory("seen", True)
+        self.assertTrue(agent.retrieve_memory("seen"))
+        self.assertEqual(len(agent.memory.memory_store.shards), 1)  # private memory is one locked shard
+        with self.assertRaises(AttributeError):
+            agent.mood = "curious"
+
+class TestAgentRuntime(unittest.TestCase):
+
+    def test_runs_many_agents_with_limits_and_timeouts(self):
+        runtime = AgentRuntime(max_concurrency_per_agent=2)
+        agents = [AutonomousAgent(name=f"Agent{i}") for i in range(3)]
+        in_flight = {agent.name: 0 for agent in agents}
+        peak = {agent.name: 0 for agent in agents}
+
+        def make_task(agent, value):
+            async def task():
+                in_flight[agent.name] += 1
+                peak[agent.name] = max(peak[agent.name], in_flight[agent.name])
+                await asyncio.sleep(0.01)
+                in_flight[agent.name] -= 1
+                return value
+            return task
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        assignments = [(agent, make_task(agent, i)) for agent in agents for i in range(5)]
+        assignments.append((agents[0], slow))
+        results = runtime.run(assignments, timeout=0.2)
+        self.assertEqual(results[:5], [0, 1, 2, 3, 4])
+        self.assertIsInstance(results[-1], asyncio.TimeoutError)
+        self.assertEqual(max(peak.values()), 2)
+        self.assertEqual(runtime.stats()["completed"], 15)
+        self.assertEqual(runtime.stats()["timed_out"], 1)
+
+    def test_runtime_is_reusable_across_runs(self):
+        runtime = AgentRuntime(max_concurrency_per_agent=1)
+        agent = AutonomousAgent(name="Reused")
+
+        async def task():
+            await asyncio.sleep(0.001)
+            return "done"
+
+        for _ in range(2):
+            self.assertEqual(runtime.run([(agent, task), (agent, task)]), ["done", "done"])
+        self.assertEqual(runtime._agents, {})
+        self.assertEqual(runtime.stats()["completed"], 4)
+        self.assertGreater(runtime.stats()["p99_latency"], 0)
+
+    def test_cancel_agent(self):
+        runtime = AgentRuntime()
+        agent = AutonomousAgent(name="Cancelled")
+
+        async def main():
+            runtime.submit(agent, lambda: asyncio.sleep(1))
+            await asyncio.sleep(0.01)
+            runtime.cancel(agent)
+            return await runtime.join()
+
+        results = asyncio.run(main())
+        self.assertIsInstance(results[0], asyncio.CancelledError)
+        self.assertEqual(runtime.stats()["cancelled"], 1)
+
+    def test_async_tool_interaction(self):
+        from src.tools.agent_tools import Tool
+        agent = AutonomousAgent(name="ToolUser")
+        doubled = asyncio.run(agent.interact_with_tool_async(Tool("double", lambda x: 2 * x), 21))
+        self.assertEqual(doubled, 42)
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.agent = AutonomousAgent(name="Checkpointed")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_full_and_incremental_restore(self):
+        full = os.path.join(self.directory, "agent.ckpt")
+        delta = os.path.join(self.directory, "agent.1.delta")
+        self.agent.store_memory("goal", "explore")
+        self.agent.store_memory("seen", [1, 2, 3])
+        self.agent.task_planner.add_task("scout")
+        save_checkpoint(self.agent, full)
+
+        self.agent.memory.update_memory("goal", "rest")
+        self.agent.task_planner.add_task("report")
+        save_checkpoint(self.agent, delta, incremental=True)
+
+        restored = restore_agent([full, delta])
+        self.assertEqual(restored.name, "Checkpointed")
+        self.assertEqual(len(restored.memory.memory_store._pending), 2)
+        self.assertEqual(restored.retrieve_memory("goal"), "rest")
+        self.assertEqual(restored.retrieve_memory("seen"), [1, 2, 3])
+        self.assertEqual(restored.task_planner.tasks, ["scout", "report"])
+        restored.memory.memory_store.close()
+
+    def test_delta_records_clear(self):
+        full = os.path.join(self.directory, "agent.ckpt")
+        delta = os.path.join(self.directory, "agent.1.delta")
+        self.agent.store_memory("old", 1)
+        save_checkpoint(self.agent, full)
+        self.agent.memory.clear_memory()
+        self.agent.store_memory("new", 2)
+        save_checkpoint(self.agent, delta, incremental=True)
+        restored = restore_agent([full, delta])
+        self.assertIsNone(restored.retrieve_memory("old"))
+        self.assertEqual(restored.retrieve_memory("new"), 2)
+        with self.assertRaises(ValueError):
+            restore_agent([delta])
+        restored.memory.memory_store.close()
+
+    def test_failed_save_keeps_changes_for_the_next_delta(self):
+        full = os.path.join(self.directory, "agent.ckpt")
+        delta = os.path.join(self.directory, "agent.1.delta")
+        self.agent.store_memory("a", 1)
+        save_checkpoint(self.agent, full)
+        self.agent.store_memory("b", 2)
+        with self.assertRaises(OSError):
+            save_checkpoint(self.agent, os.path.join(self.directory, "missing", "x.delta"), incremental=True)
+        taken = self.agent.memory.checkpoint_delta()
+        self.agent.store_memory("c", 3)  # written while a checkpoint is in progress
+        self.agent.memory.restore_checkpoint_delta(taken)
+        save_checkpoint(self.agent, delta, incremental=True)
+        restored = restore_agent([full, delta])
+        self.assertEqual([restored.retrieve_memory(key) for key in "abc"], [1, 2, 3])
+        restored.memory.memory_store.close()
+
+    def test_expired_keys_are_saved_as_removed(self):
+        full = os.path.join(self.directory, "agent.ckpt")
+        delta = os.path.join(self.directory, "agent.1.delta")
+        agent = AutonomousAgent(name="Expiring", memory=AgentMemory(ttl=60))
+        agent.store_memory("kept", 1)
+        agent.store_memory("brief", 2)
+        save_checkpoint(agent, full)
+        agent.memory.store_memory("brief", 3, ttl=0.01)
+        time.sleep(0.02)
+        save_checkpoint(agent, delta, incremental=True)
+        restored = restore_agent([full, delta])
+        self.assertEqual(sorted(restored.memory.memory_store.keys()), ["kept"])
+        restored.memory.memory_store.close()
+
+class TestDecisionService(unittest.TestCase):
+
+    def setUp(self):
+        # Picks "left" when the first feature is larger, "right" otherwise.
+        self.policy = LinearPolicy([[1.0, 0.0], [0.0, 1.0]], classes=["left", "right"])
+
+    def test_batches_concurrent_agents(self):
+        service = DecisionService(self.policy, max_batch_size=100, max_wait=0.05)
+        agents = [AutonomousAgent(f"agent{i}", decision_service=service) for i in range(10)]
+
+        async def main():
+            return await asyncio.gather(*(agent.make_decision_async([i, 5.5]) for i, agent in enumerate(agents)))
+
+        decisions = asyncio.run(main())
+        self.assertEqual(decisions, ["right"] * 6 + ["left"] * 4)
+        self.assertEqual(service.stats()["batches"], 1)
+
+    def test_full_batch_flushes_immediately_and_errors_propagate(self):
+        service = DecisionService(self.policy, max_batch_size=4, max_wait=10)
+
+        async def main():
+            decisions = await asyncio.wait_for(
+                asyncio.gather(*(service.decide([1, 0]) for _ in range(8))), timeout=1)
+            service.max_wait = 0.001
+            with self.assertRaises(ValueError):
+                await service.decide([1, 2, 3])
+            return decisions
+
+        self.assertEqual(asyncio.run(main()), ["left"] * 8)
+        self.assertEqual(service.stats()["batches"], 2)
+
+    def test_cancelled_callers_and_a_new_loop_do_not_stall_it(self):
+        service = DecisionService(self.policy, max_batch_size=2, max_wait=10)
+
+        async def abandon():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(service.decide([1, 0]), timeout=0.01)
+
+        asyncio.run(abandon())  # its loop ends with the batch window still open
+        service.max_wait = 0.001
+
+        async def main():
+            decision = await asyncio.wait_for(service.decide([0, 1]), timeout=1)
+            waiting = asyncio.ensure_future(service.decide([1, 0]))
+            await asyncio.sleep(0)
+            waiting.cancel()
+            return decision, await asyncio.wait_for(service.decide([2, 0]), timeout=1)
+
+        self.assertEqual(asyncio.run(main()), ("right", "left"))
+        self.assertEqual(service.stats()["decisions"], 2)
+
+    def test_probabilities_and_featurize(self):
+        probabilities = self.policy.predict_proba([[2.0, 0.0], [0.0, 0.0]])
+        self.assertEqual(probabilities.sum(axis=1).round(9).tolist(), [1.0, 1.0])
+        self.assertAlmostEqual(probabilities[1, 0], 0.5)
+        service = DecisionService(self.policy, featurize=lambda context: [context["x"], context["y"]])
+        self.assertEqual(service.decide_batch([{"x": 0, "y": 3}]), ["right"])
+
+class TestFleetSupervisor(unittest.TestCase):
+
+    def setUp(self):
+        self.fleet = FleetSupervisor(num_agents=10, num_workers=2, queue_size=2, max_task_attempts=2)
+
+    def tearDown(self):
+        self.fleet.shutdown(wait=False)
+
+    def test_runs_tasks_across_the_fleet(self):
+        results = self.fleet.map([functools.partial(pow, 2, i) for i in range(20)])
+        self.assertEqual(results, [2 ** i for i in range(20)])
+        self.assertIsNone(self.fleet.submit("write the report").result(10))
+        with self.assertRaises(ValueError):
+            self.fleet.submit(functools.partial(int, "x")).result(10)
+        stats = self.fleet.stats()
+        self.assertEqual((stats["completed"], stats["failed"]), (21, 1))
+
+    def test_restarts_crashed_workers(self):
+        crash = self.fleet.submit(functools.partial(os._exit, 1), agent="agent-0")
+        after = self.fleet.submit(functools.partial(abs, -3), agent="agent-0")
+        with self.assertRaises(WorkerCrashedError):
+            crash.result(30)
+        self.assertEqual(after.result(30), 3)
+        self.assertEqual(self.fleet.stats()["restarts"], 2)
+
+    def test_backpressure(self):
+        slow = functools.partial(time.sleep, 0.2)
+        futures = [self.fleet.submit(slow, agent="agent-0") for _ in range(2)]
+        with self.assertRaises(BackpressureError):
+            self.fleet.submit(slow, agent="agent-0", block=False)
+        with self.assertRaises(BackpressureError):
+            self.fleet.submit(slow, agent="agent-2", timeout=0.01)  # same worker as agent-0
+        self.assertEqual(self.fleet.submit(functools.partial(abs, -1), agent="agent-1").result(10), 1)
+        futures.append(self.fleet.submit(slow, agent="agent-0"))  # blocks until a slot frees
+        for future in futures:
+            future.result(10)
+
+    def test_unpicklable_task_is_rejected_at_submit(self):
+        with self.assertRaises(TypeError):
+            self.fleet.submit(lambda: 1)
+        self.assertEqual(self.fleet.stats()["queued"], 0)
+        self.assertEqual(self.fleet.submit(functools.partial(abs, -2)).result(10), 2)
+        self.fleet.shutdown(wait=True)  # nothing left behind to wait on
+
+
+class CountingAgent(BaseAgent):
+    __slots__ = ("steps",)
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.steps = 0
+
+    def act(self):
+        return 1
+
+    def learn(self, experience):
+        self.steps += experience
+
+
+class TestSimulationEngine(unittest.TestCase):
+
+    def test_vectorized_group_learns_best_arm(self):
+        engine = SimulationEngine()
+        state = engine.add_group("bandits", BanditBehavior([0.0, 3.0, 1.0], seed=0), 500)
+        self.assertEqual(state["estimates"].shape, (500, 3))
+        stats = engine.run(50)
+        self.assertEqual((stats["agents"], stats["steps"]), (500, 50))
+        self.assertGreater((state["estimates"].argmax(axis=1) == 1).mean(), 0.9)
+        self.assertGreater(state.row(0)["total_reward"], 0)
+
+    def test_mixes_groups_with_per_object_agents(self):
+        engine = SimulationEngine()
+        engine.add_group("bandits", BanditBehavior([0.0, 1.0], seed=1), 10)
+        agents = [CountingAgent(f"custom-{i}") for i in range(3)] + [BanditAgent("bandit", [0.0, 1.0])]
+        engine.add_agents(agents)
+        engine.run(5)
+        self.assertEqual(engine.num_agents, 14)
+        self.assertEqual([agent.steps for agent in agents[:3]], [5, 5, 5])
+        self.assertNotEqual(agents[3].estimates, [0.0, 0.0])
+        with self.assertRaises(ValueError):
+            engine.add_group("bandits", BanditBehavior([0.0]), 1)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,354 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import numpy as np
+from src.agents.base_agent import BaseAgent
+from src.memory.agent_memory import AgentMemory
+from src.memory.eviction import EvictionCache
+from src.memory.persistent_memory import PersistentMemory
+from src.memory.replay_buffer import ReplayBuffer, SumTree
+from src.memory.sharded_store import ShardedStore
+from src.memory.shared_memory_store import SharedMemoryTable
+from src.memory.tiered_memory import TieredMemory
+from src.memory.vector_index import BruteForceIndex, IVFIndex
+
+class TestAgentMemory(unittest.TestCase):
+
+    def test_unbounded_memory(self):
+        memory = AgentMemory()
+        memory.store_memory("goal", "explore")
+        self.assertEqual(memory.retrieve_memory("goal"), "explore")
+        memory.update_memory("goal", "rest")
+        self.assertEqual(memory.retrieve_memory("goal"), "rest")
+        with self.assertRaises(KeyError):
+            memory.update_memory("missing", 1)
+        memory.clear_memory()
+        self.assertIsNone(memory.retrieve_memory("goal"))
+
+    def test_lru_eviction(self):
+        evicted = []
+        memory = AgentMemory(max_entries=2, on_evict=lambda k, v: evicted.append(k))
+        memory.store_memory("a", 1)
+        memory.store_memory("b", 2)
+        memory.retrieve_memory("a")
+        memory.store_memory("c", 3)
+        self.assertEqual(evicted, ["b"])
+        self.assertIsNone(memory.retrieve_memory("b"))
+        with self.assertRaises(KeyError):
+            memory.update_memory("b", 5)
+        self.assertEqual(memory.memory_stats()["evictions"], 1)
+
+    def test_lfu_eviction(self):
+        cache = EvictionCache(max_entries=2, policy="lfu")
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        cache.put("c", 3)
+        self.assertNotIn("b", cache)
+        cache.put("d", 4)
+        self.assertNotIn("c", cache)
+        self.assertIn("a", cache)
+        self.assertIn("d", cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_max_bytes(self):
+        cache = EvictionCache(max_bytes=10, sizeof=len)
+        cache.put("a", "12345")
+        cache.put("b", "12345")
+        cache.put("c", "1")
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.total_bytes, 6)
+
+    def test_ttl_expiry(self):
+        memory = AgentMemory(ttl=60)
+        memory.store_memory("short", 1, ttl=0.01)
+        memory.store_memory("long", 2)
+        time.sleep(0.02)
+        self.assertIsNone(memory.retrieve_memory("short"))
+        self.assertEqual(memory.retrieve_memory("long"), 2)
+        self.assertEqual(memory.memory_stats()["expirations"], 1)
+
+class TestShardedStore(unittest.TestCase):
+
+    def test_concurrent_writers(self):
+        store = ShardedStore(num_shards=8)
+
+        def write(worker):
+            for i in range(1000):
+                store[(worker, i)] = i
+
+        threads = [threading.Thread(target=write, args=(w,)) for w in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(store), 8000)
+        self.assertEqual(store.get((3, 999)), 999)
+        self.assertTrue(store.replace((3, 999), -1))
+        self.assertFalse(store.replace("missing", 1))
+        self.assertEqual(store[(3, 999)], -1)
+
+    def test_sharded_bounded_memory(self):
+        memory = AgentMemory(max_entries=8, num_shards=4)
+        for i in range(100):
+            memory.store_memory(i, i)
+        self.assertLessEqual(len(memory.memory_store), 8)
+        self.assertGreater(memory.memory_stats()["evictions"], 0)
+
+    def test_shard_count_must_be_power_of_two(self):
+        with self.assertRaises(ValueError):
+            ShardedStore(num_shards=3)
+
+class TestSharedMemoryTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = SharedMemoryTable.create(capacity=64, arena_size=4096)
+
+    def tearDown(self):
+        self.table.close()
+        self.table.unlink()
+
+    def test_attached_memory_sees_writes(self):
+        reader = SharedMemoryTable.attach(self.table.name)
+        memory = AgentMemory(store=reader)
+        self.table["fact"] = "water is wet"
+        self.table["count"] = 3
+        self.table[b"blob"] = b"\x00\x01"
+        self.table["plan"] = ["a", "b"]
+        self.assertEqual(memory.retrieve_memory("fact"), "water is wet")
+        self.assertEqual(reader["count"], 3)
+        self.assertEqual(reader[b"blob"], b"\x00\x01")
+        self.assertEqual(reader["plan"], ["a", "b"])
+        self.table["count"] = 4
+        self.assertEqual(reader["count"], 4)
+        self.assertEqual(len(reader), 4)
+        self.table.clear()
+        self.assertNotIn("fact", reader)
+        reader.close()
+
+    def test_table_full(self):
+        with self.assertRaises(MemoryError):
+            for i in range(64):
+                self.table[str(i)] = i
+
+class TestTieredMemory(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.tiers = TieredMemory(hot_max_entries=2, warm_max_bytes=30,
+                                  cold_directory=self.directory, promote_after=2)
+
+    def tearDown(self):
+        self.tiers.close()
+        shutil.rmtree(self.directory)
+
+    def test_demotion_and_promotion(self):
+        memory = AgentMemory(store=self.tiers)
+        for i in range(6):
+            memory.store_memory(f"k{i}", i)
+        stats = memory.memory_stats()
+        self.assertEqual(stats["hot_entries"], 2)
+        self.assertGreater(stats["cold_entries"], 0)
+        self.assertEqual(stats["entries"], 6)
+        self.assertEqual(memory.retrieve_memory("k0"), 0)
+        self.assertEqual(memory.retrieve_memory("k0"), 0)
+        self.assertIn("k0", self.tiers._warm)
+        memory.retrieve_memory("k0")
+        memory.retrieve_memory("k0")
+        self.assertIn("k0", self.tiers._hot)
+        memory.update_memory("k1", "new")
+        self.assertEqual(memory.retrieve_memory("k1"), "new")
+        memory.clear_memory()
+        self.assertEqual(len(self.tiers), 0)
+
+    def test_unpicklable_values_stay_hot(self):
+        lock = threading.Lock()
+        self.tiers["lock"] = lock
+        self.tiers["a"] = 1
+        self.tiers["b"] = 2
+        self.assertIs(self.tiers["lock"], lock)
+        self.assertEqual((self.tiers["a"], self.tiers["b"]), (1, 2))
+        self.assertEqual(self.tiers.stats()["hot_entries"], 2)
+        self.assertIn("a", self.tiers._warm)
+
+class TestVectorRecall(unittest.TestCase):
+
+    def test_recall_follows_updates_and_eviction(self):
+        memory = AgentMemory(max_entries=2)
+        memory.store_memory("north", "cold", vector=[0.0, 1.0])
+        memory.store_memory("east", "sunrise", vector=[1.0, 0.0])
+        self.assertEqual(memory.recall([0.1, 0.9], k=1)[0][:2], ("north", "cold"))
+        memory.update_memory("north", "snow", vector=[1.0, 0.1])
+        self.assertEqual([hit[0] for hit in memory.recall([1.0, 0.0], k=2)], ["east", "north"])
+        memory.store_memory("south", "warm", vector=[0.0, -1.0])
+        self.assertEqual(len(memory.vector_index), 2)
+        memory.clear_memory()
+        self.assertEqual(memory.recall([1.0, 0.0]), [])
+
+    def test_ivf_matches_brute_force_on_clusters(self):
+        import numpy as np
+        rng = np.random.default_rng(1)
+        centers = rng.normal(size=(8, 16))
+        data = centers[rng.integers(0, 8, 2000)] + 0.05 * rng.normal(size=(2000, 16))
+        brute = BruteForceIndex(16)
+        ivf = IVFIndex(16, nlist=8, nprobe=2, train_size=1000)
+        brute.add_batch(range(2000), data)
+        ivf.add_batch(list(range(2000)), data)
+        self.assertIsNotNone(ivf.centroids)
+        queries = data[:20]
+        for exact, approx in zip(brute.search(queries, 1), ivf.search(queries, 1)):
+            self.assertEqual(exact[0][0], approx[0][0])
+        ivf.remove(0)
+        self.assertNotIn(0, ivf)
+
+    def test_ivf_repeated_key_in_a_batch_keeps_the_last_vector(self):
+        ivf = IVFIndex(2, nlist=2, nprobe=2, train_size=4)
+        ivf.add_batch(["a", "b", "c", "d"], [[1, 0], [0.9, 0.1], [0, 1], [0.1, 0.9]])
+        self.assertIsNotNone(ivf.centroids)
+        ivf.add_batch(["dup", "dup"], [[1, 0], [-1, 1]])
+        self.assertEqual(len(ivf), 5)
+        self.assertEqual(ivf.search([[-1, 1]], 1)[0][0][0], "dup")
+        ivf.remove("dup")
+        keys = [key for key, _ in ivf.search([[1, 0], [0, 1]], 5)[0]]
+        self.assertNotIn("dup", keys)
+        self.assertEqual(sorted(keys), ["a", "b", "c", "d"])
+
+class TestPersistentMemory(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_survives_restart(self):
+        with PersistentMemory(self.directory) as memory:
+            memory.store_memory("goal", {"step": 1})
+            memory.update_memory("goal", {"step": 2})
+            with self.assertRaises(KeyError):
+                memory.update_memory("missing", 1)
+        with PersistentMemory(self.directory) as memory:
+            self.assertEqual(memory.retrieve_memory("goal"), {"step": 2})
+
+    def test_torn_tail_is_truncated(self):
+        with PersistentMemory(self.directory) as memory:
+            memory.store_memory("a", 1)
+            log_size = os.path.getsize(memory.log_path)
+        with open(os.path.join(self.directory, "memory.log"), "ab") as handle:
+            handle.write(b"\x07torn")
+        with PersistentMemory(self.directory) as memory:
+            self.assertEqual(memory.retrieve_memory("a"), 1)
+            self.assertEqual(os.path.getsize(memory.log_path), log_size)
+
+    def test_compaction_keeps_live_values(self):
+        with PersistentMemory(self.directory) as memory:
+            for i in range(100):
+                memory.store_memory(i % 10, i)
+            memory.delete_memory(0)
+            before = os.path.getsize(memory.log_path)
+            memory.compact()
+            self.assertLess(os.path.getsize(memory.log_path), before)
+            self.assertEqual(memory.retrieve_memory(9), 99)
+            self.assertIsNone(memory.retrieve_memory(0))
+            memory.clear_memory()
+            self.assertEqual(len(memory), 0)
+
+    def test_foreground_compaction_waits_for_background(self):
+        with PersistentMemory(self.directory) as memory:
+            for i in range(2000):
+                memory.store_memory(i % 50, "x" * 100 + str(i))
+            background = memory.compact(background=True)
+            memory.compact()
+            background.join()
+            self.assertIsNone(memory._compactor)
+            self.assertEqual(memory.retrieve_memory(49), "x" * 100 + "1999")
+            self.assertEqual(len(memory), 50)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "memory.log.compact")))
+
+
+class ReplayAgent(BaseAgent):
+    __slots__ = ("replay",)
+
+    def __init__(self, name, replay):
+        super().__init__(name)
+        self.replay = replay
+
+    def learn(self, experience):
+        self.replay.store(experience)
+
+
+class TestReplayBuffer(unittest.TestCase):
+
+    def test_ring_buffer_and_zero_copy_views(self):
+        buffer = ReplayBuffer(4, state_shape=(2,), seed=0)
+        agent = ReplayAgent("learner", buffer)
+        for i in range(6):
+            agent.learn(([i, i], i, float(i), [i + 1, i + 1], i == 5))
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(sorted(buffer.actions.tolist()), [2, 3, 4, 5])
+        view = buffer.view()
+        self.assertTrue(np.shares_memory(view["states"], buffer.states))
+        self.assertEqual(sum(len(batch["rewards"]) for batch in buffer.iter_batches(3)), 4)
+        batch = buffer.sample(32)
+        self.assertEqual(batch["states"].shape, (32, 2))
+        self.assertTrue(set(batch["actions"].tolist()) <= {2, 3, 4, 5})
+
+        buffer.extend(np.zeros((6, 2)), np.arange(10, 16), np.ones(6), np.zeros((6, 2)))
+        self.assertEqual(sorted(buffer.actions.tolist()), [12, 13, 14, 15])
+        with self.assertRaises(ValueError):
+            ReplayBuffer(2).sample(1)
+        with self.assertRaises(ValueError):
+            buffer.update_priorities([0], [1.0])
+
+    def test_chronological_order_after_wrapping(self):
+        buffer = ReplayBuffer(4)
+        for i in range(6):
+            buffer.add(i, i, float(i), i)
+        self.assertEqual(buffer.view()["actions"].tolist(), [4, 5, 2, 3])
+        self.assertEqual(buffer.chronological()["actions"].tolist(), [2, 3, 4, 5])
+        self.assertEqual(buffer.chronological(1, 3)["rewards"].tolist(), [3.0, 4.0])
+        partial = ReplayBuffer(4)
+        partial.add(0, 7, 0.0, 0)
+        self.assertEqual(partial.chronological()["actions"].tolist(), [7])
+
+    def test_sum_tree_matches_cumulative_sums(self):
+        priorities = np.random.default_rng(0).random(37)
+        tree = SumTree(37)
+        tree.update(np.arange(37), priorities)
+        tree.set(5, 2.0)
+        priorities[5] = 2.0
+        self.assertAlmostEqual(tree.total, priorities.sum())
+        values = np.linspace(0, priorities.sum(), 50, endpoint=False)
+        expected = np.searchsorted(np.cumsum(priorities), values, side="right")
+        self.assertEqual(tree.find(values).tolist(), expected.tolist())
+
+    def test_prioritized_sampling(self):
+        buffer = ReplayBuffer(100, prioritized=True, alpha=1.0, seed=0)
+        indices = buffer.extend(np.zeros(100), np.arange(100), np.zeros(100), np.zeros(100))
+        buffer.update_priorities(indices, np.where(indices == 7, 1000.0, 1.0))
+        batch = buffer.sample(1000)
+        self.assertGreater((batch["actions"] == 7).mean(), 0.8)
+        self.assertAlmostEqual(float(batch["weights"].max()), 1.0)
+        self.assertLess(float(batch["weights"][batch["actions"] == 7][0]), 0.1)
+
+    def test_memory_mapped_buffer_survives_restart(self):
+        directory = tempfile.mkdtemp()
+        try:
+            with ReplayBuffer(8, state_shape=(3,), path=directory) as buffer:
+                buffer.extend(np.ones((5, 3)), np.arange(5), np.arange(5), np.ones((5, 3)))
+            with ReplayBuffer(8, state_shape=(3,), path=directory, prioritized=True) as buffer:
+                self.assertEqual(len(buffer), 5)
+                self.assertEqual(buffer.view()["rewards"].tolist(), [0, 1, 2, 3, 4])
+                self.assertLess(buffer.sample(10)["indices"].max(), 5)
+            with self.assertRaises(ValueError):
+                ReplayBuffer(16, state_shape=(3,), path=directory)
+        finally:
+            shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,297 @@
+import functools
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from src.planning.dag_planner import DAGPlanner
+from src.planning.durable_queue import DurableTaskPlanner, DurableTaskQueue
+from src.planning.priority_planner import PriorityTaskPlanner
+from src.planning.task_planner import TaskPlanner
+from src.planning.work_stealing import WorkerDiedError, WorkStealingExecutor
+
+class TestTaskPlanner(unittest.TestCase):
+
+    def test_sequence_and_optimization(self):
+        planner = TaskPlanner()
+        for task in ["write", "plan", "review"]:
+            planner.add_task(task)
+        self.assertEqual(planner.create_task_sequence(), ["write", "plan", "review"])
+        self.assertEqual(planner.optimize_task_execution(), ["plan", "review", "write"])
+
+    def test_incremental_replanning(self):
+        planner = TaskPlanner()
+        for task in [5, 1, 9, 3]:
+            planner.add_task(task)
+        self.assertEqual(planner.optimize_task_execution(), [1, 3, 5, 9])
+        self.assertEqual(planner.plan_diff()["unchanged_prefix"], 0)
+        planner.add_task(7)
+        planner.remove_task(1)
+        self.assertEqual(planner.optimize_task_execution(), [3, 5, 7, 9])
+        self.assertEqual(planner.plan_diff(),
+                         {"unchanged_prefix": 0, "changes": [("add", 3, 7), ("remove", 0, 1)]})
+        planner.add_task(10)
+        planner.optimize_task_execution()
+        self.assertEqual(planner.plan_diff()["unchanged_prefix"], 4)
+        planner.tasks = [2, 1]
+        self.assertEqual(planner.optimize_task_execution(), [1, 2])
+
+    def test_direct_edits_invalidate_the_plan(self):
+        planner = TaskPlanner()
+        self.assertEqual(planner.optimize_task_execution(), [])
+        planner.tasks = [2, 1]
+        self.assertEqual(planner.optimize_task_execution(), [1, 2])
+        planner.tasks[0] = 99
+        self.assertEqual(planner.optimize_task_execution(), [1, 99])
+        planner.tasks.append(0)
+        planner.tasks.pop(0)
+        self.assertEqual(planner.optimize_task_execution(), [0, 1])
+        planner.tasks += [5]
+        planner.add_task(3)
+        self.assertEqual(planner.optimize_task_execution(), [0, 1, 3, 5])
+
+    def test_task_list_keeps_the_list_api(self):
+        planner = TaskPlanner()
+        for task in ["bb", "a", "ccc"]:
+            planner.add_task(task)
+        planner.optimize_task_execution()
+        planner.tasks.sort(key=len, reverse=True)
+        self.assertEqual(planner.tasks, ["ccc", "bb", "a"])
+        planner.tasks.sort(reverse=True)
+        self.assertEqual(planner.create_task_sequence(), ["ccc", "bb", "a"])
+        planner.tasks.remove("bb")
+        self.assertEqual(planner.optimize_task_execution(), ["a", "ccc"])
+
+class TestPriorityTaskPlanner(unittest.TestCase):
+
+    def test_priority_order_and_updates(self):
+        planner = PriorityTaskPlanner()
+        write = planner.add_task("write", priority=5)
+        planner.add_task("plan", priority=1)
+        review = planner.add_task("review", priority=3)
+        self.assertEqual(planner.peek_task(), "plan")
+        self.assertEqual(planner.create_task_sequence(), ["write", "plan", "review"])
+        planner.change_priority(write, 0)
+        self.assertEqual(planner.peek_task(), "write")
+        self.assertTrue(planner.cancel(write))
+        self.assertFalse(planner.cancel(write))
+        self.assertEqual(planner.optimize_task_execution(), ["plan", "review"])
+        self.assertEqual(planner.pop_task(), "plan")
+        self.assertEqual(planner.pop_task(), "review")
+        with self.assertRaises(IndexError):
+            planner.peek_task()
+        with self.assertRaises(KeyError):
+            planner.change_priority(review, 1)
+
+    def test_aging_prevents_starvation(self):
+        planner = PriorityTaskPlanner(aging_rate=1)
+        planner.add_task("old", priority=5)
+        for i in range(10):
+            planner.add_task(f"new{i}", priority=0)
+        self.assertLess(planner.optimize_task_execution().index("old"), 6)
+
+    def test_change_priority_keeps_aging(self):
+        planner = PriorityTaskPlanner(aging_rate=1)
+        old = planner.add_task("old", priority=5)
+        for i in range(10):
+            planner.add_task(f"new{i}", priority=4)
+        planner.change_priority(old, 4)
+        self.assertEqual(planner.peek_task(), "old")
+        planner.change_priority(old, 4)  # unchanged priority is a no-op
+        planner.change_priority(old, 20)
+        self.assertEqual(planner.optimize_task_execution().index("old"), 10)
+        self.assertEqual(len(planner), 11)
+
+    def test_remove_task_cancels_by_task(self):
+        planner = PriorityTaskPlanner()
+        for task, priority in [("write", 2), ("plan", 1), ("write", 0)]:
+            planner.add_task(task, priority)
+        planner.remove_task("write")
+        self.assertEqual(planner.optimize_task_execution(), ["write", "plan"])
+        self.assertEqual(planner.peek_task(), "write")
+        with self.assertRaises(ValueError):
+            planner.remove_task("review")
+        with self.assertRaises(NotImplementedError):
+            planner.plan_diff()
+
+class TestDAGPlanner(unittest.TestCase):
+
+    def test_critical_path_first_order(self):
+        planner = DAGPlanner()
+        planner.add_task("report", depends_on=["train", "clean"])
+        planner.add_task("fetch")
+        planner.add_task("train", depends_on=["fetch"], cost=10)
+        planner.add_task("clean", depends_on=["fetch"])
+        planner.add_task("email")
+        self.assertEqual(planner.optimize_task_execution(), ["fetch", "train", "clean", "report", "email"])
+        self.assertEqual(planner.create_task_sequence(), ["report", "fetch", "train", "clean", "email"])
+        self.assertEqual(planner.estimate_makespan(workers=2), 12)
+
+    def test_cycles_are_rejected(self):
+        planner = DAGPlanner()
+        planner.add_task("a", depends_on=["b"])
+        with self.assertRaises(ValueError):
+            planner.add_task("b", depends_on=["a"])
+        with self.assertRaises(ValueError):
+            planner.optimize_task_execution()
+
+    def test_parallel_run_with_resources_and_replanning(self):
+        planner = DAGPlanner()
+        active = set()
+        overlaps = []
+        lock = threading.Lock()
+
+        def step(name, resource=None):
+            def run():
+                with lock:
+                    if resource and resource in active:
+                        overlaps.append(name)
+                    active.add(resource)
+                time.sleep(0.02)
+                with lock:
+                    active.discard(resource)
+                if name == "b":
+                    planner.add_task("late", depends_on=["b"], function=lambda: "late")
+                return name
+            return run
+
+        planner.add_task("a", function=step("a"))
+        planner.add_task("b", depends_on=["a"], function=step("b"))
+        planner.add_task("c", depends_on=["a"], function=step("c", "gpu"), resources=["gpu"])
+        planner.add_task("d", function=step("d", "gpu"), resources=["gpu"])
+        results = planner.run(max_workers=4)
+        self.assertEqual(set(results), {"a", "b", "c", "d", "late"})
+        self.assertEqual(overlaps, [])
+        self.assertGreater(planner.makespan, 0)
+
+    def test_failure_is_raised(self):
+        planner = DAGPlanner()
+        planner.add_task("boom", function=lambda: 1 / 0)
+        planner.add_task("after", depends_on=["boom"])
+        with self.assertRaises(ZeroDivisionError):
+            planner.run()
+
+    def test_remove_task_unlinks_the_node(self):
+        planner = DAGPlanner()
+        planner.add_task("fetch")
+        planner.add_task("train", depends_on=["fetch"], cost=10)
+        planner.add_task("report", depends_on=["train"])
+        planner.remove_task("train")
+        self.assertNotIn("train", planner.nodes)
+        self.assertEqual(planner.nodes["fetch"].priority, 1.0)
+        with self.assertRaises(ValueError):
+            planner.optimize_task_execution()  # report now waits on a missing task
+        planner.add_task("train", depends_on=["fetch"], function=lambda: "trained")
+        self.assertEqual(planner.optimize_task_execution(), ["fetch", "train", "report"])
+        self.assertEqual(planner.run()["train"], "trained")
+        with self.assertRaises(ValueError):
+            planner.remove_task("train")  # already run
+        with self.assertRaises(NotImplementedError):
+            planner.plan_diff()
+
+class TestDurableTaskQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "tasks.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_tasks_survive_restart(self):
+        planner = DurableTaskPlanner(self.path)
+        planner.add_task("write")
+        planner.add_task("plan")
+        planner.queue.close()
+        planner = DurableTaskPlanner(self.path)
+        self.assertEqual(planner.create_task_sequence(), ["write", "plan"])
+        self.assertEqual(planner.optimize_task_execution(), ["plan", "write"])
+        planner.queue.close()
+
+    def test_remove_task_deletes_from_the_queue(self):
+        planner = DurableTaskPlanner(self.path)
+        for task in ["write", "plan", "write"]:
+            planner.add_task(task)
+        planner.remove_task("write")
+        with self.assertRaises(ValueError):
+            planner.remove_task("review")
+        with self.assertRaises(NotImplementedError):
+            planner.plan_diff()
+        planner.queue.close()
+        planner = DurableTaskPlanner(self.path)
+        self.assertEqual(planner.create_task_sequence(), ["plan", "write"])
+        planner.queue.close()
+
+    def test_unacked_tasks_are_redelivered(self):
+        queue = DurableTaskQueue(self.path, visibility_timeout=0.05)
+        queue.enqueue_many(["a", "b", "c"])
+        leased = queue.dequeue(max_items=2)
+        self.assertEqual([task for _, task in leased], ["a", "b"])
+        queue.ack([leased[0][0]])
+        self.assertEqual([task for _, task in queue.dequeue(max_items=5)], ["c"])
+        time.sleep(0.06)
+        redelivered = queue.dequeue(max_items=5)
+        self.assertEqual([task for _, task in redelivered], ["b", "c"])
+        self.assertEqual(queue.attempts(redelivered[0][0]), 2)
+        queue.nack([redelivered[0][0]])
+        self.assertEqual([task for _, task in queue.dequeue()], ["b"])
+        self.assertEqual(len(queue), 2)
+        queue.close()
+
+    def test_partial_batch_commits_after_flush_interval(self):
+        queue = DurableTaskQueue(self.path, flush_interval=0.02)
+        for task in ("a", "b", "c"):
+            queue.enqueue(task)
+        time.sleep(0.2)  # no further enqueue or flush
+        observer = sqlite3.connect(self.path)
+        self.assertEqual(observer.execute("SELECT COUNT(*) FROM tasks").fetchone()[0], 3)
+        observer.close()
+        queue.close()
+
+class TestWorkStealingExecutor(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = WorkStealingExecutor(num_workers=2, chunk_size=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def test_map_preserves_order(self):
+        self.assertEqual(self.executor.map(abs, range(-20, 0)), list(range(20, 0, -1)))
+
+    def test_errors_propagate(self):
+        with self.assertRaises(ValueError):
+            self.executor.map(int, ["1", "two", "3"])
+        self.assertEqual(self.executor.map(int, ["4", "5"]), [4, 5])
+
+    def test_run_sequence_streams_planner_tasks(self):
+        planner = TaskPlanner()
+        for exponent in range(5):
+            planner.add_task(functools.partial(pow, 2, exponent))
+        results = sorted(value for _, value in self.executor.run_sequence(planner))
+        self.assertEqual(results, [1, 2, 4, 8, 16])
+
+    def test_abandoned_stream_does_not_block_later_jobs(self):
+        for _ in self.executor.map_stream(abs, range(-30, 0)):
+            break
+        self.assertEqual(self.executor.map(abs, [-1, -2]), [1, 2])
+
+    def test_dead_worker_fails_the_job(self):
+        executor = WorkStealingExecutor(num_workers=2, chunk_size=1)
+        try:
+            stream = executor.map_stream(time.sleep, [0.01] + [0.5] * 4)
+            next(stream)
+            for worker in executor._workers:
+                worker.terminate()
+            with self.assertRaises(WorkerDiedError):
+                list(stream)
+        finally:
+            for worker in executor._workers:
+                worker.join()
+
+if __name__ == '__main__':
+    unittest.main()
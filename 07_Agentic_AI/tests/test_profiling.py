@@ -0,0 +1,109 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from src.agents.autonomous_agent import AutonomousAgent
+from src.profiling.sampling_profiler import SamplingProfiler
+from src.profiling.tracer import Tracer, tracer
+from src.tools.agent_tools import Tool
+
+
+class TestTracer(unittest.TestCase):
+
+    def test_nested_spans_and_exports(self):
+        local = Tracer(enabled=True)
+        with local.span("step", agent="a"):
+            with local.span("decide"):
+                time.sleep(0.002)
+            with self.assertRaises(ValueError):
+                with local.span("tool"):
+                    raise ValueError("boom")
+        by_name = {span[0]: span for span in local.spans}
+        self.assertEqual(by_name["decide"][1], ("step", "decide"))
+        self.assertEqual(by_name["decide"][3], by_name["step"][2])
+        self.assertEqual(by_name["tool"][8], "ValueError")
+
+        events = json.loads(json.dumps(local.to_chrome_trace()))["traceEvents"]
+        self.assertEqual({event["ph"] for event in events}, {"X"})
+        self.assertEqual([e for e in events if e["name"] == "step"][0]["args"]["agent"], "a")
+        folded = dict(line.rsplit(" ", 1) for line in local.to_folded().splitlines())
+        self.assertIn("step;decide", folded)
+        self.assertGreaterEqual(int(folded["step;decide"]), 2000)
+
+    def test_sampling_and_disabled(self):
+        local = Tracer(enabled=True, sample_rate=0.0)
+        with local.span("root"):
+            with local.span("child"):
+                pass
+        self.assertEqual(len(local.spans), 0)
+        local.enable(sample_rate=1.0)
+        local.disable()
+        with local.span("root") as span:
+            self.assertIsNone(span)
+        self.assertEqual(len(local.spans), 0)
+
+    def test_spans_follow_asyncio_tasks(self):
+        local = Tracer(enabled=True)
+
+        async def work(name):
+            with local.span(name):
+                await asyncio.sleep(0.001)
+                with local.span("inner"):
+                    await asyncio.sleep(0.001)
+
+        async def main():
+            await asyncio.gather(work("a"), work("b"))
+
+        asyncio.run(main())
+        paths = sorted(span[1] for span in local.spans)
+        self.assertEqual(paths, [("a",), ("a", "inner"), ("b",), ("b", "inner")])
+
+    def test_agent_steps_are_traced(self):
+        tracer.clear()
+        tracer.enable()
+        try:
+            agent = AutonomousAgent("tracer-agent")
+            with tracer.span("agent_step", agent=agent.name):
+                asyncio.run(agent.interact_with_tool_async(Tool("abs", abs), -1))
+                asyncio.run(agent.execute_task_async(lambda: None))
+        finally:
+            tracer.disable()
+        paths = {span[1] for span in tracer.spans}
+        self.assertIn(("agent_step", "interact_with_tool"), paths)
+        self.assertIn(("agent_step", "execute_task"), paths)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.json")
+            tracer.write_chrome_trace(path)
+            with open(path) as handle:
+                self.assertTrue(json.load(handle)["traceEvents"])
+        tracer.clear()
+
+
+class TestSamplingProfiler(unittest.TestCase):
+
+    def test_samples_busy_thread(self):
+        done = threading.Event()
+
+        def spin_for_profiler():
+            while not done.is_set():
+                sum(range(1000))
+
+        worker = threading.Thread(target=spin_for_profiler)
+        worker.start()
+        profiler = SamplingProfiler(interval=0.001, threads={worker.ident})
+        with profiler:
+            self.assertTrue(profiler.running)
+            time.sleep(0.1)
+        done.set()
+        worker.join()
+        self.assertFalse(profiler.running)
+        self.assertGreater(profiler.sample_count, 5)
+        self.assertIn("spin_for_profiler", profiler.to_folded())
+        self.assertTrue(all(line.rsplit(" ", 1)[1].isdigit() for line in profiler.to_folded().splitlines()))
+
+
+if __name__ == '__main__':
+    unittest.main()
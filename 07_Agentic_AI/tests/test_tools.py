@@ -0,0 +1,439 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import numpy as np
+from src.tools.agent_tools import Tool, execute_tool, select_tool
+from src.tools.batching import MicroBatcher
+from src.tools.instrumentation import LatencyHistogram, ToolInstrumentation, instrumentation
+from src.tools.sandbox import SandboxError, SandboxPool
+from src.tools.tool_cache import ToolCache, cache_stats
+from src.tools.tool_executor import (BulkheadFullError, CircuitBreaker, CircuitOpenError,
+                                     ToolExecutor, ToolTimeoutError)
+from src.tools.tool_registry import ToolRegistry
+
+class TestTools(unittest.TestCase):
+
+    def setUp(self):
+        self.search = Tool("search", lambda q: f"results for {q}", tags={"web", "read"},
+                           input_types=(str,), cost=2)
+        self.fetch = Tool("fetch", lambda url: url, tags={"web"}, input_types=(str,), cost=1)
+        self.add = Tool("add", lambda a, b: a + b, tags={"math"}, input_types=(int, float), cost=0)
+        self.tools = [self.search, self.fetch, self.add]
+
+    def test_use_and_execute(self):
+        self.assertEqual(self.add.use(2, 3), 5)
+        with self.assertRaises(ValueError):
+            execute_tool("not callable")
+        with self.assertRaises(ValueError):
+            Tool("broken", "not callable")
+
+    def test_select_tool_from_list(self):
+        self.assertEqual(select_tool(self.tools, lambda tool: tool.cost > 0), [self.search, self.fetch])
+
+    def test_registry_selection(self):
+        registry = ToolRegistry(self.tools)
+        self.assertEqual(select_tool(registry, {"tags": ["web"]}), [self.search, self.fetch])
+        self.assertEqual(registry.select({"tags": ["web"], "max_cost": 1}), [self.fetch])
+        self.assertEqual(registry.select({"any_tags": ["math", "read"]}), [self.search, self.add])
+        self.assertEqual(registry.select({"input_type": int}), [self.add])
+        self.assertEqual(registry.select({"min_cost": 1, "max_cost": 2}), [self.search, self.fetch])
+        self.assertEqual(registry.select({"name": "fetch", "tags": ["math"]}), [])
+        self.assertEqual(registry.select({"tags": ["web"], "where": lambda t: "s" in t.name}), [self.search])
+        self.assertEqual(registry.select(lambda tool: tool.cost == 0), [self.add])
+        self.assertIs(registry.compile({"tags": ["web"]}), registry.compile({"tags": ("web",)}))
+        with self.assertRaises(ValueError):
+            registry.select({"colour": "red"})
+
+    def test_registry_unregister(self):
+        registry = ToolRegistry(self.tools)
+        registry.unregister("fetch")
+        self.assertEqual(registry.select({"tags": ["web"]}), [self.search])
+        self.assertEqual(registry.select({"max_cost": 1}), [self.add])
+        self.assertNotIn("fetch", registry)
+
+class TestToolCache(unittest.TestCase):
+
+    def test_memoizes_including_unhashable_arguments(self):
+        calls = []
+
+        def score(items, weights=None):
+            calls.append(1)
+            return sum(items) * (weights or {}).get("scale", 1)
+
+        tool = Tool("score", score, cache=True)
+        self.assertEqual(tool.use([1, 2], weights={"scale": 2, "bias": 0}), 6)
+        self.assertEqual(tool.use([1, 2], weights={"bias": 0, "scale": 2}), 6)
+        self.assertEqual(tool.use([2, 1], weights={"scale": 2}), 6)
+        self.assertEqual(len(calls), 2)
+        stats = cache_stats([tool, Tool("plain", abs)])
+        self.assertEqual(list(stats), ["score"])
+        self.assertEqual(stats["score"]["hits"], 1)
+
+    def test_single_flight(self):
+        calls = []
+
+        def slow(x):
+            calls.append(x)
+            time.sleep(0.05)
+            return x * 2
+
+        tool = Tool("slow", slow, cache=ToolCache())
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(tool.use(21))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [42] * 5)
+        self.assertEqual(calls, [21])
+        self.assertEqual(tool.cache.stats()["coalesced"], 4)
+
+    def test_errors_are_not_cached(self):
+        tool = Tool("div", lambda a, b: a / b, cache=True)
+        with self.assertRaises(ZeroDivisionError):
+            tool.use(1, 0)
+        with self.assertRaises(ZeroDivisionError):
+            tool.use(1, 0)
+        self.assertEqual(tool.cache.stats()["entries"], 0)
+
+    def test_ttl_and_disk_tier(self):
+        directory = tempfile.mkdtemp()
+        try:
+            calls = []
+            cache = ToolCache(ttl=60, disk_directory=directory)
+            tool = Tool("double", lambda x: calls.append(x) or x * 2, cache=cache)
+            self.assertEqual(tool.use(4), 8)
+            cache.close()
+            cache = ToolCache(ttl=0.01, disk_directory=directory)  # a restart
+            tool = Tool("double", lambda x: calls.append(x) or x * 2, cache=cache)
+            self.assertEqual(tool.use(4), 8)
+            self.assertEqual(cache.stats()["disk_hits"], 1)
+            self.assertEqual(tool.use(5), 10)
+            time.sleep(0.02)
+            self.assertEqual(tool.use(5), 10)  # expired in memory and on disk
+            self.assertEqual(calls, [4, 5, 5])
+            cache.close()
+            cache = ToolCache(max_entries=2, disk_directory=directory)
+            for x in (1, 2, 3):
+                cache.call(abs, (x,))
+            self.assertEqual(len(cache._disk), 2)
+            cache.close()
+        finally:
+            shutil.rmtree(directory)
+
+    def test_equal_arguments_of_different_types_are_cached_apart(self):
+        tool = Tool("kind", lambda x: type(x).__name__, cache=True)
+        self.assertEqual([tool.use(1), tool.use(1.0), tool.use(True), tool.use(1)], ["int", "float", "bool", "int"])
+        self.assertEqual(tool.use((1, [True])), "tuple")
+        self.assertEqual(tool.cache.stats()["hits"], 1)
+
+class TestBatching(unittest.TestCase):
+
+    def test_use_batch_with_and_without_batch_function(self):
+        batch_calls = []
+
+        def square_all(values):
+            batch_calls.append(len(values))
+            return [v * v for v in values]
+
+        batched = Tool("square", lambda v: v * v, batch_function=square_all)
+        looped = Tool("square", lambda v: v * v)
+        self.assertEqual(batched.use_batch([1, 2, 3]), [1, 4, 9])
+        self.assertEqual(looped.use_batch([1, 2, 3]), [1, 4, 9])
+        self.assertEqual(batch_calls, [3])
+        broken = Tool("broken", abs, batch_function=lambda values: [])
+        with self.assertRaises(ValueError):
+            broken.use_batch([1])
+
+    def test_micro_batcher_gathers_concurrent_calls(self):
+        batch_sizes = []
+
+        def embed(texts):
+            batch_sizes.append(len(texts))
+            return [len(text) for text in texts]
+
+        tool = Tool("embed", len, batch_function=embed)
+        with MicroBatcher(tool, max_batch_size=8, max_wait=0.05) as batcher:
+            futures = [batcher.submit("x" * i) for i in range(20)]
+            self.assertEqual([future.result() for future in futures], list(range(20)))
+            self.assertEqual(batcher("abc"), 3)
+        self.assertEqual(sum(batch_sizes), 21)
+        self.assertLessEqual(max(batch_sizes), 8)
+        self.assertLess(len(batch_sizes), 21)
+
+    def test_micro_batcher_propagates_errors(self):
+        tool = Tool("fail", abs, batch_function=lambda values: 1 / 0)
+        with MicroBatcher(tool) as batcher:
+            with self.assertRaises(ZeroDivisionError):
+                batcher(1)
+
+    def test_micro_batcher_isolates_bad_items_and_rejects_after_close(self):
+        batcher = MicroBatcher(Tool("invert", lambda x: 1 / x), max_wait=0.05)
+        futures = [batcher.submit(x) for x in (1, 0, 4)]
+        self.assertEqual(futures[0].result(1), 1.0)
+        self.assertIsInstance(futures[1].exception(1), ZeroDivisionError)
+        self.assertEqual(futures[2].result(1), 0.25)
+        batcher.close()
+        with self.assertRaises(RuntimeError):
+            batcher.submit(2)
+
+    def test_micro_batcher_skips_cancelled_calls(self):
+        seen = []
+
+        def embed(texts):
+            seen.extend(texts)
+            return [len(text) for text in texts]
+
+        for tool in (Tool("embed", len, batch_function=embed), Tool("length", len)):
+            with MicroBatcher(tool, max_wait=0.05) as batcher:
+                cancelled = batcher.submit("gone")
+                self.assertTrue(cancelled.cancel())
+                self.assertEqual(batcher.submit("kept").result(1), 4)
+                self.assertEqual(batcher("again", timeout=1), 5)
+        self.assertEqual(seen, ["kept", "again"])
+
+class TestToolExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = ToolExecutor(max_concurrent=2, timeout=1.0,
+                                     breaker_factory=lambda: CircuitBreaker(min_calls=2, reset_timeout=0.05))
+
+    def tearDown(self):
+        self.executor.shutdown(wait=False)
+
+    def test_call_and_timeout(self):
+        self.assertEqual(self.executor.call(Tool("add", lambda a, b: a + b), (2, 3)), 5)
+        release = threading.Event()
+        slow = Tool("slow", lambda: release.wait(1))
+        with self.assertRaises(ToolTimeoutError):
+            self.executor.call(slow, timeout=0.01)
+        release.set()
+        self.assertEqual(self.executor.stats()["slow"]["timeouts"], 1)
+
+    def test_bulkhead_isolates_slow_tool(self):
+        release = threading.Event()
+        slow = Tool("slow", lambda: release.wait(1))
+        futures = [self.executor.submit(slow) for _ in range(2)]
+        with self.assertRaises(BulkheadFullError):
+            self.executor.submit(slow)
+        self.assertEqual(self.executor.call(Tool("fast", lambda: "ok")), "ok")
+        release.set()
+        for future in futures:
+            future.result()
+
+    def test_circuit_breaker_opens_and_recovers(self):
+        healthy = [False]
+
+        def flaky():
+            if not healthy[0]:
+                raise IOError("down")
+            return "up"
+
+        tool = Tool("flaky", flaky)
+        for _ in range(2):
+            with self.assertRaises(IOError):
+                self.executor.call(tool)
+        with self.assertRaises(CircuitOpenError):
+            self.executor.call(tool)
+        healthy[0] = True
+        time.sleep(0.06)
+        self.assertEqual(self.executor.call(tool), "up")
+        self.assertEqual(self.executor.stats()["flaky"]["circuit"], "closed")
+
+    def test_async_calls(self):
+        async def fetch(x):
+            await asyncio.sleep(0.01)
+            return x
+
+        async def hang():
+            await asyncio.sleep(1)
+
+        async def main():
+            result = await self.executor.call_async(Tool("fetch", fetch), (7,))
+            threaded = await self.executor.call_async(Tool("neg", lambda x: -x), (7,))
+            with self.assertRaises(ToolTimeoutError):
+                await self.executor.call_async(Tool("hang", hang), timeout=0.01)
+            return result, threaded
+
+        self.assertEqual(asyncio.run(main()), (7, -7))
+
+    def test_half_open_trial_survives_full_bulkhead(self):
+        executor = ToolExecutor(max_concurrent=1,
+                                breaker_factory=lambda: CircuitBreaker(min_calls=1, reset_timeout=0.05))
+        release = threading.Event()
+        tool = Tool("stuck", lambda: release.wait(1) and "done")
+        try:
+            with self.assertRaises(ToolTimeoutError):
+                executor.call(tool, timeout=0.01)  # opens the circuit, keeps holding the slot
+            time.sleep(0.06)
+            with self.assertRaises(BulkheadFullError):
+                executor.call(tool)
+            release.set()
+            time.sleep(0.05)  # let the timed-out call return its slot
+            self.assertEqual(executor.call(tool), "done")
+            self.assertEqual(executor.stats()["stuck"]["circuit"], "closed")
+        finally:
+            executor.shutdown(wait=False)
+
+    def test_cancelled_trial_is_given_back(self):
+        executor = ToolExecutor(max_concurrent=1,
+                                breaker_factory=lambda: CircuitBreaker(min_calls=1, reset_timeout=0.01))
+        failing = [True]
+
+        def flaky():
+            if failing.pop():
+                raise ValueError("down")
+            return "up"
+
+        tool = Tool("flaky", flaky)
+        release = threading.Event()
+        try:
+            with self.assertRaises(ValueError):
+                executor.call(tool)  # opens the circuit
+            time.sleep(0.02)
+            executor._lanes["flaky"].pool.submit(release.wait, 1)  # keep the lane's thread busy
+            trial = executor.submit(tool)
+            self.assertTrue(trial.cancel())
+            release.set()
+            failing.append(False)
+            self.assertEqual(executor.call(tool), "up")
+            self.assertEqual(executor.stats()["flaky"]["circuit"], "closed")
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_coroutine_bad_arguments_release_the_slot(self):
+        async def fetch(x):
+            return x
+
+        executor = ToolExecutor(max_concurrent=1)
+        tool = Tool("fetch", fetch)
+
+        async def main():
+            for _ in range(2):
+                with self.assertRaises(TypeError):
+                    await executor.call_async(tool, (1, 2))
+            return await executor.call_async(tool, (3,))
+
+        try:
+            self.assertEqual(asyncio.run(main()), 3)
+        finally:
+            executor.shutdown()
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        instrumentation.reset()
+        instrumentation.enable()
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_histogram_percentiles(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 10001):
+            histogram.record(value * 1000)
+        for fraction in (0.5, 0.95, 0.99):
+            expected = fraction * 10000 * 1000
+            self.assertLess(abs(histogram.percentile(fraction) - expected) / expected, 0.01)
+        self.assertEqual(histogram.percentile(1.0), 10000 * 1000)
+
+    def test_tool_use_is_recorded(self):
+        def fail():
+            raise ValueError("bad input")
+
+        Tool("add", lambda a, b: a + b).use(1, 2)
+        with self.assertRaises(ValueError):
+            Tool("fail", fail).use()
+        thread = threading.Thread(target=Tool("add", lambda a, b: a + b).use, args=(3, 4))
+        thread.start()
+        thread.join()
+        snapshot = instrumentation.snapshot()
+        self.assertEqual(snapshot["add"]["calls"], 2)
+        self.assertEqual(snapshot["add"]["in_flight"], 0)
+        self.assertEqual((snapshot["fail"]["calls"], snapshot["fail"]["errors"]), (1, 1))
+        self.assertGreater(snapshot["add"]["latency_seconds"]["p99"], 0)
+
+    def test_in_flight_gauge(self):
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait(1)
+
+        thread = threading.Thread(target=Tool("block", block).use)
+        thread.start()
+        started.wait(1)
+        self.assertEqual(instrumentation.snapshot()["block"]["in_flight"], 1)
+        release.set()
+        thread.join()
+        self.assertEqual(instrumentation.snapshot()["block"]["in_flight"], 0)
+
+    def test_exports(self):
+        Tool('say "hi"', str).use(1)
+        text = instrumentation.to_prometheus()
+        self.assertIn('agent_tool_calls_total{tool="say \\"hi\\""} 1', text)
+        self.assertIn('quantile="0.99"', text)
+        self.assertEqual(json.loads(instrumentation.to_json())['say "hi"']["calls"], 1)
+
+    def test_disabled_records_nothing(self):
+        instrumentation.disable()
+        Tool("quiet", str).use(1)
+        self.assertEqual(instrumentation.snapshot(), {})
+        self.assertEqual(ToolInstrumentation().snapshot(), {})
+
+def _scaled_sum(values, scale=1):
+    return values * scale, float(values.sum())
+
+
+def _crash():
+    os._exit(1)
+
+
+class TestSandboxPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = SandboxPool(num_workers=1, shm_threshold=1024)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_runs_out_of_process_with_shared_arrays(self):
+        values = np.arange(10000, dtype=np.float64)
+        scaled, total = self.pool.call(Tool("scaled_sum", _scaled_sum), (values,), {"scale": 2})
+        np.testing.assert_array_equal(scaled, values * 2)
+        self.assertEqual(total, values.sum())
+        self.assertNotEqual(self.pool.call(Tool("pid", os.getpid)), os.getpid())
+        self.assertEqual(self.pool.sandboxed(Tool("abs", abs)).use(-3), 3)
+
+    def test_errors_crashes_and_timeouts(self):
+        with self.assertRaises(ValueError):
+            self.pool.call(Tool("int", int), ("not a number",))
+        with self.assertRaises(SandboxError):
+            self.pool.call(Tool("crash", _crash))
+        with self.assertRaises(ToolTimeoutError):
+            self.pool.call(Tool("sleep", time.sleep), (5,), timeout=0.05)
+        self.assertEqual(self.pool.call(Tool("abs", abs), (-1,)), 1)
+        self.assertEqual(self.pool.recycled, 2)
+
+    def test_recycling_and_pinning(self):
+        pool = SandboxPool(num_workers=1, max_calls=2)
+        try:
+            pids = [pool.call(Tool("pid", os.getpid)) for _ in range(4)]
+            self.assertEqual(len(set(pids)), 2)
+            pool.pin(Tool("pinned_pid", os.getpid))
+            self.assertNotIn(pool.call(Tool("pinned_pid", os.getpid)), pids)
+        finally:
+            pool.close()
+        with SandboxPool(num_workers=1, max_rss=1) as pool:
+            pool.call(Tool("abs", abs), (-1,))
+            self.assertEqual(pool.recycled, 1)
+
+if __name__ == '__main__':
+    unittest.main()